@@ -1,4 +1,5 @@
-from flask import Flask, render_template, request, jsonify, Response, g
+from flask import Flask, render_template, request, jsonify, Response, g, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_sock import Sock # Added for WebSockets
 import boto3
@@ -13,18 +14,76 @@ import time
 import base64
 import openai
 from collections import Counter
-from db_config import get_db, close_db
+from db_config import get_db, close_db, set_resource_factory
+import pdf_worker
 import asyncio
 import sys
 from werkzeug.utils import secure_filename
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 from decimal import Decimal
 import audioop # For potential audio format conversion
 import uuid
+import threading
+import hashlib
+import functools
+import copy
+import mmap
+import tempfile
+import shutil
+import subprocess
+from html import unescape as html_unescape
+import io
+import random
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+from cachetools import LRUCache, TTLCache
+try:
+    import redis
+except ImportError:
+    redis = None
+try:
+    import re2
+except ImportError:
+    re2 = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+# Document/HTML parsers, resolved once here rather than re-imported (or re-failing) per request
+try:
+    import docx2txt
+except ImportError:
+    docx2txt = None
+try:
+    from docx import Document as DocxDocument
+except ImportError:
+    DocxDocument = None
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser  # C parser, much faster than html.parser
+except ImportError:
+    SelectolaxParser = None
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from openai_client_fix import get_patched_client
+from openai_client_fix import get_patched_client, get_patched_async_client
 
 # Import Nova integration
 try:
@@ -38,6 +97,171 @@ except ImportError as e:
 # Define table names globally for this app context
 COMPETENCIES_TABLE_NAME = 'competencies' 
 QUESTIONS_TABLE_NAME = 'questions'
+
+# Fallback competency taxonomy used for tagging when DynamoDB is unavailable
+DEFAULT_COMPETENCIES = {
+    "Analytical Thinking": "Ability to analyze complex information and solve problems systematically",
+    "Financial Acumen": "Understanding of financial concepts, analysis, and business metrics",
+    "Communication": "Effectively conveying information and ideas to others",
+    "Leadership": "Guiding and motivating teams to achieve goals",
+    "Technical Expertise": "Deep knowledge and skills in specific technical areas",
+    "Customer Focus": "Understanding and meeting customer needs effectively",
+    "Strategic Planning": "Developing long-term plans and strategies",
+    "Risk Management": "Identifying and mitigating potential risks",
+    "Collaboration": "Working effectively with others to achieve common goals",
+    "Innovation": "Creating new ideas and approaches to solve problems",
+    "Project Management": "Planning and executing projects successfully",
+    "Negotiation": "Reaching mutually beneficial agreements",
+    "Decision Making": "Making sound judgments based on available information",
+    "Adaptability": "Adjusting to changing circumstances and requirements",
+    "Business Acumen": "Understanding business operations and market dynamics"
+}
+DEFAULT_COMPETENCY_NAMES = tuple(sorted(DEFAULT_COMPETENCIES))
+DEFAULT_COMPETENCIES_PROMPT = "\n".join([f"- {name}: {DEFAULT_COMPETENCIES[name]}" for name in DEFAULT_COMPETENCY_NAMES])
+
+# Hardcoded fallback questions for common competencies
+FALLBACK_QUESTIONS = {
+    "Analytical Thinking": {
+        "primary": "Tell me about a time when you had to analyze complex data to solve a problem. What was your approach?",
+        "backup": "Describe a situation where you identified a pattern or trend that others missed. How did you discover it?"
+    },
+    "Financial Acumen": {
+        "primary": "Share an example of when you used financial data to make an informed business decision.",
+        "backup": "Tell me about a time you identified a financial risk or opportunity. What actions did you take?"
+    },
+    "Communication": {
+        "primary": "Describe a time when you had to communicate complex information to a non-technical audience.",
+        "backup": "Tell me about a challenging conversation you had with a stakeholder. How did you handle it?"
+    },
+    "Leadership": {
+        "primary": "Tell me about a time you led a team through a challenging project or change.",
+        "backup": "Describe how you motivated a team member who was struggling with their performance."
+    },
+    "Technical Expertise": {
+        "primary": "Walk me through a complex technical problem you solved. What was your approach?",
+        "backup": "Tell me about a time you had to quickly learn a new technology or tool to complete a project."
+    },
+    "Customer Focus": {
+        "primary": "Tell me about a time you went above and beyond to meet a customer's needs.",
+        "backup": "Describe a situation where you had to balance customer demands with business constraints."
+    },
+    "Strategic Planning": {
+        "primary": "Describe a long-term strategy you developed and implemented. What was the outcome?",
+        "backup": "Tell me about a time you had to adjust your strategic plan due to changing circumstances."
+    },
+    "Risk Management": {
+        "primary": "Tell me about a significant risk you identified and how you mitigated it.",
+        "backup": "Describe a time when you had to make a decision with incomplete information. How did you assess the risks?"
+    },
+    "Collaboration": {
+        "primary": "Give an example of how you successfully collaborated with a difficult team member or department.",
+        "backup": "Tell me about a time you had to build consensus among stakeholders with different priorities."
+    },
+    "Innovation": {
+        "primary": "Describe an innovative solution you developed to solve a business problem.",
+        "backup": "Tell me about a time you challenged the status quo. What was the result?"
+    },
+    "Project Management": {
+        "primary": "Walk me through how you managed a complex project from inception to completion.",
+        "backup": "Tell me about a time a project didn't go as planned. How did you get it back on track?"
+    },
+    "Negotiation": {
+        "primary": "Describe your most challenging negotiation. What was your strategy and the outcome?",
+        "backup": "Tell me about a time you had to negotiate with limited leverage. How did you approach it?"
+    },
+    "Decision Making": {
+        "primary": "Tell me about a difficult decision you had to make quickly. What was your process?",
+        "backup": "Describe a time when you had to make an unpopular decision. How did you handle it?"
+    },
+    "Adaptability": {
+        "primary": "Tell me about a time you had to quickly adapt to a significant change at work.",
+        "backup": "Describe how you handled a situation where priorities suddenly shifted."
+    },
+    "Business Acumen": {
+        "primary": "Give an example of how you identified and capitalized on a business opportunity.",
+        "backup": "Tell me about a time you had to understand and navigate complex business dynamics."
+    }
+}
+
+# Competency descriptions served by /api/get_competencies when the DB has none
+DEFAULT_DISPLAY_COMPETENCIES = {
+    "Customer Focus": "Building strong customer relationships and delivering customer-centric solutions",
+    "Financial Acumen": "Understanding financial concepts and making sound financial decisions",
+    "Decision Quality": "Making good decisions based on analysis, experience, and judgment",
+    "Strategic Mindset": "Seeing ahead to future possibilities and translating them into breakthrough strategies",
+    "Business Insight": "Applying knowledge of business and the marketplace to advance the organization's goals",
+    "Drives Results": "Consistently achieving results, even under tough circumstances",
+    "Manages Complexity": "Making sense of complex, high-quantity, and sometimes contradictory information",
+    "Tech Savvy": "Anticipating and adopting innovations in technology-based solutions",
+    "Collaborates": "Building partnerships and working collaboratively with others",
+    "Communicates Effectively": "Developing and delivering multi-mode communications that convey a clear understanding"
+}
+
+# Competencies /api/get_preset_questions covers when none are requested
+DEFAULT_PRESET_COMPETENCIES = (
+    "Introduction",
+    "Financial Acumen",
+    "Resourcefulness",
+    "Plans And Aligns",
+    "Communicates Effectively",
+    "Nimble Learning"
+)
+
+# --- Precompiled regular expressions ---
+# Compiled once at import instead of going through re's pattern cache on every request
+QUESTION_TAG_RE = re.compile(r'<question>(.*?)</question>', re.DOTALL)
+RESPONSE_SUMMARY_TAG_RE = re.compile(r'<response_summary>(.*?)</response_summary>', re.DOTALL)
+BULLET_MARKERS = "•·-*▪●◦"
+NUMBERED_QUESTION_RE = re.compile(r'(?:^|\n)\d+\.\s*(.+?\?)')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+FILLER_WORDS_RE = re.compile(r'\b(um|uh|like|you know|so)\b', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+NON_WORD_RE = re.compile(r'\W+')
+# is_likely_question: text starting with a question starter, or containing one as a space-delimited phrase
+QUESTION_STARTERS = ('what', 'when', 'where', 'which', 'who', 'whom', 'whose',
+                     'why', 'how', 'can you', 'could you', 'would you',
+                     'tell me', 'describe', 'explain')
+_QUESTION_STARTERS_ALT = '|'.join(re.escape(starter) for starter in QUESTION_STARTERS)
+QUESTION_STARTER_RE = re.compile(f'^(?:{_QUESTION_STARTERS_ALT})| (?:{_QUESTION_STARTERS_ALT}) ')
+
+# RE2 matches in linear time, which keeps header scanning safe on huge pasted job descriptions.
+# Only backreference-free patterns go through it; everything else stays on the stdlib engine.
+USE_RE2 = re2 is not None and os.environ.get('USE_RE2', 'true').lower() == 'true'
+jd_re = re2 if USE_RE2 else re
+
+# Job description section headers. They are plain literals, so the same list feeds both an
+# Aho-Corasick automaton (one pass over the lowered text, when pyahocorasick is installed)
+# and the SECTION_RE fallback, which has one named group per kind.
+JD_SECTION_HEADERS = {
+    "summary": ("position summary", "job summary", "role summary", "summary", "overview", "position overview",
+                "about the role", "about the position", "about the job"),
+    "responsibilities": ("responsibilities", "key responsibilities", "primary responsibilities", "main responsibilities",
+                         "roles and responsibilities", "duties", "duties and responsibilities", "essential functions",
+                         "what you'll do", "what you’ll do"),
+    "requirements": ("qualifications", "minimum qualifications", "required qualifications", "preferred qualifications",
+                     "basic qualifications", "requirements", "required skills", "what you'll need", "what you’ll need",
+                     "skills and experience"),
+    "benefits": ("benefits", "what we offer", "compensation", "compensation and benefits", "perks"),
+    "eeo": ("equal opportunity", "equal employment opportunity", "equal opportunity employer",
+            "equal employment opportunity employer", "eeo statement"),
+    "about": ("about us", "about the company", "who we are"),
+}
+# The keywords are lowercase, so SECTION_RE runs case-sensitively over text lowered once;
+# SECTION_RE_CASELESS is only for text whose length changes when lowered (offsets would drift).
+_SECTION_PATTERN = r'^[ \t]*(?:#+[ \t]*)?(?:' + '|'.join(
+    f'(?P<{kind}>' + '|'.join(r'\s+'.join(re.escape(word) for word in keyword.split())
+                              for keyword in sorted(keywords, key=len, reverse=True)) + ')'
+    for kind, keywords in JD_SECTION_HEADERS.items()
+) + r')[ \t]*(?::|$)'
+SECTION_RE = jd_re.compile(r'(?m)' + _SECTION_PATTERN)
+SECTION_RE_CASELESS = jd_re.compile(r'(?im)' + _SECTION_PATTERN)
+JD_HEADER_AUTOMATON = None
+if ahocorasick is not None:
+    JD_HEADER_AUTOMATON = ahocorasick.Automaton()
+    for _kind, _keywords in JD_SECTION_HEADERS.items():
+        for _keyword in _keywords:
+            JD_HEADER_AUTOMATON.add_word(_keyword, (_keyword, _kind))
+    JD_HEADER_AUTOMATON.make_automaton()
 # -----------------
 
 # Set up logging
@@ -102,6 +326,22 @@ cors = CORS(app, resources={r"/*": {"origins": "*"}})
 app.config['CORS_HEADERS'] = 'Content-Type'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max upload size
 
+# orjson parses and serializes several times faster than the stdlib json module; its
+# JSONDecodeError subclasses json.JSONDecodeError, so existing except clauses still apply
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's sorted keys and Decimal/date handling."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # Register close_db function with Flask app
 app.teardown_appcontext(close_db)
 
@@ -172,6 +412,278 @@ except Exception as e:
     else:
          logger.error("Legacy OpenAI fallback not possible after exception.")
 
+# Async client used to fan out independent chat completions concurrently
+async_client = None
+try:
+    async_client = get_patched_async_client(api_key=openai_api_key)
+except Exception as e:
+    logger.error(f"Exception occurred while calling get_patched_async_client: {str(e)}")
+
+# Upper bound on in-flight OpenAI requests per fan-out
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '8'))
+
+def _read_json_stream(stream, opener="{"):
+    """
+    Accumulate a streamed reply and stop as soon as the top-level JSON object (or array,
+    with opener='[') closes, instead of waiting for the final tokens and end-of-stream.
+    """
+    closer = "}" if opener == "{" else "]"
+    parts = []
+    depth = 0
+    in_string = False
+    escaped = False
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        parts.append(delta)
+        for ch in delta:
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == opener:
+                depth += 1
+            elif ch == closer and depth > 0:
+                depth -= 1
+                if depth == 0:
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
+                    return "".join(parts)
+    return "".join(parts)
+
+def _chat_deltas(model, messages, **kwargs):
+    """
+    Yield the reply text of a chat completion as it is generated (v1 SDK); the legacy SDK
+    yields the whole reply at once. Raises like _chat if no client is available.
+    """
+    if not client:
+        raise RuntimeError("OpenAI client is not initialized")
+    if not USE_NEW_OPENAI_SDK:
+        yield _chat(model, messages, **kwargs)
+        return
+    for chunk in client.chat.completions.create(model=model, messages=messages, stream=True, **kwargs):
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def _stream_tagged_questions(deltas, parts, limit=3):
+    """
+    Yield each <question>...</question> as soon as its closing tag arrives, up to limit.
+    Every delta is appended to parts so the caller can parse the full reply afterwards.
+    """
+    buf = ""
+    pos = 0
+    found = 0
+    for delta in deltas:
+        parts.append(delta)
+        buf += delta
+        match = QUESTION_TAG_RE.search(buf, pos)
+        while match and found < limit:
+            found += 1
+            pos = match.end()
+            yield match.group(1)
+            match = QUESTION_TAG_RE.search(buf, pos)
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_first_json(text, opener="{"):
+    """
+    Return the first balanced JSON object (opener '{') or array ('[') in text, or None.
+    A single left-to-right pass that ignores brackets inside strings, rather than a
+    greedy DOTALL regex that runs to the last closing bracket in the reply.
+    """
+    closer = "}" if opener == "{" else "]"
+    start = text.find(opener)
+    if start == -1:
+        return None
+    # Fast path: let the C scanner decode forward from the first opener and stop at the
+    # end of that value, whatever trails it; only malformed JSON takes the Python walk
+    try:
+        _, end = _JSON_DECODER.raw_decode(text, start)
+        return text[start:end]
+    except ValueError:
+        pass
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == opener:
+            depth += 1
+        elif ch == closer:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+def _chat(model, messages, **kwargs):
+    """
+    Run a chat completion on whichever OpenAI SDK is configured and return the reply text.
+    With stream_json='object' or 'array' (v1 SDK) the reply is streamed and cut off once that
+    top-level JSON value is complete; True means 'object'.
+    Raises if no client is available; callers keep their own error handling.
+    """
+    if not client:
+        raise RuntimeError("OpenAI client is not initialized")
+    stream_json = kwargs.pop("stream_json", False)
+    if USE_NEW_OPENAI_SDK:
+        if stream_json:
+            return _read_json_stream(
+                client.chat.completions.create(model=model, messages=messages, stream=True, **kwargs),
+                "[" if stream_json == "array" else "{"
+            )
+        completion = client.chat.completions.create(model=model, messages=messages, **kwargs)
+        return completion.choices[0].message.content
+    # The legacy SDK has no JSON mode; prompts already ask for JSON explicitly
+    kwargs.pop("response_format", None)
+    completion = openai.ChatCompletion.create(model=model, messages=messages, **kwargs)
+    return completion.choices[0].message['content']
+
+# --- Response cache for expensive chat completions ---
+# Exact matches are keyed on sha256(model, system prompt, user content) and kept in Redis
+# when REDIS_URL is set (shared by all workers), otherwise in-process. With
+# LLM_SEMANTIC_CACHE=true a miss also checks embeddings of earlier user contents for the
+# same system prompt and reuses a reply above LLM_SEMANTIC_THRESHOLD cosine similarity.
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+LLM_SEMANTIC_CACHE = os.getenv('LLM_SEMANTIC_CACHE', 'false').lower() == 'true'
+LLM_SEMANTIC_THRESHOLD = float(os.getenv('LLM_SEMANTIC_THRESHOLD', '0.95'))
+LLM_SEMANTIC_MAX_ENTRIES = 256
+_llm_local_cache = TTLCache(maxsize=1024, ttl=LLM_CACHE_TTL)
+_llm_semantic_entries = {}
+_llm_cache_lock = threading.Lock()
+_redis_client = None
+
+def _get_redis():
+    """Return a Redis client for REDIS_URL, or None when Redis isn't configured/available."""
+    global _redis_client
+    if _redis_client is None and redis is None and os.getenv('REDIS_URL'):
+        logger.warning("REDIS_URL is set but the redis package is not installed; using in-process cache")
+        _redis_client = False
+    if _redis_client is None and redis is not None and os.getenv('REDIS_URL'):
+        try:
+            _redis_client = redis.Redis.from_url(os.getenv('REDIS_URL'), socket_timeout=1)
+            _redis_client.ping()
+            logger.info("Connected to Redis for LLM response caching")
+        except Exception as e:
+            logger.warning(f"Redis unavailable for LLM response caching, using in-process cache: {str(e)}")
+            _redis_client = False
+    return _redis_client or None
+
+def _llm_cache_get(key):
+    r = _get_redis()
+    if r:
+        try:
+            value = r.get(f"llm:{key}")
+            return value.decode("utf-8") if value is not None else None
+        except Exception as e:
+            logger.warning(f"Redis get failed: {str(e)}")
+    with _llm_cache_lock:
+        return _llm_local_cache.get(key)
+
+def _llm_cache_set(key, value):
+    r = _get_redis()
+    if r:
+        try:
+            r.setex(f"llm:{key}", LLM_CACHE_TTL, value)
+            return
+        except Exception as e:
+            logger.warning(f"Redis set failed: {str(e)}")
+    with _llm_cache_lock:
+        _llm_local_cache[key] = value
+
+def _embed(text):
+    """Unit-length embedding for semantic cache lookups."""
+    vector = client.embeddings.create(model="text-embedding-3-small", input=text[:8000]).data[0].embedding
+    norm = sum(v * v for v in vector) ** 0.5 or 1.0
+    return [v / norm for v in vector]
+
+@functools.lru_cache(maxsize=64)
+def _system_prompt_hash(system):
+    # System prompts are a handful of module constants and per-catalog prompts whose str
+    # hash is already cached, so this skips re-encoding and re-hashing them on every call
+    return hashlib.sha256(system.encode("utf-8")).hexdigest()
+
+def _cached_chat(model, system, user, **kwargs):
+    """
+    _chat() for a system + user message pair, answered from the response cache when possible.
+    An empty system prompt sends the user message alone. Sampling options (temperature,
+    response_format, max_tokens, ...) are part of the key; stream_json only changes how the
+    reply is read, so it is not.
+    """
+    system_hash = _system_prompt_hash(system)
+    options = {k: v for k, v in kwargs.items() if k != "stream_json"}
+    options_key = json.dumps(options, sort_keys=True, default=str) if options else ""
+    exact_key = hashlib.sha256(f"{model}\n{system_hash}\n{options_key}\n{user}".encode("utf-8")).hexdigest()
+    cached = _llm_cache_get(exact_key)
+    if cached is not None:
+        logger.info("LLM response served from exact-match cache")
+        return cached
+
+    embedding = None
+    if LLM_SEMANTIC_CACHE and USE_NEW_OPENAI_SDK and client:
+        try:
+            embedding = _embed(user)
+            with _llm_cache_lock:
+                entries = list(_llm_semantic_entries.get((model, system_hash), ()))
+            best_score, best_text = 0.0, None
+            for stored_embedding, stored_text in entries:
+                score = sum(a * b for a, b in zip(embedding, stored_embedding))
+                if score > best_score:
+                    best_score, best_text = score, stored_text
+            if best_text is not None and best_score >= LLM_SEMANTIC_THRESHOLD:
+                logger.info(f"LLM response served from semantic cache (similarity {best_score:.3f})")
+                return best_text
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {str(e)}")
+            embedding = None
+
+    messages = [{"role": "user", "content": user}]
+    if system:
+        messages.insert(0, {"role": "system", "content": system})
+    response_content = _chat(model, messages, **kwargs)
+
+    if response_content:
+        _llm_cache_set(exact_key, response_content)
+        if embedding is not None:
+            with _llm_cache_lock:
+                entries = _llm_semantic_entries.setdefault((model, system_hash), [])
+                entries.append((embedding, response_content))
+                del entries[:-LLM_SEMANTIC_MAX_ENTRIES]
+    return response_content
+
+def _chat_json(system, user, extract='object', model="gpt-3.5-turbo", **kwargs):
+    """
+    Cached chat completion whose reply is parsed as JSON.
+    extract='object' or 'array' selects which JSON value to pull out of a chatty reply.
+    Raises json.JSONDecodeError if no valid JSON can be found.
+    """
+    kwargs.setdefault("stream_json", extract)
+    response_content = _cached_chat(model, system, user, **kwargs) or ""
+    try:
+        return _json_loads(response_content)
+    except json.JSONDecodeError:
+        pass
+    json_str = _extract_first_json(response_content, "[" if extract == 'array' else "{")
+    if json_str:
+        return _json_loads(json_str)
+    logger.error(f"No JSON {extract} found in LLM response: {response_content}")
+    raise json.JSONDecodeError(f"No JSON {extract} in response", response_content, 0)
+
 # Final check after all initialization attempts
 if client is None:
      logger.critical("OpenAI client could not be initialized. API calls will fail.")
@@ -184,12 +696,151 @@ else:
 if not aws_access_key_id or not aws_secret_access_key:
     logger.warning("AWS credentials are not set in environment variables!")
 
+# Shared connection pools for outbound fetches (job posting and resume URLs) so repeat hosts
+# reuse keep-alive connections instead of a new TCP/TLS handshake per request. Only the
+# adapters (urllib3 pools, which are thread-safe) are shared: each fetch gets its own Session,
+# so cookies picked up for one user's URL never ride along on another user's request.
+OUTBOUND_HTTP_TIMEOUT = 10
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+OUTBOUND_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
+_http_adapters = {
+    'https://': requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16),
+    'http://': requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=16),
+}
+
+def _outbound_session():
+    """A fresh Session (own cookie jar) on the shared connection pools. Don't close() it: that closes the pools."""
+    session = requests.Session()
+    for prefix, adapter in _http_adapters.items():
+        session.mount(prefix, adapter)
+    session.headers['User-Agent'] = OUTBOUND_USER_AGENT
+    return session
+
 # Create tmp directory for file uploads if it doesn't exist
 tmp_dir = os.path.join(os.getcwd(), 'tmp')
 if not os.path.exists(tmp_dir):
     os.makedirs(tmp_dir)
     logger.info(f"Created tmp directory at {tmp_dir}")
 
+# Legacy .doc files go straight to antiword (or headless LibreOffice) instead of through textract
+DOC_CONVERT_TIMEOUT = int(os.getenv("DOC_CONVERT_TIMEOUT", "30"))
+ANTIWORD_BIN = shutil.which("antiword")
+SOFFICE_BIN = shutil.which("soffice") or shutil.which("libreoffice")
+
+def _extract_legacy_doc(filepath):
+    """Extract text from a .doc with antiword, falling back to soffice; returns '' if neither works"""
+    if ANTIWORD_BIN:
+        try:
+            result = subprocess.run([ANTIWORD_BIN, filepath], capture_output=True, timeout=DOC_CONVERT_TIMEOUT)
+            content = result.stdout.decode('utf-8', errors='replace')
+            if result.returncode == 0 and content.strip():
+                return content
+            logger.warning(f"antiword returned no text (exit {result.returncode})")
+        except Exception as e:
+            logger.warning(f"antiword failed: {str(e)}")
+    if SOFFICE_BIN:
+        try:
+            with tempfile.TemporaryDirectory(dir=tmp_dir) as out_dir:
+                subprocess.run(
+                    [SOFFICE_BIN, '--headless', '--convert-to', 'txt:Text', '--outdir', out_dir, filepath],
+                    capture_output=True, timeout=DOC_CONVERT_TIMEOUT
+                )
+                txt_path = os.path.join(out_dir, os.path.splitext(os.path.basename(filepath))[0] + '.txt')
+                if os.path.exists(txt_path):
+                    with open(txt_path, 'rb') as f:
+                        return f.read().decode('utf-8', errors='replace')
+            logger.warning("soffice produced no text output")
+        except Exception as e:
+            logger.warning(f"soffice conversion failed: {str(e)}")
+    return ""
+
+# Page chrome stripped before taking the text of a fetched job posting
+HTML_NOISE_TAGS = ("script", "style", "nav", "footer", "header")
+
+def _html_to_text(html):
+    """Visible text of an HTML page, whitespace-collapsed; selectolax when available, else BeautifulSoup."""
+    if SelectolaxParser is not None:
+        try:
+            tree = SelectolaxParser(html)
+            for node in tree.css(",".join(HTML_NOISE_TAGS)):
+                node.decompose()
+            root = tree.body or tree.root
+            return ' '.join(root.text(separator=' ').split()) if root is not None else ""
+        except Exception as e:
+            logger.warning(f"selectolax parsing failed, falling back to BeautifulSoup: {str(e)}")
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(list(HTML_NOISE_TAGS)):
+        script.extract()
+    return ' '.join(soup.get_text(separator=' ').split())
+
+# schema.org JobPosting data embedded by most job boards; when it lists the duties we can
+# skip the LLM responsibilities extraction entirely
+JSON_LD_SCRIPT_RE = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+HTML_LIST_ITEM_RE = re.compile(r'<li[^>]*>(.*?)</li>', re.DOTALL | re.IGNORECASE)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+LIST_LINE_SPLIT_RE = re.compile(r'\s*(?:\n|[•·▪●◦])\s*')
+JSON_LD_MIN_ITEMS = 3
+JSON_LD_MIN_ITEM_CHARS = 15
+
+def _json_ld_job_postings(html_text):
+    """Yield every JobPosting object in the page's JSON-LD blocks (including @graph members and lists)."""
+    for block in JSON_LD_SCRIPT_RE.findall(html_text):
+        try:
+            data = _json_loads(block.strip())
+        except Exception:
+            continue
+        pending = data if isinstance(data, list) else [data]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, list):
+                pending.extend(node)
+            elif isinstance(node, dict):
+                node_type = node.get("@type")
+                if node_type == "JobPosting" or (isinstance(node_type, list) and "JobPosting" in node_type):
+                    yield node
+                if isinstance(node.get("@graph"), list):
+                    pending.extend(node["@graph"])
+
+def _json_ld_list_items(value):
+    """Split a JSON-LD text/HTML field (or list of them) into clean one-line items."""
+    if isinstance(value, list):
+        return [item for v in value for item in _json_ld_list_items(v)]
+    if not isinstance(value, str):
+        return []
+    value = html_unescape(value)
+    pieces = HTML_LIST_ITEM_RE.findall(value) or LIST_LINE_SPLIT_RE.split(HTML_TAG_RE.sub('\n', value))
+    items = (' '.join(HTML_TAG_RE.sub(' ', html_unescape(piece)).split()) for piece in pieces)
+    return [item for item in items if len(item) >= JSON_LD_MIN_ITEM_CHARS]
+
+def _job_posting_json_ld_items(html_text):
+    """
+    Responsibilities/qualifications from the page's schema.org JobPosting, or [] when the page
+    doesn't carry enough of them; the description's bullet list is used if the explicit fields are empty.
+    """
+    for posting in _json_ld_job_postings(html_text):
+        items = _json_ld_list_items(posting.get("responsibilities")) + _json_ld_list_items(posting.get("qualifications"))
+        if len(items) < JSON_LD_MIN_ITEMS:
+            description = html_unescape(posting.get("description") or "") if isinstance(posting.get("description"), str) else ""
+            items = [' '.join(HTML_TAG_RE.sub(' ', li).split()) for li in HTML_LIST_ITEM_RE.findall(description)]
+            items = [item for item in items if len(item) >= JSON_LD_MIN_ITEM_CHARS]
+        if len(items) >= JSON_LD_MIN_ITEMS:
+            return list(dict.fromkeys(items))
+    return []
+
+def _unique_tmp_path(suffix=""):
+    """Reserve a fresh file under tmp_dir so concurrent requests never share a path"""
+    with tempfile.NamedTemporaryFile(delete=False, dir=tmp_dir, suffix=suffix) as tf:
+        return tf.name
+
+def _remove_tmp_file(filepath):
+    """Best-effort removal of a per-request temporary file"""
+    try:
+        if filepath and os.path.exists(filepath):
+            os.remove(filepath)
+            logger.info(f"Temporary file {filepath} removed")
+    except Exception as e:
+        logger.warning(f"Could not delete temporary file {filepath}: {str(e)}")
+
 # Create boto3 client for bedrock if credentials are available
 try:
     bedrock_client = boto3.client(
@@ -206,59 +857,810 @@ except Exception as e:
 # A global store for question feedback. In production, use a real database.
 QUESTION_FEEDBACK = []
 
+# --- Shared AWS session, DynamoDB resource/tables and cached competency taxonomy ---
+# One boto3 Session per process: credentials and the service model are resolved once
+# and every handler reuses the same resource (and its urllib3 connection pool).
+_aws_session = None
+_dynamodb_resource = None
+_dynamodb_tables = {}
+_dynamodb_lock = threading.Lock()
+
+# botocore defaults to 10 pooled connections, fewer than the parallel scans and
+# per-competency queries can have in flight; adaptive retries absorb throttling.
+DYNAMODB_MAX_POOL_CONNECTIONS = int(os.getenv('DYNAMODB_MAX_POOL_CONNECTIONS', '50'))
+DYNAMODB_CONFIG = BotoConfig(
+    max_pool_connections=DYNAMODB_MAX_POOL_CONNECTIONS,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+)
+
+def _get_dynamodb():
+    """Return the process-wide DynamoDB resource, created on first use."""
+    global _aws_session, _dynamodb_resource
+    if _dynamodb_resource is None:
+        with _dynamodb_lock:
+            if _dynamodb_resource is None:
+                aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
+                aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
+                region_name = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
+                if not aws_access_key_id or not aws_secret_access_key:
+                    logger.info("Using default credential chain for DynamoDB")
+                    _aws_session = boto3.Session(region_name=region_name)
+                else:
+                    logger.info("Using environment credentials for DynamoDB")
+                    _aws_session = boto3.Session(
+                        aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key,
+                        region_name=region_name
+                    )
+                _dynamodb_resource = _aws_session.resource('dynamodb', config=DYNAMODB_CONFIG)
+    return _dynamodb_resource
+
+# get_db() (db_config) wraps this same resource, so it follows _reset_aws_clients too
+set_resource_factory(_get_dynamodb)
+
+def _get_table(table_name):
+    """Return a cached Table handle on the shared DynamoDB resource."""
+    table = _dynamodb_tables.get(table_name)
+    if table is None:
+        table = _get_dynamodb().Table(table_name)
+        _dynamodb_tables[table_name] = table
+    return table
+
+def _reset_aws_clients():
+    """Drop the cached session, resource and tables so new credentials are picked up."""
+    global _aws_session, _dynamodb_resource
+    with _dynamodb_lock:
+        _aws_session = None
+        _dynamodb_resource = None
+        _dynamodb_tables.clear()
+
+# Build the session at import so credential/setup problems are logged once, not per request
+try:
+    _get_dynamodb()
+    logger.info("Successfully created DynamoDB resource")
+except Exception as e:
+    logger.error(f"Failed to create DynamoDB resource: {str(e)}")
+
+# The competency list changes rarely, so scan it once per TTL instead of per request.
+# A hardcoded fallback is kept for a shorter time so a DB outage recovers quickly.
+COMPETENCY_CACHE_TTL = int(os.getenv('COMPETENCY_CACHE_TTL', '600'))
+COMPETENCY_FALLBACK_TTL = 60
+COMPETENCY_SCAN_SEGMENTS = int(os.getenv('COMPETENCY_SCAN_SEGMENTS', '4'))
+_competency_cache = {"value": None, "expires": 0.0}
+_competency_cache_lock = threading.Lock()
+
+def _scan_competencies_segment(segment):
+    competencies_table = _get_table(COMPETENCIES_TABLE_NAME)
+    comp_scan_paginator = competencies_table.meta.client.get_paginator('scan')
+    items = []
+    for page in comp_scan_paginator.paginate(
+        TableName=COMPETENCIES_TABLE_NAME,
+        ProjectionExpression="#nm, description",
+        ExpressionAttributeNames={"#nm": "name"},
+        Segment=segment,
+        TotalSegments=COMPETENCY_SCAN_SEGMENTS
+    ):
+        items.extend(page.get('Items', []))
+    return items
+
+def _load_competencies(force=False):
+    """
+    Load the standard competencies, cached in-process. force=True rescans even if the
+    cache is fresh. If a rescan fails, the last copy loaded from the DB keeps being served.
+
+    Returns a dict with:
+        names: sorted tuple of competency names
+        names_set: frozenset of the same names, for membership checks
+        schema_enum: list of the same names, for json_schema tag enums
+        details: {name: description}
+        prompt_block: the "- Name: description" list used in LLM prompts
+        prompt_hash: sha256 of prompt_block, for keying cached LLM replies
+        from_db: False when the hardcoded fallback was used
+    """
+    now = time.monotonic()
+    cached = _competency_cache["value"]
+    if not force and cached is not None and now < _competency_cache["expires"]:
+        return cached
+
+    with _competency_cache_lock:
+        cached = _competency_cache["value"]
+        if not force and cached is not None and time.monotonic() < _competency_cache["expires"]:
+            return cached
+
+        details = {}
+        from_db = True
+        try:
+            logger.info("Connecting to DynamoDB to get standard competencies and descriptions")
+            with ThreadPoolExecutor(max_workers=COMPETENCY_SCAN_SEGMENTS) as pool:
+                segments = list(pool.map(_scan_competencies_segment, range(COMPETENCY_SCAN_SEGMENTS)))
+            for items in segments:
+                for item in items:
+                    comp_name = item.get('name')
+                    if comp_name:
+                        details[comp_name] = item.get('description', '')
+            if not details:
+                raise ValueError(f"table {COMPETENCIES_TABLE_NAME} returned no competencies")
+            logger.info(f"Loaded {len(details)} standard competency names and details from DB.")
+        except Exception as db_error:
+            if cached is not None and cached["from_db"]:
+                # A stale copy of the real taxonomy beats switching to the defaults mid-session
+                logger.warning(f"Could not refresh competencies from DynamoDB: {str(db_error)}. Serving the previous copy.")
+                _competency_cache["expires"] = time.monotonic() + COMPETENCY_FALLBACK_TTL
+                return cached
+            logger.warning(f"Could not load competencies from DynamoDB: {str(db_error)}. Using hardcoded fallback.")
+            from_db = False
+            # Fallback to hardcoded competencies for common interview skills
+            details = dict(DEFAULT_COMPETENCIES)
+            logger.info(f"Using {len(details)} hardcoded competencies as fallback")
+
+        if from_db:
+            names = tuple(sorted(details))
+            prompt_block = "\n".join([f"- {name}: {details.get(name, '')}" for name in names])
+        else:
+            names = DEFAULT_COMPETENCY_NAMES
+            prompt_block = DEFAULT_COMPETENCIES_PROMPT
+        value = {
+            "names": names,
+            "names_set": frozenset(names),
+            "schema_enum": list(names),
+            "details": details,
+            "prompt_block": prompt_block,
+            "from_db": from_db,
+        }
+        value["prompt_hash"] = hashlib.sha256(value["prompt_block"].encode("utf-8")).hexdigest()
+        _competency_cache["value"] = value
+        _competency_cache["expires"] = time.monotonic() + (COMPETENCY_CACHE_TTL if from_db else COMPETENCY_FALLBACK_TTL)
+        return value
+
+# Background event loop shared by request threads, so the async OpenAI client
+# keeps a single connection pool instead of binding to a throwaway loop per call
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+def _run_async(coro):
+    """Run a coroutine on the shared background event loop and wait for its result."""
+    global _async_loop
+    if _async_loop is None:
+        with _async_loop_lock:
+            if _async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="openai-async-loop", daemon=True).start()
+                _async_loop = loop
+    return asyncio.run_coroutine_threadsafe(coro, _async_loop).result()
+
+# Pacing for the async fan-out. A 429 or a reply whose rate-limit headers show the budget
+# nearly spent pauses every caller until the reported reset, rather than letting each task
+# keep firing into more 429s. Only touched from the background loop, so no lock is needed.
+OPENAI_RATE_LIMIT_RETRIES = 3
+OPENAI_LOW_REMAINING_REQUESTS = 2
+OPENAI_LOW_REMAINING_TOKENS = 4000
+RATE_RESET_RE = re.compile(r'([\d.]+)(ms|s|m|h)')
+RATE_RESET_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+_openai_rate_state = {"resume_at": 0.0}
+
+# Client-side requests/tokens-per-minute budget for the async fan-out, so a large batch is
+# spread over the minute instead of bursting into 429s; 0 disables a limit
+OPENAI_MAX_RPM = int(os.getenv('OPENAI_MAX_RPM', '0'))
+OPENAI_MAX_TPM = int(os.getenv('OPENAI_MAX_TPM', '0'))
+OPENAI_DEFAULT_COMPLETION_TOKENS = 500
+_openai_budget = {"requests": float(OPENAI_MAX_RPM), "tokens": float(OPENAI_MAX_TPM), "updated": time.monotonic()}
+
+def _estimate_request_tokens(kwargs):
+    """Rough token cost of a chat request: ~4 characters per prompt token plus the reply cap."""
+    prompt_chars = sum(len(m.get("content") or "") for m in kwargs.get("messages", []))
+    return prompt_chars // 4 + kwargs.get("max_tokens", OPENAI_DEFAULT_COMPLETION_TOKENS)
+
+async def _acquire_openai_budget(tokens):
+    """Wait until the per-minute budget covers one request of this many tokens, then spend it."""
+    if not OPENAI_MAX_RPM and not OPENAI_MAX_TPM:
+        return
+    # A request bigger than the whole minute's budget would otherwise never fit
+    tokens = min(tokens, OPENAI_MAX_TPM) if OPENAI_MAX_TPM else 0
+    while True:
+        now = time.monotonic()
+        elapsed = now - _openai_budget["updated"]
+        _openai_budget["updated"] = now
+        if OPENAI_MAX_RPM:
+            _openai_budget["requests"] = min(OPENAI_MAX_RPM, _openai_budget["requests"] + elapsed * OPENAI_MAX_RPM / 60.0)
+        if OPENAI_MAX_TPM:
+            _openai_budget["tokens"] = min(OPENAI_MAX_TPM, _openai_budget["tokens"] + elapsed * OPENAI_MAX_TPM / 60.0)
+        wait = 0.0
+        if OPENAI_MAX_RPM and _openai_budget["requests"] < 1:
+            wait = (1 - _openai_budget["requests"]) * 60.0 / OPENAI_MAX_RPM
+        if OPENAI_MAX_TPM and _openai_budget["tokens"] < tokens:
+            wait = max(wait, (tokens - _openai_budget["tokens"]) * 60.0 / OPENAI_MAX_TPM)
+        if wait <= 0:
+            if OPENAI_MAX_RPM:
+                _openai_budget["requests"] -= 1
+            _openai_budget["tokens"] -= tokens
+            return
+        await asyncio.sleep(wait)
+
+def _parse_reset_seconds(value):
+    """Parse an x-ratelimit-reset-* value such as '1s', '6m0s' or '250ms' into seconds."""
+    if not value:
+        return 0.0
+    return sum(float(amount) * RATE_RESET_UNITS[unit] for amount, unit in RATE_RESET_RE.findall(value))
+
+def _note_rate_limit_headers(headers):
+    try:
+        remaining_requests = int(headers.get('x-ratelimit-remaining-requests', OPENAI_LOW_REMAINING_REQUESTS + 1))
+        remaining_tokens = int(headers.get('x-ratelimit-remaining-tokens', OPENAI_LOW_REMAINING_TOKENS + 1))
+    except ValueError:
+        return
+    pause = 0.0
+    if remaining_requests <= OPENAI_LOW_REMAINING_REQUESTS:
+        pause = _parse_reset_seconds(headers.get('x-ratelimit-reset-requests'))
+    if remaining_tokens <= OPENAI_LOW_REMAINING_TOKENS:
+        pause = max(pause, _parse_reset_seconds(headers.get('x-ratelimit-reset-tokens')))
+    if pause > 0:
+        logger.info(f"OpenAI rate limit nearly spent ({remaining_requests} requests, {remaining_tokens} tokens left); pausing {pause:.2f}s")
+        _openai_rate_state["resume_at"] = max(_openai_rate_state["resume_at"], time.monotonic() + pause)
+
+async def _create_completion_async(sem, **kwargs):
+    """
+    Run one chat completion on the async client, bounded by sem and paced by the shared
+    rate-limit state. Rate-limited calls wait out retry-after (plus jitter) and are retried
+    up to OPENAI_RATE_LIMIT_RETRIES times; the SDK's own retries are disabled so they don't stack.
+    With OPENAI_MAX_RPM/OPENAI_MAX_TPM set, each attempt also waits for the per-minute budget.
+    """
+    token_estimate = _estimate_request_tokens(kwargs)
+    for attempt in range(OPENAI_RATE_LIMIT_RETRIES + 1):
+        async with sem:
+            delay = _openai_rate_state["resume_at"] - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await _acquire_openai_budget(token_estimate)
+            try:
+                raw = await async_client.with_options(max_retries=0).chat.completions.with_raw_response.create(**kwargs)
+            except openai.RateLimitError as e:
+                if attempt == OPENAI_RATE_LIMIT_RETRIES:
+                    raise
+                try:
+                    retry_after = float(e.response.headers.get('retry-after', 1))
+                except (AttributeError, ValueError):
+                    retry_after = 1.0
+                wait = retry_after + random.uniform(0, 0.5 * 2 ** attempt)
+                logger.warning(f"OpenAI rate limited (attempt {attempt + 1}); retrying in {wait:.2f}s")
+                _openai_rate_state["resume_at"] = max(_openai_rate_state["resume_at"], time.monotonic() + wait)
+                continue
+        _note_rate_limit_headers(raw.headers)
+        return raw.parse()
+
+# Model used for competency tagging. Tagging is classification against a fixed
+# taxonomy, so the small tier is the default; COMPETENCY_MODEL_TIER=large is kept for evals.
+COMPETENCY_MODEL_TIERS = {"small": "gpt-4o-mini", "large": "gpt-4o"}
+COMPETENCY_MODEL_TIER = os.getenv('COMPETENCY_MODEL_TIER', 'small')
+RESPONSIBILITY_TAGGING_MODEL = COMPETENCY_MODEL_TIERS.get(COMPETENCY_MODEL_TIER, COMPETENCY_MODEL_TIERS["small"])
+
+# Responsibilities sent per tagging call. The competency list dominates the prompt,
+# so sending it once per chunk instead of once per responsibility saves most tokens.
+TAGGING_CHUNK_SIZE = 20
+
+# Model families that accept json_schema response formats; others get plain JSON mode
+STRUCTURED_OUTPUT_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "o1", "o3", "o4")
+
+def _catalog_names(standard_list_for_prompt):
+    """Competency names for a prompt block: the cached epoch's list, else parsed from "- Name: description" lines."""
+    cached = _competency_cache["value"]
+    if cached is not None and cached["prompt_block"] == standard_list_for_prompt:
+        return cached["schema_enum"]
+    names = {}
+    for line in standard_list_for_prompt.splitlines():
+        if line.startswith("- "):
+            names[line[2:].split(": ", 1)[0]] = None
+    return list(names)
+
+def _tag_array_schema(standard_list_for_prompt):
+    return {"type": "array", "items": {"type": "string", "enum": _catalog_names(standard_list_for_prompt)}}
+
+# Strict schemas pin every tag to the current catalog via an enum, so replies can't carry
+# invented or misspelled names. Built per prompt block, i.e. once per competency-cache epoch.
+@functools.lru_cache(maxsize=4)
+def _tag_response_format(standard_list_for_prompt):
+    """response_format for a single {"tags": [...]} reply."""
+    if not RESPONSIBILITY_TAGGING_MODEL.startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES):
+        return {"type": "json_object"}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "competency_tags",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"tags": _tag_array_schema(standard_list_for_prompt)},
+                "required": ["tags"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+@functools.lru_cache(maxsize=4 * TAGGING_CHUNK_SIZE)
+def _chunk_response_format(standard_list_for_prompt, item_count):
+    """response_format for a chunk reply keyed "1".."item_count"."""
+    if not RESPONSIBILITY_TAGGING_MODEL.startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES):
+        return {"type": "json_object"}
+    keys = [str(i + 1) for i in range(item_count)]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "competency_tags_by_item",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {key: {"$ref": "#/$defs/tags"} for key in keys},
+                "required": keys,
+                "additionalProperties": False,
+                "$defs": {"tags": _tag_array_schema(standard_list_for_prompt)}
+            }
+        }
+    }
+
+RESPONSIBILITY_TAGGING_SYSTEM_PROMPT = "You are an expert HR analyst identifying relevant competencies (1-5) for specific job tasks."
+
+# The taxonomy and instructions live in the system message, built once per competency
+# list, so every request shares a byte-identical prefix that OpenAI's prompt caching can
+# reuse. The user message carries only the per-call text. Single-item, chunked and summary
+# prompts all start with the same catalog prefix, so they warm one cache entry between them.
+@functools.lru_cache(maxsize=4)
+def _competency_catalog_prefix(standard_list_for_prompt):
+    return f"""{RESPONSIBILITY_TAGGING_SYSTEM_PROMPT}
+
+            Consider this list of standard competencies and their descriptions:
+            {standard_list_for_prompt}
+"""
+
+@functools.lru_cache(maxsize=4)
+def _responsibility_system_prompt(standard_list_for_prompt):
+    return f"""{_competency_catalog_prefix(standard_list_for_prompt)}
+            You will receive one job responsibility.
+            Instructions:
+            - Determine which competencies from the standard list (between 1 and 5) are the **most directly relevant** to the responsibility described.
+            - You **must** return at least one competency if any from the list seem relevant, even partially.
+            - Return up to 5 competencies if multiple are clearly relevant.
+            - Return ONLY a JSON object of the form {{"tags": [...]}} containing the name(s) of the most relevant competency/competencies.
+            - Only return an empty list `{{"tags": []}}` if absolutely **no** competency from the list has any relevance.
+            Example Output (1-5 items): {{"tags": ["Competency A", "Competency B"]}}
+            Example Output (if none relevant): {{"tags": []}}
+            """
+
+def _build_responsibility_messages(responsibility, standard_list_for_prompt):
+    """Build the messages for tagging a single responsibility."""
+    return [
+        {"role": "system", "content": _responsibility_system_prompt(standard_list_for_prompt)},
+        {"role": "user", "content": responsibility}
+    ]
+
+def _tag_responsibility_sync(responsibility, standard_list_for_prompt):
+    """Tag one responsibility with a blocking call (used when no async client is available)."""
+    if not client:
+        logger.error("OpenAI client is None.")
+        return ""
+    try:
+        return _chat(
+            RESPONSIBILITY_TAGGING_MODEL,
+            _build_responsibility_messages(responsibility, standard_list_for_prompt),
+            response_format=_tag_response_format(standard_list_for_prompt),
+            temperature=0.0
+        )
+    except Exception as llm_resp_err:
+        logger.exception(f"Error calling LLM for responsibility '{responsibility[:60]}...': {llm_resp_err}")
+    return ""
+
+async def _tag_responsibility_async(responsibility, standard_list_for_prompt, sem):
+    """Tag one responsibility via the async client, bounded by the shared semaphore and rate-limit pacing."""
+    try:
+        completion = await _create_completion_async(
+            sem,
+            model=RESPONSIBILITY_TAGGING_MODEL,
+            messages=_build_responsibility_messages(responsibility, standard_list_for_prompt),
+            response_format=_tag_response_format(standard_list_for_prompt),
+            temperature=0.0
+        )
+        return completion.choices[0].message.content
+    except Exception as llm_resp_err:
+        # Swallow per-item failures so one bad call doesn't cancel the whole gather
+        logger.exception(f"Error calling LLM for responsibility '{responsibility[:60]}...': {llm_resp_err}")
+        return ""
+
+@functools.lru_cache(maxsize=4)
+def _chunk_system_prompt(standard_list_for_prompt):
+    return f"""{_competency_catalog_prefix(standard_list_for_prompt)}
+            You will receive a numbered list of job responsibilities. For each one:
+            - Determine which competencies from the standard list (between 1 and 5) are the **most directly relevant** to it.
+            - You **must** return at least one competency if any from the list seem relevant, even partially.
+            - Only use an empty list `[]` if absolutely **no** competency from the list has any relevance.
+            Return ONLY a JSON object keyed by item number, with exactly one list of competency names per item.
+            Example Output (3 items): {{"1": ["Competency A", "Competency B"], "2": ["Competency C"], "3": []}}
+            """
+
+def _build_chunk_messages(chunk, standard_list_for_prompt):
+    """Build messages asking for tags for a numbered list of responsibilities in one call."""
+    return [
+        {"role": "system", "content": _chunk_system_prompt(standard_list_for_prompt)},
+        {"role": "user", "content": "\n".join(f"{i + 1}. {r}" for i, r in enumerate(chunk))}
+    ]
+
+def _split_chunk_reply(llm_response_content, chunk):
+    """
+    Split a multi-item reply into per-item JSON list strings. Items the reply doesn't
+    cover come back as None so only those are retried one by one.
+    """
+    parsed_data = None
+    try:
+        parsed_data = _json_loads(llm_response_content) if llm_response_content else None
+    except json.JSONDecodeError:
+        pass
+    if not isinstance(parsed_data, dict):
+        logger.warning(f"Chunked tagging reply was not a JSON object; retrying {len(chunk)} responsibilities per item")
+        return [None] * len(chunk)
+
+    results = parsed_data.get("results")
+    if isinstance(results, list) and len(results) == len(chunk):
+        # Older positional form
+        items = results
+    else:
+        items = [parsed_data.get(str(i + 1)) for i in range(len(chunk))]
+    per_item = [json.dumps(item) if isinstance(item, list) else None for item in items]
+    missing = per_item.count(None)
+    if missing:
+        logger.warning(f"Chunked tagging reply was missing {missing} of {len(chunk)} responsibilities; retrying those per item")
+    return per_item
+
+def _chunked(items, size=TAGGING_CHUNK_SIZE):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _tag_chunk_sync(chunk, standard_list_for_prompt):
+    """Tag a chunk of responsibilities in one blocking call, retrying per item if the reply is misaligned."""
+    try:
+        llm_response_content = _chat(
+            RESPONSIBILITY_TAGGING_MODEL,
+            _build_chunk_messages(chunk, standard_list_for_prompt),
+            response_format=_chunk_response_format(standard_list_for_prompt, len(chunk)),
+            temperature=0.0,
+            max_tokens=150 * len(chunk)
+        )
+        per_item = _split_chunk_reply(llm_response_content, chunk)
+    except Exception as llm_resp_err:
+        logger.exception(f"Error calling LLM for a chunk of {len(chunk)} responsibilities: {llm_resp_err}")
+        return [""] * len(chunk)
+    return [
+        content if content is not None else _tag_responsibility_sync(r, standard_list_for_prompt)
+        for r, content in zip(chunk, per_item)
+    ]
+
+def _tag_responsibilities_sync(responsibilities, standard_list_for_prompt):
+    """
+    Tag responsibilities with blocking calls, one call per chunk. Chunks run on a thread
+    pool bounded by OPENAI_MAX_CONCURRENCY, mirroring the async fan-out.
+    """
+    if not client:
+        logger.error("OpenAI client is None.")
+        return [""] * len(responsibilities)
+
+    chunks = _chunked(responsibilities)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), OPENAI_MAX_CONCURRENCY))) as pool:
+        chunk_results = list(pool.map(lambda chunk: _tag_chunk_sync(chunk, standard_list_for_prompt), chunks))
+    return [content for per_item in chunk_results for content in per_item]
+
+async def _tag_chunk_async(chunk, standard_list_for_prompt, sem):
+    """Tag a chunk of responsibilities in one async call, retrying per item if the reply is misaligned."""
+    try:
+        completion = await _create_completion_async(
+            sem,
+            model=RESPONSIBILITY_TAGGING_MODEL,
+            messages=_build_chunk_messages(chunk, standard_list_for_prompt),
+            response_format=_chunk_response_format(standard_list_for_prompt, len(chunk)),
+            temperature=0.0,
+            max_tokens=150 * len(chunk)
+        )
+        per_item = _split_chunk_reply(completion.choices[0].message.content, chunk)
+    except Exception as llm_resp_err:
+        logger.exception(f"Error calling LLM for a chunk of {len(chunk)} responsibilities: {llm_resp_err}")
+        return [""] * len(chunk)
+    missing = [i for i, content in enumerate(per_item) if content is None]
+    if missing:
+        retried = await asyncio.gather(*[
+            _tag_responsibility_async(chunk[i], standard_list_for_prompt, sem)
+            for i in missing
+        ])
+        for i, content in zip(missing, retried):
+            per_item[i] = content
+    return per_item
+
+async def _tag_responsibilities_async(responsibilities, standard_list_for_prompt):
+    sem = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    chunk_results = await asyncio.gather(*[
+        _tag_chunk_async(chunk, standard_list_for_prompt, sem)
+        for chunk in _chunked(responsibilities)
+    ])
+    return [content for per_item in chunk_results for content in per_item]
+
+def _parse_competency_tags(llm_response_content, responsibility, standard_competency_names):
+    """Parse an LLM tagging reply into a list of 1-5 unique, valid standard competency names in reply order."""
+    logger.debug(f"LLM Raw Response for Resp Tagging: {llm_response_content}")
+
+    # Parse response: {"tags": [...]} from single-item calls, a bare list per item from chunked calls
+    parsed_llm_tags = None
+    if llm_response_content:
+        try:
+            parsed_data = _json_loads(llm_response_content)
+            if isinstance(parsed_data, list):
+                parsed_llm_tags = parsed_data
+            elif isinstance(parsed_data, dict):
+                parsed_llm_tags = parsed_data.get("tags")
+            if parsed_llm_tags is None:
+                logger.warning(f"LLM returned unexpected JSON structure: {parsed_data}")
+        except json.JSONDecodeError:
+            logger.error(f"LLM tagging reply was not valid JSON: {llm_response_content}")
+
+    # Validate and add to set (expecting 1-5 valid tags)
+    llm_matched_competencies = []
+    if isinstance(parsed_llm_tags, list) and 1 <= len(parsed_llm_tags) <= 5:
+        validated_tags = {} # Insertion-ordered dedup, so tag order is stable across workers
+        for tag in parsed_llm_tags:
+            if isinstance(tag, str) and tag in standard_competency_names:
+                validated_tags[tag] = None
+            else:
+                logger.warning(f"LLM returned invalid/non-standard tag and it was ignored: {tag}")
+        
+        if validated_tags: # Add only if at least one valid tag was found
+            llm_matched_competencies = list(validated_tags)
+            logger.debug(f"  LLM tagged '{responsibility[:60]}...' with valid tags: {llm_matched_competencies}")
+        else:
+            logger.warning(f"LLM list contained only invalid/non-standard tags: {parsed_llm_tags}")
+    elif isinstance(parsed_llm_tags, list) and len(parsed_llm_tags) == 0:
+         logger.info(f"LLM explicitly returned no relevant tags for: '{responsibility[:60]}...'")
+    else:
+        logger.warning(f"LLM did not return a list with 1-5 items: {parsed_llm_tags}")
+    return llm_matched_competencies
+
+# Below this many responsibilities the Batch API round trip isn't worth it
+BATCH_MIN_RESPONSIBILITIES = 20
+# How long a batch_mode caller will wait for the batch before falling back
+OPENAI_BATCH_POLL_TIMEOUT = int(os.getenv('OPENAI_BATCH_POLL_TIMEOUT', '600'))
+OPENAI_BATCH_POLL_INTERVAL = 10
+
+def _tag_responsibilities_batch(responsibilities, standard_list_for_prompt):
+    """
+    Tag responsibilities through the OpenAI Batch API (half price, no per-minute limits).
+    Returns the reply contents in input order, or None if the batch could not be completed.
+    """
+    if client is None:
+        logger.warning("OpenAI client is None; skipping batch mode.")
+        return None
+
+    batch = None
+    try:
+        lines = []
+        for i, responsibility in enumerate(responsibilities):
+            lines.append(json.dumps({
+                "custom_id": f"resp-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": RESPONSIBILITY_TAGGING_MODEL,
+                    "messages": _build_responsibility_messages(responsibility, standard_list_for_prompt),
+                    "response_format": _tag_response_format(standard_list_for_prompt),
+                    "temperature": 0.0
+                }
+            }))
+        batch_file = client.files.create(
+            file=("responsibilities.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(responsibilities)} responsibilities")
+
+        deadline = time.time() + OPENAI_BATCH_POLL_TIMEOUT
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.time() > deadline:
+                logger.warning(f"Batch {batch.id} still '{batch.status}' after {OPENAI_BATCH_POLL_TIMEOUT}s; cancelling.")
+                client.batches.cancel(batch.id)
+                return None
+            time.sleep(OPENAI_BATCH_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Batch {batch.id} ended with status '{batch.status}'")
+            return None
+
+        # Map results back by custom_id; output order is not guaranteed
+        contents_by_id = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            result = _json_loads(line)
+            try:
+                contents_by_id[result["custom_id"]] = result["response"]["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                logger.warning(f"Batch result for {result.get('custom_id')} had no completion: {result.get('error')}")
+        return [contents_by_id.get(f"resp-{i}", "") for i in range(len(responsibilities))]
+    except Exception as batch_err:
+        logger.exception(f"Batch tagging failed: {batch_err}")
+        return None
+
+# Tagging runs at temperature 0, so the same responsibility seen in another job
+# posting can reuse the earlier reply instead of calling the API again
+_tag_response_cache = LRUCache(maxsize=10_000)
+_tag_response_cache_lock = threading.Lock()
+
+def _responsibility_key(responsibility):
+    """Normalized form shared by in-request dedup, the reply cache and the curated map."""
+    return NON_WORD_RE.sub(' ', responsibility).strip().lower()
+
+def _tag_cache_key(responsibility, prompt_hash):
+    return hashlib.sha256(json.dumps({
+        "model": RESPONSIBILITY_TAGGING_MODEL,
+        "resp": _responsibility_key(responsibility),
+        "comp_hash": prompt_hash
+    }, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _get_tag_responses(responsibilities, standard_list_for_prompt, prompt_hash, batch_mode=False):
+    """Return raw LLM tagging replies for each responsibility, serving repeats from the cache."""
+    keys = [_tag_cache_key(r, prompt_hash) for r in responsibilities]
+    with _tag_response_cache_lock:
+        llm_responses = [_tag_response_cache.get(k) for k in keys]
+    misses = [r for r, cached in zip(responsibilities, llm_responses) if cached is None]
+    logger.info(f"Tag cache: {len(responsibilities) - len(misses)} hits, {len(misses)} misses")
+    if not misses:
+        return llm_responses
+
+    fresh = None
+    if batch_mode and len(misses) >= BATCH_MIN_RESPONSIBILITIES:
+        fresh = _tag_responsibilities_batch(misses, standard_list_for_prompt)
+
+    # Tag in chunks of TAGGING_CHUNK_SIZE, fanning the chunks out concurrently;
+    # fall back to blocking calls when only the sync/legacy client is available
+    if fresh is None:
+        if async_client is not None:
+            logger.info(f"Tagging {len(misses)} responsibilities in {len(_chunked(misses))} concurrent call(s) (max {OPENAI_MAX_CONCURRENCY} in flight)")
+            fresh = _run_async(_tag_responsibilities_async(misses, standard_list_for_prompt))
+        else:
+            fresh = _tag_responsibilities_sync(misses, standard_list_for_prompt)
+
+    fresh_iter = iter(fresh)
+    with _tag_response_cache_lock:
+        for i, key in enumerate(keys):
+            if llm_responses[i] is None:
+                llm_responses[i] = next(fresh_iter)
+                # Failed calls come back empty; don't pin those in the cache
+                if llm_responses[i]:
+                    _tag_response_cache[key] = llm_responses[i]
+    return llm_responses
+
+# Boilerplate bullets/summaries with no competency signal; skipped before any DB or LLM work
+TRIVIAL_TEXTS = frozenset({
+    "n a", "na", "none", "tbd", "tba", "etc", "see above", "see below",
+    "duties", "responsibilities", "requirements", "job description", "job summary",
+    "other duties as assigned", "other duties as required", "perform other duties as assigned",
+    "and other duties as assigned", "additional duties as assigned"
+})
+MIN_TAGGABLE_LENGTH = 10
+# Catch-all bullets phrased in ways TRIVIAL_TEXTS can't enumerate ("performs other related
+# duties as assigned by the manager"). Anchored near the start and limited to short bullets,
+# so a real task ending in "...and other duties as assigned" is still tagged.
+BOILERPLATE_DUTIES_RE = re.compile(r'^(?:\w+\s+){0,2}other\s+(?:related\s+|job\s+)?duties\b.*\bas\s+(?:assigned|required|needed|directed)\b')
+BOILERPLATE_MAX_WORDS = 10
+
+# Short, unambiguous bullets tagged without an LLM call. Matched on the normalized text and
+# only used when every tag is in the current standard list; anything else goes to the LLM.
+CURATED_RESPONSIBILITY_TAGS = {
+    "budget management": ("Financial Acumen",),
+    "financial analysis": ("Financial Acumen", "Analytical Thinking"),
+    "data analysis": ("Analytical Thinking",),
+    "project management": ("Project Management",),
+    "manage projects": ("Project Management",),
+    "team leadership": ("Leadership",),
+    "lead the team": ("Leadership",),
+    "people management": ("Leadership",),
+    "customer service": ("Customer Focus",),
+    "contract negotiation": ("Negotiation",),
+    "negotiate contracts": ("Negotiation",),
+    "risk management": ("Risk Management",),
+    "strategic planning": ("Strategic Planning",),
+}
+
+def _is_trivial_text(text):
+    """True for empty, very short, punctuation-only or boilerplate text."""
+    if not text or not isinstance(text, str):
+        return True
+    stripped = text.strip()
+    if len(stripped) < MIN_TAGGABLE_LENGTH:
+        return True
+    normalized = NON_WORD_RE.sub(' ', stripped).strip().lower()
+    if not normalized or normalized in TRIVIAL_TEXTS:
+        return True
+    return len(normalized.split()) <= BOILERPLATE_MAX_WORDS and BOILERPLATE_DUTIES_RE.search(normalized) is not None
+
+def _curated_tag_reply(dedup_key, standard_competency_names):
+    """A tagging reply for a curated short bullet, in the LLM's JSON list form, or None."""
+    tags = CURATED_RESPONSIBILITY_TAGS.get(dedup_key)
+    if tags and all(tag in standard_competency_names for tag in tags):
+        return json.dumps(list(tags))
+    return None
+
+# Set by functions that had to fall back to hardcoded data, so _memoize_result doesn't keep
+# a degraded result for the full TTL; per thread since request threads run concurrently
+_degraded_state = threading.local()
+
+def _mark_degraded():
+    """Flag the current memoized call's result as built from fallback data (not cacheable)."""
+    _degraded_state.flag = True
+
+def _memoize_result(should_cache=bool, epoch=None):
+    """
+    Memoize a function of a list argument (plus hashable extras) for COMPETENCY_CACHE_TTL.
+    The list is keyed as a tuple, only results passing should_cache are kept, and callers
+    get a deep copy since they often store the result in the session and modify it.
+    Results of calls that hit _mark_degraded() are never kept. epoch, if given, is called
+    per lookup and its value joins the key, so a changed data source misses the old entries.
+    """
+    def decorator(func):
+        cache = TTLCache(maxsize=1024, ttl=COMPETENCY_CACHE_TTL)
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(items, *args, **kwargs):
+            try:
+                key = (tuple(items or ()), args, tuple(sorted(kwargs.items())), epoch() if epoch else None)
+                hash(key)
+            except TypeError:
+                return func(items, *args, **kwargs)
+            with lock:
+                hit = cache.get(key)
+            if hit is not None:
+                return copy.deepcopy(hit)
+            outer_degraded = getattr(_degraded_state, "flag", False)
+            _degraded_state.flag = False
+            try:
+                result = func(items, *args, **kwargs)
+            finally:
+                degraded = _degraded_state.flag
+                _degraded_state.flag = outer_degraded or degraded
+            if not degraded and should_cache(result):
+                with lock:
+                    cache[key] = result
+            return copy.deepcopy(result)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
 # Function to analyze responsibilities and tag with competencies
-def analyze_job_responsibilities(responsibilities):
+@_memoize_result(
+    lambda result: bool(result.get("top_competencies")),
+    # Current catalog epoch without forcing a load, so trivial input still skips DynamoDB
+    epoch=lambda: (_competency_cache["value"] or {}).get("prompt_hash")
+)
+def analyze_job_responsibilities(responsibilities, batch_mode=False):
     """
     Analyze job responsibilities and tag with relevant competencies FROM THE STANDARD LIST.
     Uses LLM to analyze each responsibility against the standard competency descriptions.
+    With batch_mode=True, large inputs go through the OpenAI Batch API (cheaper, slower).
     """
     logger.info("--- RUNNING analyze_job_responsibilities - LLM_ONLY_TAGGING_V1 ---") 
     # Initialize variables
     competency_counts = Counter() # Aggregate counts for overall top 5 ranking
     tagged_responsibilities = []
-    standard_competency_names = set()
-    standard_competencies_details = {}
+    standard_competency_names = frozenset()
     
     try:
-        # --- Get Standard Competencies --- 
-        aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
-        aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-        region_name = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-        
-        try:
-            logger.info("Connecting to DynamoDB to get standard competencies and descriptions")
-            dynamodb = boto3.resource('dynamodb', region_name=region_name)
-            competencies_table = dynamodb.Table(COMPETENCIES_TABLE_NAME) 
-            comp_scan_paginator = competencies_table.meta.client.get_paginator('scan')
-            for page in comp_scan_paginator.paginate(TableName=COMPETENCIES_TABLE_NAME, ProjectionExpression="#nm, description", ExpressionAttributeNames={"#nm": "name"}):
-                 for item in page.get('Items', []):
-                     comp_name = item.get('name')
-                     if comp_name:
-                          standard_competency_names.add(comp_name)
-                          standard_competencies_details[comp_name] = item.get('description', '') 
-            logger.info(f"Loaded {len(standard_competency_names)} standard competency names and details from DB.")
-        except Exception as db_error:
-            logger.warning(f"Could not load competencies from DynamoDB: {str(db_error)}. Using hardcoded fallback.")
-            # Fallback to hardcoded competencies for common interview skills
-            standard_competencies_details = {
-                "Analytical Thinking": "Ability to analyze complex information and solve problems systematically",
-                "Financial Acumen": "Understanding of financial concepts, analysis, and business metrics",
-                "Communication": "Effectively conveying information and ideas to others",
-                "Leadership": "Guiding and motivating teams to achieve goals",
-                "Technical Expertise": "Deep knowledge and skills in specific technical areas",
-                "Customer Focus": "Understanding and meeting customer needs effectively",
-                "Strategic Planning": "Developing long-term plans and strategies",
-                "Risk Management": "Identifying and mitigating potential risks",
-                "Collaboration": "Working effectively with others to achieve common goals",
-                "Innovation": "Creating new ideas and approaches to solve problems",
-                "Project Management": "Planning and executing projects successfully",
-                "Negotiation": "Reaching mutually beneficial agreements",
-                "Decision Making": "Making sound judgments based on available information",
-                "Adaptability": "Adjusting to changing circumstances and requirements",
-                "Business Acumen": "Understanding business operations and market dynamics"
-            }
-            standard_competency_names = set(standard_competencies_details.keys())
-            logger.info(f"Using {len(standard_competency_names)} hardcoded competencies as fallback")
+        # Drop empty/boilerplate bullets first so degenerate input costs no remote I/O
+        responsibilities_to_tag = [r for r in (responsibilities or []) if not _is_trivial_text(r)]
+        if not responsibilities_to_tag:
+             logger.warning("No substantive responsibilities provided to analyze.")
+             return {"tagged_responsibilities": [], "top_competencies": []}
+
+        # --- Get Standard Competencies (cached) --- 
+        competency_data = _load_competencies()
+        standard_competency_names = competency_data["names_set"]
+        if not competency_data["from_db"]:
+            _mark_degraded()
 
         if not standard_competency_names:
              logger.error("No standard competency names found in the database or fallback. Cannot perform analysis.")
@@ -271,122 +1673,44 @@ def analyze_job_responsibilities(responsibilities):
         # logger.info(f"Mapped {len(keywords_map)} keywords to standard competencies.")
 
         # --- Process Responsibilities using LLM ---
-        if not responsibilities:
-             logger.warning("No responsibilities provided to analyze.")
-             return {"tagged_responsibilities": [], "top_competencies": []}
-        
-        standard_list_for_prompt = "\n".join([f"- {name}: {standard_competencies_details.get(name, '')}" for name in sorted(standard_competency_names)])
-
-        for responsibility in responsibilities:
-            if not responsibility or not isinstance(responsibility, str): 
-                 continue
-                 
-            llm_matched_competencies = set()
-            
-            # Always call LLM for each responsibility
-            logger.debug(f"Analyzing responsibility via LLM: '{responsibility[:60]}...'")
-            llm_prompt_responsibility = f"""
-            Analyze this specific job responsibility:
-            `{responsibility}`
-
-            Consider this list of standard competencies and their descriptions:
-            {standard_list_for_prompt}
+        standard_list_for_prompt = competency_data["prompt_block"]
+
+        # Near-identical bullets ("Lead cross-functional teams" / "lead cross functional teams")
+        # are tagged once and the reply is shared by every occurrence
+        dedup_keys = [_responsibility_key(r) for r in responsibilities_to_tag]
+        unique_index_by_key = {}
+        unique_responsibilities = []
+        unique_keys = []
+        for r, dedup_key in zip(responsibilities_to_tag, dedup_keys):
+            if dedup_key not in unique_index_by_key:
+                unique_index_by_key[dedup_key] = len(unique_responsibilities)
+                unique_responsibilities.append(r)
+                unique_keys.append(dedup_key)
+        if len(unique_responsibilities) < len(responsibilities_to_tag):
+            logger.info(f"Deduplicated {len(responsibilities_to_tag)} responsibilities to {len(unique_responsibilities)} unique")
+
+        # Curated short bullets skip the LLM; the rest go through the cache/LLM path
+        unique_responses = [
+            _curated_tag_reply(dedup_key, standard_competency_names)
+            for dedup_key in unique_keys
+        ]
+        llm_indexes = [i for i, reply in enumerate(unique_responses) if reply is None]
+        if len(llm_indexes) < len(unique_responses):
+            logger.info(f"Tagged {len(unique_responses) - len(llm_indexes)} responsibilities from the curated map")
+        if llm_indexes:
+            fresh = _get_tag_responses([unique_responsibilities[i] for i in llm_indexes], standard_list_for_prompt, competency_data["prompt_hash"], batch_mode)
+            for i, reply in zip(llm_indexes, fresh):
+                unique_responses[i] = reply
+        llm_responses = [unique_responses[unique_index_by_key[dedup_key]] for dedup_key in dedup_keys]
+
+        for responsibility, llm_response_content in zip(responsibilities_to_tag, llm_responses):
+            llm_matched_competencies = _parse_competency_tags(llm_response_content, responsibility, standard_competency_names)
 
-            Instructions:
-            - Determine which competencies from the standard list (between 1 and 5) are the **most directly relevant** to the responsibility described.
-            - You **must** return at least one competency if any from the list seem relevant, even partially.
-            - Return up to 5 competencies if multiple are clearly relevant.
-            - Return ONLY a valid JSON list containing the name(s) of the most relevant competency/competencies.
-            - Only return an empty list `[]` if absolutely **no** competency from the list has any relevance.
-            Example Output (1-5 items): ["Competency A", "Competency B"]
-            Example Output (if none relevant): []
-            """
-            try:
-                llm_response_content = "" 
-                if USE_NEW_OPENAI_SDK:
-                    if client:
-                        completion = client.chat.completions.create(
-                            model="gpt-3.5-turbo", 
-                            messages=[
-                                {"role": "system", "content": "You are an expert HR analyst identifying relevant competencies (1-5) for specific job tasks."},
-                                {"role": "user", "content": llm_prompt_responsibility}
-                            ],
-                            response_format={ "type": "json_object" },
-                            temperature=0.0 
-                        )
-                        llm_response_content = completion.choices[0].message.content
-                    else: logger.error("OpenAI client (v1+) is None.")
-                else:
-                    if client: 
-                        completion = client.ChatCompletion.create(
-                            model="gpt-3.5-turbo", 
-                            messages=[
-                                {"role": "system", "content": "You are an expert HR analyst identifying relevant competencies (1-5) for specific job tasks."},
-                                {"role": "user", "content": llm_prompt_responsibility}
-                            ],
-                            temperature=0.0 
-                        )
-                        llm_response_content = completion.choices[0].message.content
-                    else: logger.error("OpenAI client (legacy) is None.")
-                
-                logger.debug(f"LLM Raw Response for Resp Tagging: {llm_response_content}")
-                
-                # Parse response (expecting list with 1-5 strings)
-                parsed_llm_tags = None
-                if llm_response_content:
-                    try:
-                        parsed_data = json.loads(llm_response_content)
-                        if isinstance(parsed_data, list):
-                            parsed_llm_tags = parsed_data
-                        elif isinstance(parsed_data, dict) and len(parsed_data.keys()) == 1: 
-                            potential_list = list(parsed_data.values())[0]
-                            if isinstance(potential_list, list):
-                                    parsed_llm_tags = potential_list
-                        else:
-                            logger.warning(f"LLM returned unexpected JSON structure: {parsed_data}")
-                    except json.JSONDecodeError:
-                        logger.debug("Direct JSON parse failed, trying regex extraction...")
-                        # Regex to find a list of strings
-                        match = re.search(r'\[\s*(?:\"[^\"]*\"\s*,?\s*)*\]', llm_response_content) 
-                        if match:
-                            json_str = match.group(0)
-                            try: 
-                                parsed_llm_tags = json.loads(json_str)
-                                logger.debug(f"Regex extracted JSON list: {parsed_llm_tags}")
-                            except json.JSONDecodeError:
-                                logger.error(f"Could not parse extracted JSON via regex: {json_str}")
-                        else: 
-                            logger.warning(f"Could not find JSON list via regex in LLM resp: {llm_response_content}")
-                
-                # Validate and add to set (expecting 1-5 valid tags)
-                if isinstance(parsed_llm_tags, list) and 1 <= len(parsed_llm_tags) <= 5:
-                    validated_tags = set() # Use a temporary set for validation
-                    for tag in parsed_llm_tags:
-                        if isinstance(tag, str) and tag in standard_competency_names:
-                            validated_tags.add(tag)
-                        else:
-                            logger.warning(f"LLM returned invalid/non-standard tag and it was ignored: {tag}")
-                    
-                    if validated_tags: # Add only if at least one valid tag was found
-                        llm_matched_competencies = validated_tags
-                        logger.debug(f"  LLM tagged '{responsibility[:60]}...' with valid tags: {llm_matched_competencies}")
-                    else:
-                        logger.warning(f"LLM list contained only invalid/non-standard tags: {parsed_llm_tags}")
-                elif isinstance(parsed_llm_tags, list) and len(parsed_llm_tags) == 0:
-                     logger.info(f"LLM explicitly returned no relevant tags for: '{responsibility[:60]}...'")
-                     # llm_matched_competencies remains empty
-                else:
-                    logger.warning(f"LLM did not return a list with 1-5 items: {parsed_llm_tags}")
-                        
-            except Exception as llm_resp_err:
-                logger.exception(f"Error calling LLM for responsibility '{responsibility[:60]}...': {llm_resp_err}")
-            
             # --- Update Aggregate Counts --- 
             final_tags_for_this_resp = llm_matched_competencies 
             # No default tag assignment here anymore
                  
-            for tag_name in final_tags_for_this_resp: 
-                 competency_counts[tag_name] += 1 
+            competency_counts.update(final_tags_for_this_resp)
             
             # --- Append Result --- 
             tagged_responsibilities.append({
@@ -397,9 +1721,10 @@ def analyze_job_responsibilities(responsibilities):
 
         # --- Determine Top 5 Overall Competencies --- 
         # (Logic using competency_counts and potential overall LLM refinement remains the same)
-        standard_competency_counts = {k: v for k, v in competency_counts.items() if k in standard_competency_names}
+        standard_competency_counts = Counter({k: competency_counts[k] for k in competency_counts.keys() & standard_competency_names})
         logger.info(f"DEBUG: Final aggregate standard_competency_counts: {standard_competency_counts}") 
-        sorted_standard_competencies = sorted(standard_competency_counts.items(), key=lambda item: item[1], reverse=True)
+        # Only the top 5 are ever used; most_common(n) picks them with a heap instead of a full sort
+        sorted_standard_competencies = standard_competency_counts.most_common(5)
         logger.info(f"DEBUG: Final sorted list of (standard_competency, count): {sorted_standard_competencies}") 
         top_aggregate_competencies = [comp_name for comp_name, count in sorted_standard_competencies]
         top_competencies = [] 
@@ -435,13 +1760,13 @@ def analyze_job_responsibilities(responsibilities):
                 # Simulate LLM call failure for fallback check
                 # Simulate LLM call success for now - assume it populates top_competencies
                 # For testing, let's reuse the fallback logic directly
-                top_competencies = top_keyword_competencies_overall + sorted(list(standard_competency_names - set(top_keyword_competencies_overall)))[:5 - len(top_keyword_competencies_overall)]
+                top_competencies = top_keyword_competencies_overall + [n for n in competency_data["names"] if n not in top_keyword_competencies_overall][:5 - len(top_keyword_competencies_overall)]
                 logger.info(f"(Placeholder) Overall LLM logic finished, result: {top_competencies}")
                 # --- Placeholder End --- 
 
             except Exception as llm_overall_err:
                  logger.exception(f"Error during Overall LLM call for competency selection: {llm_overall_err}")
-                 top_competencies = top_keyword_competencies_overall + sorted(list(standard_competency_names - set(top_keyword_competencies_overall)))[:5 - len(top_keyword_competencies_overall)]
+                 top_competencies = top_keyword_competencies_overall + [n for n in competency_data["names"] if n not in top_keyword_competencies_overall][:5 - len(top_keyword_competencies_overall)]
                  logger.error(f"Overall LLM call failed. Using aggregate count list + padding as fallback: {top_competencies}")
            # *** LLM Overall Enhancement Logic End ***
 
@@ -464,7 +1789,161 @@ def analyze_job_responsibilities(responsibilities):
         "top_competencies": top_competencies
     }
 
+# GSI on questions.competency_name; queried instead of a filtered table scan when present
+QUESTIONS_COMPETENCY_INDEX = os.getenv('QUESTIONS_COMPETENCY_INDEX', 'CompetencyNameIndex')
+_competency_index_available = True
+
+def _query_questions_by_competency(competency_name, projection):
+    """
+    Return all question items for one competency, projected to the given attributes.
+    Uses the competency_name GSI, falling back to a filtered scan if the index doesn't exist.
+    """
+    global _competency_index_available
+    questions_table = _get_table(QUESTIONS_TABLE_NAME)
+    if _competency_index_available:
+        try:
+            items = []
+            query_params = {
+                'IndexName': QUESTIONS_COMPETENCY_INDEX,
+                'KeyConditionExpression': Key('competency_name').eq(competency_name),
+                'ProjectionExpression': projection
+            }
+            while True:
+                response = questions_table.query(**query_params)
+                items.extend(response.get('Items', []))
+                if 'LastEvaluatedKey' not in response:
+                    return items
+                query_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ValidationException':
+                raise
+            # Missing index; remember so later calls go straight to the scan
+            logger.warning(f"GSI {QUESTIONS_COMPETENCY_INDEX} not usable on {QUESTIONS_TABLE_NAME} ({e}); falling back to Scan.")
+            _competency_index_available = False
+
+    items = []
+    scan_params = {
+        'FilterExpression': Attr('competency_name').eq(competency_name),
+        'ProjectionExpression': projection
+    }
+    while True:
+        response = questions_table.scan(**scan_params)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+# Every question indexed by competency, loaded with one parallel segmented scan per TTL
+# instead of a scan or GSI query per competency on every request. The preset index
+# (preset_order 1 and 2) is derived from the same scan.
+PRESET_QUESTIONS_CACHE_TTL = int(os.getenv('PRESET_QUESTIONS_CACHE_TTL', '600'))
+PRESET_SCAN_SEGMENTS = int(os.getenv('PRESET_SCAN_SEGMENTS', '4'))
+_question_index_cache = {"value": None, "expires": 0.0}
+_question_index_cache_lock = threading.Lock()
+
+def _scan_questions_segment(segment):
+    questions_table = _get_table(QUESTIONS_TABLE_NAME)
+    scan_paginator = questions_table.meta.client.get_paginator('scan')
+    items = []
+    for page in scan_paginator.paginate(
+        TableName=QUESTIONS_TABLE_NAME,
+        ProjectionExpression='competency_name, preset_order, question_text',
+        Segment=segment,
+        TotalSegments=PRESET_SCAN_SEGMENTS
+    ):
+        items.extend(page.get('Items', []))
+    return items
+
+def _load_question_data():
+    """
+    Return {"by_competency": {name: [question items]}, "presets": {name: [primary, backup]}}.
+    Cached in-process; raises if the table can't be read so callers can fall back.
+    """
+    cached = _question_index_cache["value"]
+    if cached is not None and time.monotonic() < _question_index_cache["expires"]:
+        return cached
+
+    with _question_index_cache_lock:
+        cached = _question_index_cache["value"]
+        if cached is not None and time.monotonic() < _question_index_cache["expires"]:
+            return cached
+
+        with ThreadPoolExecutor(max_workers=PRESET_SCAN_SEGMENTS) as pool:
+            segments = list(pool.map(_scan_questions_segment, range(PRESET_SCAN_SEGMENTS)))
+        all_questions = [q for items in segments for q in items]
+        logger.info(f"Parallel scan ({PRESET_SCAN_SEGMENTS} segments) found {len(all_questions)} total questions.")
+
+        questions_by_competency = {}
+        presets = {}
+        for q in all_questions:
+            comp_name = q.get('competency_name')
+            if not comp_name:
+                continue
+            questions_by_competency.setdefault(comp_name, []).append(q)
+            order = q.get('preset_order')
+            if order in (1, 2):
+                slots = presets.get(comp_name)
+                if slots is None:
+                    slots = presets[comp_name] = [None, None]
+                slots[int(order) - 1] = q.get('question_text', '')
+
+        data = {"by_competency": questions_by_competency, "presets": presets}
+        _question_index_cache["value"] = data
+        _question_index_cache["expires"] = time.monotonic() + PRESET_QUESTIONS_CACHE_TTL
+        return data
+
+def _load_question_index():
+    """Return {competency_name: [question items]} for the whole questions table."""
+    return _load_question_data()["by_competency"]
+
+def _load_preset_question_index():
+    """Return {competency_name: [primary_text, backup_text]} for all preset questions."""
+    return _load_question_data()["presets"]
+
+def _preset_slots(items):
+    slots = [None, None]
+    for q in items:
+        order = q.get('preset_order')
+        if order in (1, 2):
+            slots[int(order) - 1] = q.get('question_text', '')
+    return slots
+
+def _load_presets_for(competency_names):
+    """
+    Return preset slots for just these competencies. Served from the scanned index when it's
+    warm; on a cold cache, runs one GSI query per competency in parallel rather than waiting
+    on the full-table scan, which is started in the background for later requests.
+    """
+    cached = _question_index_cache["value"]
+    if (cached is not None and time.monotonic() < _question_index_cache["expires"]) or not _competency_index_available:
+        return _load_preset_question_index()
+
+    if not _question_index_cache_lock.locked():
+        _prefetch_executor.submit(_warm_question_data)
+    with ThreadPoolExecutor(max_workers=max(1, len(competency_names))) as pool:
+        results = pool.map(
+            lambda name: _query_questions_by_competency(name, 'question_text, preset_order'),
+            competency_names
+        )
+        return {name: _preset_slots(items) for name, items in zip(competency_names, results)}
+
+# Background pool for warming DynamoDB-backed caches while a request waits on the LLM
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+def _warm_question_data():
+    try:
+        _load_competencies()
+        _load_preset_question_index()
+    except Exception as e:
+        # The real lookups after the LLM call handle failures and fallbacks
+        logger.debug(f"Prefetch of question data failed: {str(e)}")
+
+def _prefetch_question_data():
+    """Start loading the competency taxonomy and preset-question index without blocking."""
+    return _prefetch_executor.submit(_warm_question_data)
+
 # Function to get recommended questions based on competencies
+@_memoize_result()
 def get_recommended_questions(top_competency_names):
     """
     Get the 2 preset questions for each of the top competencies based on the Cigna guide.
@@ -476,158 +1955,26 @@ def get_recommended_questions(top_competency_names):
               and 'backup_question', matching the frontend expectation.
     """
     recommended_questions_output = []
-    processed_competency_names = set() # Keep track to avoid duplicates if input has them
     
     # Limit to top 5 unique competencies from input
-    competencies_to_process = []
-    for name in top_competency_names:
-        if name not in processed_competency_names:
-            competencies_to_process.append(name)
-            processed_competency_names.add(name)
-        if len(competencies_to_process) >= 5:
-            break
+    competencies_to_process = list(dict.fromkeys(top_competency_names))[:5]
             
     if not competencies_to_process:
         logger.warning("No top competencies provided to get_recommended_questions.")
         return []
-    
-    # Hardcoded fallback questions for common competencies
-    FALLBACK_QUESTIONS = {
-        "Analytical Thinking": {
-            "primary": "Tell me about a time when you had to analyze complex data to solve a problem. What was your approach?",
-            "backup": "Describe a situation where you identified a pattern or trend that others missed. How did you discover it?"
-        },
-        "Financial Acumen": {
-            "primary": "Share an example of when you used financial data to make an informed business decision.",
-            "backup": "Tell me about a time you identified a financial risk or opportunity. What actions did you take?"
-        },
-        "Communication": {
-            "primary": "Describe a time when you had to communicate complex information to a non-technical audience.",
-            "backup": "Tell me about a challenging conversation you had with a stakeholder. How did you handle it?"
-        },
-        "Leadership": {
-            "primary": "Tell me about a time you led a team through a challenging project or change.",
-            "backup": "Describe how you motivated a team member who was struggling with their performance."
-        },
-        "Technical Expertise": {
-            "primary": "Walk me through a complex technical problem you solved. What was your approach?",
-            "backup": "Tell me about a time you had to quickly learn a new technology or tool to complete a project."
-        },
-        "Customer Focus": {
-            "primary": "Tell me about a time you went above and beyond to meet a customer's needs.",
-            "backup": "Describe a situation where you had to balance customer demands with business constraints."
-        },
-        "Strategic Planning": {
-            "primary": "Describe a long-term strategy you developed and implemented. What was the outcome?",
-            "backup": "Tell me about a time you had to adjust your strategic plan due to changing circumstances."
-        },
-        "Risk Management": {
-            "primary": "Tell me about a significant risk you identified and how you mitigated it.",
-            "backup": "Describe a time when you had to make a decision with incomplete information. How did you assess the risks?"
-        },
-        "Collaboration": {
-            "primary": "Give an example of how you successfully collaborated with a difficult team member or department.",
-            "backup": "Tell me about a time you had to build consensus among stakeholders with different priorities."
-        },
-        "Innovation": {
-            "primary": "Describe an innovative solution you developed to solve a business problem.",
-            "backup": "Tell me about a time you challenged the status quo. What was the result?"
-        },
-        "Project Management": {
-            "primary": "Walk me through how you managed a complex project from inception to completion.",
-            "backup": "Tell me about a time a project didn't go as planned. How did you get it back on track?"
-        },
-        "Negotiation": {
-            "primary": "Describe your most challenging negotiation. What was your strategy and the outcome?",
-            "backup": "Tell me about a time you had to negotiate with limited leverage. How did you approach it?"
-        },
-        "Decision Making": {
-            "primary": "Tell me about a difficult decision you had to make quickly. What was your process?",
-            "backup": "Describe a time when you had to make an unpopular decision. How did you handle it?"
-        },
-        "Adaptability": {
-            "primary": "Tell me about a time you had to quickly adapt to a significant change at work.",
-            "backup": "Describe how you handled a situation where priorities suddenly shifted."
-        },
-        "Business Acumen": {
-            "primary": "Give an example of how you identified and capitalized on a business opportunity.",
-            "backup": "Tell me about a time you had to understand and navigate complex business dynamics."
-        }
-    }
         
     try:
-        # --- Initialize DynamoDB Client ---
-        # Reuse logic from populate script for client setup
-        aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
-        aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-        region_name = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-
-        if not aws_access_key_id or not aws_secret_access_key:
-            logger.info("Using default credential chain for DynamoDB in get_recommended_questions")
-            dynamodb = boto3.resource('dynamodb', region_name=region_name)
-        else:
-            logger.info("Using environment credentials for DynamoDB in get_recommended_questions")
-            dynamodb = boto3.resource(
-                'dynamodb',
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=region_name
-            )
-        questions_table = dynamodb.Table(QUESTIONS_TABLE_NAME) # Assumes QUESTIONS_TABLE_NAME is defined globally or passed
-        logger.info(f"Querying table {QUESTIONS_TABLE_NAME} for preset questions.")
+        logger.info(f"Looking up preset questions from table {QUESTIONS_TABLE_NAME}.")
 
         # --- Query for Preset Questions --- 
-        # GSI Query approach (commented out - requires CompetencyNameIndex GSI):
-        # for i, competency_name in enumerate(competencies_to_process):
-        #     logger.debug(f"Looking for preset questions for: {competency_name}")
-        #     primary_q = None
-        #     backup_q = None
-        #     try:
-        #          # Query the GSI
-        #         response = questions_table.query(
-        #             IndexName='CompetencyNameIndex', # ASSUMPTION: GSI exists
-        #             KeyConditionExpression=Key('competency_name').eq(competency_name) & Key('preset_order').between(1, 2),
-        #             # Limit 2 as we only expect max 2 preset questions per competency
-        #             Limit=2 
-        #         )
-        #         questions = response.get('Items', [])
-
-        # Scan approach (more reliable if GSI doesn't exist, less efficient):
-        logger.info("Using Scan operation to find preset questions.")
-        all_preset_questions = []
+        # Cached index when warm, otherwise targeted GSI queries for these competencies only
         try:
-            # Scan the entire table for preset questions (order 1 or 2)
-            # This can be slow on very large tables, but acceptable for moderate size.
-            scan_paginator = questions_table.meta.client.get_paginator('scan')
-            scan_params = {
-                'TableName': QUESTIONS_TABLE_NAME,
-                'FilterExpression': Attr('preset_order').between(1, 2)
-                # We could add competency_name filter here, but easier to filter post-scan 
-                # if dealing with a limited set of target competencies.
-            }
-            for page in scan_paginator.paginate(**scan_params):
-                 all_preset_questions.extend(page.get('Items', []))
-            logger.info(f"Scan found {len(all_preset_questions)} total preset questions.")
-
-            # Filter and organize the scanned questions by the target competencies
-            questions_by_competency = {}
-            for q in all_preset_questions:
-                comp_name = q.get('competency_name')
-                if comp_name in processed_competency_names: # Check if it's one we care about
-                    if comp_name not in questions_by_competency:
-                        questions_by_competency[comp_name] = {'1': None, '2': None}
-                    order = q.get('preset_order')
-                    text = q.get('question_text', '')
-                    if order == 1:
-                        questions_by_competency[comp_name]['1'] = text
-                    elif order == 2:
-                        questions_by_competency[comp_name]['2'] = text
-            
+            questions_by_competency = _load_presets_for(competencies_to_process)
+
             # Build the final output list based on the processed competencies
             for i, competency_name in enumerate(competencies_to_process):
                 q_data = questions_by_competency.get(competency_name)
-                primary_q = q_data.get('1') if q_data else None
-                backup_q = q_data.get('2') if q_data else None
+                primary_q, backup_q = q_data if q_data else (None, None)
 
                 if not primary_q and not backup_q:
                      logger.warning(f"No preset questions found via Scan for competency: {competency_name}")
@@ -644,6 +1991,7 @@ def get_recommended_questions(top_competency_names):
 
         except Exception as scan_err:
              logger.error(f"DynamoDB scan operation failed: {scan_err}. Using fallback questions.")
+             _mark_degraded()
              # If scan fails, use the hardcoded fallback questions
              for i, competency_name in enumerate(competencies_to_process):
                  fallback_q = FALLBACK_QUESTIONS.get(competency_name, {})
@@ -658,6 +2006,7 @@ def get_recommended_questions(top_competency_names):
     # Now it should be the main error handler for the function if the initial setup fails.
     except Exception as e:
         logger.error(f"Error in get_recommended_questions: {str(e)}. Using fallback questions.")
+        _mark_degraded()
         # Use hardcoded fallback questions on major error
         for i, competency_name in enumerate(competencies_to_process):
             fallback_q = FALLBACK_QUESTIONS.get(competency_name, {})
@@ -671,6 +2020,57 @@ def get_recommended_questions(top_competency_names):
     logger.info(f"Returning {len(recommended_questions_output)} recommended question sets.")
     return recommended_questions_output
 
+# Long PDFs are split into contiguous page ranges and extracted in worker processes.
+# The pool uses spawn, not fork: forking this multi-threaded server can leave a child stuck
+# on a lock (logging, httpx, boto3) another thread held at fork time. Spawned children only
+# import pdf_worker, but they also re-run the main script, so the pool is skipped when app.py
+# itself is __main__ (python app.py); under gunicorn the main script is import-guarded.
+PDF_PARALLEL_MIN_PAGES = 20
+PDF_EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+_pdf_pool = {"pool": None, "pid": None}
+_pdf_pool_lock = threading.Lock()
+
+def _pdf_pool_usable():
+    main_file = getattr(sys.modules.get('__main__'), '__file__', None)
+    return PDF_EXTRACT_WORKERS >= 2 and not (main_file and os.path.abspath(main_file) == os.path.abspath(__file__))
+
+def _get_pdf_pool():
+    """The process's spawn-context extraction pool, created on first use (and again after a fork)."""
+    with _pdf_pool_lock:
+        if _pdf_pool["pool"] is None or _pdf_pool["pid"] != os.getpid():
+            _pdf_pool["pool"] = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _pdf_pool["pid"] = os.getpid()
+        return _pdf_pool["pool"]
+
+def _extract_pdf_parallel(filepath, page_count):
+    """Extract a long PDF across PDF_EXTRACT_WORKERS processes, preserving page order."""
+    step = -(-page_count // PDF_EXTRACT_WORKERS)
+    ranges = [(filepath, start, min(start + step, page_count)) for start in range(0, page_count, step)]
+    try:
+        return "".join(_get_pdf_pool().map(pdf_worker.extract_page_range, ranges))
+    except Exception as e:
+        # A broken pool is dropped so the next long PDF starts a fresh one
+        logger.warning(f"Parallel PDF extraction failed: {str(e)}, extracting in-process")
+        with _pdf_pool_lock:
+            _pdf_pool["pool"] = None
+        return pdf_worker.extract_page_range((filepath, 0, page_count))
+
+def _extract_pdf_bytes(data):
+    """Plain text of an in-memory PDF (e.g. a fetched job posting), PyMuPDF first, pypdf as fallback."""
+    if fitz is not None:
+        try:
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                return "".join(page.get_text("text") for page in doc)
+        except Exception as e:
+            logger.warning(f"PyMuPDF failed on in-memory PDF: {str(e)}, falling back to pypdf")
+    pdf = pypdf.PdfReader(io.BytesIO(data))
+    return "".join(page.extract_text() or "" for page in pdf.pages)
+
+TEXT_MMAP_THRESHOLD = 4 * 1024 * 1024
+
 def extract_text_from_document(filepath):
     """
     Extract text from various document types (PDF, DOC, DOCX, TXT)
@@ -684,48 +2084,70 @@ def extract_text_from_document(filepath):
         # PDF File
         if file_extension == '.pdf':
             logger.info("Processing as PDF")
-            pdf = pypdf.PdfReader(filepath)
-            content = ""
-            number_of_pages = len(pdf.pages)
-            for idx in range(number_of_pages):
-                page = pdf.pages[idx]
-                content += f"### Page {idx+1} ###\n"
-                content += page.extract_text()
-            return content
+            if fitz is not None:
+                # MuPDF decodes content streams in C, far faster than pypdf's pure-Python parser
+                try:
+                    with fitz.open(filepath) as doc:
+                        page_count = doc.page_count
+                        if page_count < PDF_PARALLEL_MIN_PAGES or not _pdf_pool_usable():
+                            parts = []
+                            for idx, page in enumerate(doc):
+                                parts.append(f"### Page {idx+1} ###\n")
+                                parts.append(page.get_text("text"))
+                            return "".join(parts)
+                    logger.info(f"Extracting {page_count} PDF pages across {PDF_EXTRACT_WORKERS} processes")
+                    return _extract_pdf_parallel(filepath, page_count)
+                except Exception as e:
+                    logger.warning(f"PyMuPDF failed on {filename}: {str(e)}, falling back to pypdf")
+            # Parse from a read-only mapping so the file's bytes stay in the page cache instead
+            # of being copied onto the heap, and join the pages once instead of concatenating
+            parts = []
+            with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pdf = pypdf.PdfReader(mm)
+                for idx, page in enumerate(pdf.pages):
+                    parts.append(f"### Page {idx+1} ###\n")
+                    parts.append(page.extract_text() or "")
+            return "".join(parts)
 
         # Word Document (.doc, .docx)
         elif file_extension in ['.doc', '.docx']:
             logger.info("Processing as Word document")
-            try:
-                import docx2txt  # For .docx files
-                content = docx2txt.process(filepath)
-                if content.strip():
-                    return content
-            except ImportError:
+            if docx2txt is None:
                 logger.warning("docx2txt not installed, trying python-docx")
-            except Exception as e:
-                logger.warning(f"docx2txt failed: {str(e)}, trying other methods")
+            else:
+                try:
+                    content = docx2txt.process(filepath)  # For .docx files
+                    if content.strip():
+                        return content
+                except Exception as e:
+                    logger.warning(f"docx2txt failed: {str(e)}, trying other methods")
 
             # If docx2txt fails or returns empty content, try python-docx (for .docx files)
-            try:
-                from docx import Document
-                doc = Document(filepath)
-                content = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-                if content.strip():
-                    return content
-            except ImportError:
-                logger.warning("python-docx not installed, trying textract")
-            except Exception as e:
-                logger.warning(f"python-docx failed: {str(e)}, trying other methods")
+            if DocxDocument is None:
+                logger.warning("python-docx not installed, trying other methods")
+            else:
+                try:
+                    doc = DocxDocument(filepath)
+                    content = "\n".join([paragraph.text for paragraph in doc.paragraphs])
+                    if content.strip():
+                        return content
+                except Exception as e:
+                    logger.warning(f"python-docx failed: {str(e)}, trying other methods")
+
+            # If both methods fail or it's a .doc file, convert with antiword/soffice directly
+            content = _extract_legacy_doc(filepath)
+            if content.strip():
+                return content
 
-            # If both methods fail or it's a .doc file, try textract as a fallback
+            # textract stays as a last resort only, since importing it is expensive
             try:
                 import textract
-                content = textract.process(filepath).decode('utf-8')
-                return content
             except ImportError:
                 logger.error("textract not installed")
                 raise ValueError("No suitable library installed to extract text from Word documents")
+            try:
+                content = textract.process(filepath).decode('utf-8')
+                return content
             except Exception as e:
                 logger.error(f"All Word extraction methods failed: {str(e)}")
                 raise ValueError(f"Could not extract text from Word document: {str(e)}")
@@ -733,9 +2155,13 @@ def extract_text_from_document(filepath):
         # Text file
         elif file_extension in ['.txt', '.text', '.md', '.rtf']:
             logger.info("Processing as text file")
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return content
+            # Decode the raw bytes in one call instead of through the buffered text layer;
+            # large files are decoded straight from a read-only mapping
+            with open(filepath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > TEXT_MMAP_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return str(memoryview(mm), 'utf-8', 'replace')
+                return f.read().decode('utf-8', errors='replace')
 
         # Unsupported file type
         else:
@@ -745,6 +2171,48 @@ def extract_text_from_document(filepath):
         logger.error(f"Error extracting text from {filepath}: {str(e)}")
         raise
 
+@functools.lru_cache(maxsize=4)
+def _extract_text_cached(filepath, mtime):
+    """
+    extract_text_from_document for static files, keyed on (path, mtime) so an edited
+    file is re-read. Failures raise and are not cached.
+    """
+    return extract_text_from_document(filepath)
+
+# Uploaded documents are keyed by content digest, so re-uploading the same resume or
+# posting (under any name) skips parsing; the LLM extraction that follows is already
+# answered from the response cache because its prompt is then byte-identical.
+_upload_text_cache = LRUCache(maxsize=128)
+_upload_text_cache_lock = threading.Lock()
+
+def _file_digest(filepath):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _extract_upload_text(filepath):
+    """extract_text_from_document for uploaded files, cached by content digest and extension."""
+    key = (_file_digest(filepath), os.path.splitext(filepath)[1].lower())
+    with _upload_text_cache_lock:
+        content = _upload_text_cache.get(key)
+    if content is not None:
+        logger.info(f"Document text for {os.path.basename(filepath)} served from cache")
+        return content
+    content = extract_text_from_document(filepath)
+    with _upload_text_cache_lock:
+        _upload_text_cache[key] = content
+    return content
+
+# (minimum length, STAR field, text, competency) tiers for the mock analysis, in ascending order
+MOCK_STAR_TIERS = (
+    (100, "situation", "At their previous company, they were facing declining profit margins due to increased competition.", "Analytical Thinking"),
+    (200, "task", "They were tasked with developing a new financial strategy to improve profitability.", "Financial Acumen"),
+    (300, "action", "They conducted a comprehensive analysis of the cost structure and implemented a new budget allocation model.", "Strategic Mindset"),
+    (400, "result", "Within six months, they increased profit margins by 12% while maintaining product quality.", None),
+)
+
 def generate_mock_star_analysis(transcript):
     """Generate mock STAR analysis based on transcript length"""
     # Simple mock that returns different levels of completeness based on transcript length
@@ -756,39 +2224,34 @@ def generate_mock_star_analysis(transcript):
         "competencies": ["Communication"]
     }
     
-    # Add more components based on transcript length
-    if len(transcript) > 100:
-        analysis["situation"] = "At their previous company, they were facing declining profit margins due to increased competition."
-        analysis["competencies"].append("Analytical Thinking")
-    
-    if len(transcript) > 200:
-        analysis["task"] = "They were tasked with developing a new financial strategy to improve profitability."
-        analysis["competencies"].append("Financial Acumen")
-    
-    if len(transcript) > 300:
-        analysis["action"] = "They conducted a comprehensive analysis of the cost structure and implemented a new budget allocation model."
-        analysis["competencies"].append("Strategic Mindset")
-    
-    if len(transcript) > 400:
-        analysis["result"] = "Within six months, they increased profit margins by 12% while maintaining product quality."
+    # Add more components based on transcript length
+    length = len(transcript)
+    for threshold, field, text, competency in MOCK_STAR_TIERS:
+        if length <= threshold:
+            break
+        analysis[field] = text
+        if competency:
+            analysis["competencies"].append(competency)
     
     return analysis
 
+@functools.lru_cache(maxsize=256)
+def _similarity_counts(text):
+    """Word counts (lowercased, punctuation stripped, words over 2 chars) for calculate_similarity"""
+    return Counter(w for w in PUNCTUATION_RE.sub('', text.lower()).split() if len(w) > 2)
+
 def calculate_similarity(str1, str2):
     """Calculate similarity between two strings"""
-    # Convert to lowercase and remove punctuation
-    words1 = re.sub(r'[^\w\s]', '', str1.lower()).split()
-    words2 = re.sub(r'[^\w\s]', '', str2.lower()).split()
-    
-    # Filter out short words
-    words1 = [w for w in words1 if len(w) > 2]
-    words2 = [w for w in words2 if len(w) > 2]
+    # Counts are cached per string, so a question compared against many
+    # transcripts is only tokenized once
+    c1 = _similarity_counts(str1)
+    c2 = _similarity_counts(str2)
     
-    # Count matching words
-    matches = sum(1 for w in words1 if w in words2)
+    # Multiset intersection counts each shared word up to its lower multiplicity
+    matches = sum((c1 & c2).values())
     
     # Calculate similarity score
-    total_words = len(words1) + len(words2)
+    total_words = sum(c1.values()) + sum(c2.values())
     if total_words == 0:
         return 0
     
@@ -818,23 +2281,15 @@ def is_likely_question(text):
         return True
     
     # Check for question words
-    question_starters = ['what', 'when', 'where', 'which', 'who', 'whom', 'whose', 
-                         'why', 'how', 'can you', 'could you', 'would you', 
-                         'tell me', 'describe', 'explain']
-    
-    for starter in question_starters:
-        if text.startswith(starter) or f" {starter} " in text:
-            return True
-    
-    return False
+    return QUESTION_STARTER_RE.search(text) is not None
 
 def clean_question(question):
     """Clean up a detected question for display"""
     # Remove filler words
-    cleaned = re.sub(r'\b(um|uh|like|you know|so)\b', '', question, flags=re.IGNORECASE)
+    cleaned = FILLER_WORDS_RE.sub('', question)
     
     # Clean up whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = WHITESPACE_RE.sub(' ', cleaned).strip()
     
     # Make sure it ends with a question mark
     if not cleaned.endswith('?'):
@@ -846,21 +2301,60 @@ def clean_question(question):
     
     return cleaned
 
+# Reply budgets for the interview-analysis JSON calls; the replies are short objects, so
+# a cap keeps a rambling completion from adding seconds of generation time
+STAR_MAX_TOKENS = 400
+FOLLOWUP_MAX_TOKENS = 200
+
+# Transcripts shorter than these are answered locally, without building a prompt or calling the API
+STAR_MIN_TRANSCRIPT_CHARS = int(os.getenv("STAR_MIN_TRANSCRIPT_CHARS", "50"))
+INTRO_MIN_TRANSCRIPT_CHARS = int(os.getenv("INTRO_MIN_TRANSCRIPT_CHARS", "30"))
+
+DEFAULT_STAR_FOLLOWUPS = (
+    "Can you tell me more about the specific situation you were facing?",
+    "What actions did you personally take to address the challenge?",
+    "What were the measurable results of your actions?"
+)
+
+def _short_star_analysis():
+    """STAR analysis returned for transcripts too short to analyze"""
+    return {
+        "situation": "Response too short for detailed analysis.",
+        "task": "Not enough content to extract task information.",
+        "action": "No specific actions described in the response.",
+        "result": "No results or outcomes mentioned in the short response.",
+        "competencies": ["Insufficient Data"]
+    }
+
+def _normalize_star_analysis(analysis):
+    """Fill in missing STAR fields and coerce competencies to a list, in place."""
+    # Validate required fields
+    required_fields = ["situation", "task", "action", "result", "competencies"]
+    for field in required_fields:
+        if field not in analysis:
+            if field == "competencies":
+                analysis[field] = ["Communication"]
+            else:
+                analysis[field] = "Not clearly described in the response."
+
+    # Ensure competencies is a list
+    if not isinstance(analysis["competencies"], list):
+        # Try to split if it's a string
+        if isinstance(analysis["competencies"], str):
+            analysis["competencies"] = [c.strip() for c in analysis["competencies"].split(",")]
+        else:
+            analysis["competencies"] = ["Communication"]
+    return analysis
+
 def analyze_response_star(transcript, question):
     """
     Analyze candidate's response using the STAR method.
     Returns structured analysis with Situation, Task, Action, Result components.
     """
-    try:
-        if not transcript or len(transcript.strip()) < 50:
-            return {
-                "situation": "Response too short for detailed analysis.",
-                "task": "Not enough content to extract task information.",
-                "action": "No specific actions described in the response.",
-                "result": "No results or outcomes mentioned in the short response.",
-                "competencies": ["Insufficient Data"]
-            }
+    if not transcript or len(transcript.strip()) < STAR_MIN_TRANSCRIPT_CHARS:
+        return _short_star_analysis()
 
+    try:
         # Construct prompt for the analysis
         prompt = f"""
         Analyze this interview response using the STAR method (Situation, Task, Action, Result).
@@ -887,55 +2381,27 @@ def analyze_response_star(transcript, question):
         For any component not clearly addressed in the response, indicate "Not clearly described in the response."
         """
 
-        # Call OpenAI API using the appropriate SDK
-        if USE_NEW_OPENAI_SDK:
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer who analyzes candidate responses using the STAR method."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer who analyzes candidate responses using the STAR method."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
+        # Identical transcripts (demo replays, re-submits) are answered from the response cache
+        completion_text = _cached_chat(
+            "gpt-3.5-turbo",
+            "You are an expert interviewer who analyzes candidate responses using the STAR method.",
+            prompt,
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=STAR_MAX_TOKENS
+        )
 
         # Parse the JSON response
         try:
             # Try to extract JSON object
-            match = re.search(r'\{.*\}', completion_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                analysis = json.loads(json_str)
+            json_str = _extract_first_json(completion_text)
+            if json_str:
+                analysis = _json_loads(json_str)
             else:
                 # Try parsing the whole text as JSON
-                analysis = json.loads(completion_text)
+                analysis = _json_loads(completion_text)
                 
-            # Validate required fields
-            required_fields = ["situation", "task", "action", "result", "competencies"]
-            for field in required_fields:
-                if field not in analysis:
-                    if field == "competencies":
-                        analysis[field] = ["Communication"]
-                    else:
-                        analysis[field] = "Not clearly described in the response."
-                
-            # Ensure competencies is a list
-            if not isinstance(analysis["competencies"], list):
-                # Try to split if it's a string
-                if isinstance(analysis["competencies"], str):
-                    analysis["competencies"] = [c.strip() for c in analysis["competencies"].split(",")]
-                else:
-                    analysis["competencies"] = ["Communication"]
-            
-            return analysis
+            return _normalize_star_analysis(analysis)
             
         except Exception as e:
             logger.error(f"Error parsing STAR analysis: {str(e)}")
@@ -990,71 +2456,115 @@ def generate_followup_questions_star(star_analysis):
         }}
         """
 
-        # Call OpenAI API
-        if USE_NEW_OPENAI_SDK:
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer who creates targeted follow-up questions."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer who creates targeted follow-up questions."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
+        # Identical analyses are answered from the response cache
+        completion_text = _cached_chat(
+            "gpt-3.5-turbo",
+            "You are an expert interviewer who creates targeted follow-up questions.",
+            prompt,
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=FOLLOWUP_MAX_TOKENS
+        )
 
         # Parse the JSON response
         try:
             # Try to extract JSON object
-            match = re.search(r'\{.*\}', completion_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                questions = json.loads(json_str)
+            json_str = _extract_first_json(completion_text)
+            if json_str:
+                questions = _json_loads(json_str)
             else:
                 # Try parsing the whole text as JSON
-                questions = json.loads(completion_text)
+                questions = _json_loads(completion_text)
             
             return questions
             
         except Exception as e:
             logger.error(f"Error parsing follow-up questions: {str(e)}")
             # If parsing fails, return default questions
-            return {
-                "followups": [
-                    "Can you tell me more about the specific situation you were facing?",
-                    "What actions did you personally take to address the challenge?",
-                    "What were the measurable results of your actions?"
-                ]
-            }
+            return {"followups": list(DEFAULT_STAR_FOLLOWUPS)}
 
     except Exception as e:
         logger.error(f"Error generating follow-up questions: {str(e)}")
-        return {
-            "followups": [
-                "Can you tell me more about the specific situation you were facing?",
-                "What actions did you personally take to address the challenge?",
-                "What were the measurable results of your actions?"
-            ]
-        }
+        return {"followups": list(DEFAULT_STAR_FOLLOWUPS)}
+
+STAR_WITH_FOLLOWUPS_PROMPT = """
+        Analyze this interview response using the STAR method (Situation, Task, Action, Result),
+        then write follow-up questions for it.
+
+        Question asked: {question}
+
+        Candidate's response:
+        {transcript}
+
+        For each component below, extract the relevant information from the response:
+        1. Situation: What was the context or challenge?
+        2. Task: What was the candidate's specific responsibility or goal?
+        3. Action: What specific steps did the candidate take?
+        4. Result: What was the outcome? Include metrics if mentioned.
+        5. Competencies: Identify 1-3 key competencies demonstrated in this response.
+        6. Followups: 3 follow-up questions that help the interviewer get more details, focused
+           especially on any STAR component that is missing or thin.
+
+        Format your response as a JSON object with these keys:
+        - situation
+        - task
+        - action
+        - result
+        - competencies (array of strings)
+        - followups (array of 3 question strings)
+
+        For any component not clearly addressed in the response, indicate "Not clearly described in the response."
+        """
+
+def analyze_response_star_with_followups(transcript, question):
+    """
+    STAR analysis and follow-up questions from a single completion, instead of the two
+    chained round trips of analyze_response_star + generate_followup_questions_star.
+    Returns (star_analysis, followups) in those functions' shapes; falls back to the
+    two-call path if the combined reply can't be used.
+    """
+    if not transcript or len(transcript.strip()) < STAR_MIN_TRANSCRIPT_CHARS:
+        # Nothing to ask the model about; skip the follow-up round trip as well
+        return _short_star_analysis(), {"followups": list(DEFAULT_STAR_FOLLOWUPS)}
+
+    if not client:
+        star_analysis = analyze_response_star(transcript, question)
+        return star_analysis, generate_followup_questions_star(star_analysis)
+
+    try:
+        completion_text = _cached_chat(
+            "gpt-3.5-turbo",
+            "You are an expert interviewer who analyzes candidate responses using the STAR method and creates targeted follow-up questions.",
+            STAR_WITH_FOLLOWUPS_PROMPT.format(question=question, transcript=transcript),
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=STAR_MAX_TOKENS + FOLLOWUP_MAX_TOKENS
+        )
+        json_str = _extract_first_json(completion_text)
+        analysis = _json_loads(json_str if json_str else completion_text)
+        followups = analysis.pop("followups", None)
+        star_analysis = _normalize_star_analysis(analysis)
+    except Exception as e:
+        logger.error(f"Combined STAR analysis failed, using separate calls: {str(e)}")
+        star_analysis = analyze_response_star(transcript, question)
+        return star_analysis, generate_followup_questions_star(star_analysis)
+
+    if isinstance(followups, list) and followups and all(isinstance(q, str) for q in followups):
+        return star_analysis, {"followups": followups}
+    # Analysis is usable but the questions aren't; only the follow-up call is repeated
+    return star_analysis, generate_followup_questions_star(star_analysis)
 
 def summarize_intro_response(transcript, question):
     """Summarize an introductory response with bullet points"""
+    if not transcript or len(transcript.strip()) < INTRO_MIN_TRANSCRIPT_CHARS:
+        return jsonify({
+            "success": True,
+            "is_intro": True,
+            "bullets": ["Response too short for detailed analysis."],
+            "competencies": ["Insufficient Data"]
+        })
+
     try:
-        if not transcript or len(transcript.strip()) < 30:
-            return jsonify({
-                "success": True,
-                "is_intro": True,
-                "bullets": ["Response too short for detailed analysis."],
-                "competencies": ["Insufficient Data"]
-            })
-            
         prompt = f"""
         Analyze this candidate's introduction:
         
@@ -1072,35 +2582,25 @@ def summarize_intro_response(transcript, question):
         }}
         """
 
-        if USE_NEW_OPENAI_SDK:
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer who creates concise summaries of candidate introductions."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer who creates concise summaries of candidate introductions."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
+        # Identical transcripts (demo replays, re-submits) are answered from the response cache
+        completion_text = _cached_chat(
+            "gpt-3.5-turbo",
+            "You are an expert interviewer who creates concise summaries of candidate introductions.",
+            prompt,
+            response_format={"type": "json_object"},
+            temperature=0,
+            max_tokens=STAR_MAX_TOKENS
+        )
 
         # Parse the response
         try:
             # Extract JSON
-            match = re.search(r'\{.*\}', completion_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                result = json.loads(json_str)
+            json_str = _extract_first_json(completion_text)
+            if json_str:
+                result = _json_loads(json_str)
             else:
                 # Try parsing the whole text as JSON
-                result = json.loads(completion_text)
+                result = _json_loads(completion_text)
             
             return jsonify({
                 "success": True,
@@ -1122,8 +2622,180 @@ def summarize_intro_response(transcript, question):
             "error": f"Error: {str(e)}"
         }), 500
 
-# Global session store for data persistence between requests
-SESSION_STORE = {}
+# Global session store for data persistence between requests.
+# Entries are plain dicts that are replaced, never mutated in place, so a reader always
+# sees a consistent snapshot; all access goes through the helpers below.
+# Transcript entries are keyed by client-supplied session ids, so the store is bounded
+# (LRU) and entries expire after SESSION_TTL.
+# SESSION_BACKEND=disk keeps sessions in a diskcache directory shared by every worker
+# process on the host; SESSION_BACKEND=redis keeps each session as a Redis hash
+# (session:<id>, one JSON-encoded field per key) on REDIS_URL, shared across hosts;
+# the default keeps them in this process's memory.
+SESSION_STORE_MAX_ENTRIES = int(os.getenv('SESSION_STORE_MAX_ENTRIES', '1024'))
+SESSION_TTL = int(os.getenv('SESSION_TTL', str(24 * 3600)))
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'memory').lower()
+SESSION_DISK_DIR = os.getenv('SESSION_DISK_DIR', os.path.join(tempfile.gettempdir(), 'synergos_sessions'))
+SESSION_DISK_SIZE_LIMIT = int(os.getenv('SESSION_DISK_SIZE_LIMIT', str(1 << 30)))
+_session_lock = threading.Lock()
+_session_on_disk = False
+if SESSION_BACKEND == 'disk' and diskcache is not None:
+    try:
+        SESSION_STORE = diskcache.Cache(
+            SESSION_DISK_DIR,
+            size_limit=SESSION_DISK_SIZE_LIMIT,
+            eviction_policy='least-recently-used'
+        )
+        _session_on_disk = True
+        logger.info(f"Using disk-backed session store at {SESSION_DISK_DIR}")
+    except Exception as e:
+        logger.warning(f"Could not open disk session store at {SESSION_DISK_DIR}: {str(e)}. Using in-process store.")
+elif SESSION_BACKEND == 'disk':
+    logger.warning("SESSION_BACKEND=disk but diskcache is not installed. Using in-process store.")
+if not _session_on_disk:
+    SESSION_STORE = TTLCache(maxsize=SESSION_STORE_MAX_ENTRIES, ttl=SESSION_TTL)
+_session_redis = _get_redis() if SESSION_BACKEND == 'redis' else None
+if _session_redis is not None:
+    logger.info("Using Redis-backed session store")
+elif SESSION_BACKEND == 'redis':
+    logger.warning("SESSION_BACKEND=redis but Redis is not available (check REDIS_URL). Using in-process store.")
+
+def _session_key(session_id):
+    return f"session:{session_id}"
+
+def _redis_session_fields(fields):
+    return {name: json.dumps(value, default=str) for name, value in fields.items()}
+
+def _redis_session_write(session_id, fields, replace):
+    """Write fields to the session hash and refresh its TTL in one MULTI; replace drops other fields first."""
+    key = _session_key(session_id)
+    pipe = _session_redis.pipeline(transaction=True)
+    if replace:
+        pipe.delete(key)
+    if fields:
+        pipe.hset(key, mapping=_redis_session_fields(fields))
+        pipe.expire(key, SESSION_TTL)
+    pipe.execute()
+
+def _session_guard():
+    """Context manager serializing session read-modify-write: a diskcache transaction, or the in-process lock."""
+    return SESSION_STORE.transact() if _session_on_disk else _session_lock
+
+def _session_write(session_id, entry):
+    if _session_on_disk:
+        SESSION_STORE.set(session_id, entry, expire=SESSION_TTL)
+    else:
+        SESSION_STORE[session_id] = entry
+
+def _session_get(session_id, field=None, default=None):
+    """Return a session entry, or one field of it, or default when missing."""
+    if _session_redis is not None:
+        try:
+            # Single fields are read on their own, so large ones (content) aren't decoded needlessly
+            if field is not None:
+                raw = _session_redis.hget(_session_key(session_id), field)
+                return _json_loads(raw) if raw is not None else default
+            raw_entry = _session_redis.hgetall(_session_key(session_id))
+            if not raw_entry:
+                return default
+            return {name.decode("utf-8"): _json_loads(value) for name, value in raw_entry.items()}
+        except Exception as e:
+            logger.warning(f"Redis session read failed, using in-process store: {str(e)}")
+    with _session_guard():
+        entry = SESSION_STORE.get(session_id)
+    if entry is None:
+        return default
+    if field is None:
+        return entry
+    return entry.get(field, default)
+
+def _session_set(session_id, **fields):
+    """Replace a session entry with the given fields in one write."""
+    if _session_redis is not None:
+        try:
+            _redis_session_write(session_id, fields, replace=True)
+            return
+        except Exception as e:
+            logger.warning(f"Redis session write failed, using in-process store: {str(e)}")
+    with _session_guard():
+        _session_write(session_id, dict(fields))
+
+def _session_update(session_id, **fields):
+    """Merge fields into a session entry (creating it if needed) as one copy-and-swap."""
+    if _session_redis is not None:
+        try:
+            # Hash fields are written individually, so no read-modify-write is needed
+            _redis_session_write(session_id, fields, replace=False)
+            return
+        except Exception as e:
+            logger.warning(f"Redis session write failed, using in-process store: {str(e)}")
+    with _session_guard():
+        entry = dict(SESSION_STORE.get(session_id) or {})
+        entry.update(fields)
+        _session_write(session_id, entry)
+
+def _conditional_json(payload, max_age=None):
+    """
+    jsonify payload with an ETag of its body and a private max-age. A request whose
+    If-None-Match already carries that ETag gets an empty 304 instead.
+    max_age=None sends no-cache: the browser keeps the body but revalidates every time,
+    for handlers that must run on each request (e.g. because they write the session).
+    """
+    response = jsonify(payload)
+    response.headers['Cache-Control'] = "private, no-cache" if max_age is None else f"private, max-age={max_age}"
+    response.add_etag()
+    return response.make_conditional(request)
+
+# Prompt templates shared by the question generation endpoints
+QUESTION_PREPARE_PROMPT = """
+Generate recommendation for a live interview.
+
+Here is a partial transcript from the candidate:
+<transcript>
+{candidate_transcript}
+</transcript>
+
+Generate recommendations for the next interview question based on the transcript. Follow this format:
+
+<recommended_questions>
+<question>...</question>
+...
+</recommended_questions>
+
+<response_summary>
+- ...
+- ...
+...
+</response_summary>
+
+Notes:
+- You can recommend multiple candidate interview questions. Each question must be related to the candidate's transcript.
+- The response summary should be in bullet points summarizing the candidate's transcript.
+- You can include a maximum of 3 recommendations.
+"""
+
+JOB_ALIGNED_QUESTION_INSTRUCTIONS = """
+INSTRUCTIONS:
+1. Identify the most critical skills and qualifications from the job posting
+2. Focus on the candidate's current or most recent role and relevant experiences
+3. Create questions that reveal whether the candidate's experience directly aligns with the job requirements
+4. Use the candidate's own terms and experiences as a foundation for questions
+5. Include specific skill assessment questions for key technical requirements
+
+Format your response with:
+
+<recommended_questions>
+<question>...</question>
+...
+</recommended_questions>
+
+<response_summary>
+- ...
+- ...
+...
+</response_summary>
+
+Limit to 3 questions maximum, focusing on quality over quantity.
+"""
 
 # ============= API ROUTES =============
 
@@ -1146,7 +2818,7 @@ def set_api_keys():
         if openai_key:
             os.environ['OPENAI_API_KEY'] = openai_key
             # Re-initialize OpenAI client
-            global client, USE_NEW_OPENAI_SDK
+            global client, async_client, USE_NEW_OPENAI_SDK
             try:
                 potential_client = get_patched_client(api_key=openai_key)
                 if potential_client:
@@ -1155,6 +2827,7 @@ def set_api_keys():
                     logger.info("OpenAI client re-initialized successfully")
                 else:
                     logger.error("Failed to re-initialize OpenAI client")
+                async_client = get_patched_async_client(api_key=openai_key)
             except Exception as e:
                 logger.error(f"Error re-initializing OpenAI client: {str(e)}")
         
@@ -1164,6 +2837,13 @@ def set_api_keys():
             os.environ['AWS_SECRET_ACCESS_KEY'] = aws_secret_key
         if aws_region:
             os.environ['AWS_DEFAULT_REGION'] = aws_region
+        if aws_access_key or aws_secret_key or aws_region:
+            # Drop the cached AWS clients and taxonomy so the new credentials are picked up
+            _reset_aws_clients()
+            _competency_cache["value"] = None
+            _question_index_cache["value"] = None
+            analyze_job_responsibilities.cache.clear()
+            get_recommended_questions.cache.clear()
             
         return jsonify({"success": True, "message": "API keys updated successfully"})
     except Exception as e:
@@ -1198,16 +2878,9 @@ def test_api_keys():
         results["openai"]["configured"] = True
         try:
             # Make a simple test call to OpenAI
-            if USE_NEW_OPENAI_SDK and client:
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role": "user", "content": "Say 'API working'"}],
-                    max_tokens=10
-                )
-                results["openai"]["working"] = True
-                results["openai"]["response"] = response.choices[0].message.content
-            else:
-                results["openai"]["error"] = "OpenAI client not initialized"
+            response_text = _chat("gpt-3.5-turbo", [{"role": "user", "content": "Say 'API working'"}], max_tokens=10)
+            results["openai"]["working"] = True
+            results["openai"]["response"] = response_text
         except Exception as e:
             results["openai"]["error"] = str(e)
             logger.error(f"OpenAI API test failed: {str(e)}")
@@ -1244,102 +2917,68 @@ def prepare_interview_questions():
         logger.warning("No pdf_url provided")
         return jsonify({"error": "pdf_url is required"})
 
+    filepath = None
     try:
-        # Download pdf into local directory
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
-        }
+        # Download pdf into its own temporary file
         logger.info(f"Downloading PDF from URL: {pdf_url}")
-        response = requests.get(pdf_url, headers=headers)
-
-        filepath = os.path.join(tmp_dir, 'downloaded_resume.pdf')
-        with open(filepath, 'wb') as f:
-            f.write(response.content)
+        filepath = _unique_tmp_path('.pdf')
+        # Stream to disk in chunks rather than holding the whole PDF in memory first
+        with _outbound_session().get(pdf_url, timeout=OUTBOUND_HTTP_TIMEOUT, stream=True) as response:
+            with open(filepath, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
 
         logger.info(f"PDF downloaded and saved to {filepath}")
 
-        # Extract text from pdf
-        pdf = pypdf.PdfReader(filepath)
-        content = ""
-        number_of_pages = len(pdf.pages)
-        for idx in range(number_of_pages):
-            page = pdf.pages[idx]
-            content += f"### Page {idx+1} ###\n"
-            content += page.extract_text()
+        # Extract text from pdf (same page-marked output, via the shared extractor)
+        content = extract_text_from_document(filepath)
 
         logger.info(f"Extracted {len(content)} characters from PDF")
 
-        QUESTION_PREPARE_PROMPT = """
-        Generate recommendation for a live interview.
-
-        Here is a partial transcript from the candidate:
-        <transcript>
-        {candidate_transcript}
-        </transcript>
-
-        Generate recommendations for the next interview question based on the transcript. Follow this format:
-
-        <recommended_questions>
-        <question>...</question>
-        ...
-        </recommended_questions>
-
-        <response_summary>
-        - ...
-        - ...
-        ...
-        </response_summary>
-
-        Notes:
-        - You can recommend multiple candidate interview questions. Each question must be related to the candidate's transcript.
-        - The response summary should be in bullet points summarizing the candidate's transcript.
-        - You can include a maximum of 3 recommendations.
-        """
-
         prompt = QUESTION_PREPARE_PROMPT.format(candidate_transcript=content)
 
-        # Call OpenAI API using the appropriate SDK
-        if USE_NEW_OPENAI_SDK:
-            logger.info("Calling OpenAI API with new SDK")
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            logger.info("Calling OpenAI API with old SDK")
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
+        logger.info("Calling OpenAI API")
+        # Same resume, same questions: temperature 0 makes the reply safe to serve from cache
+        completion_text = _cached_chat("gpt-3.5-turbo", "", prompt, temperature=0)
 
         logger.info("OpenAI API call successful")
 
-        questions = re.findall(r'<question>(.*?)</question>', completion_text)
+        questions = QUESTION_TAG_RE.findall(completion_text)
         questions = questions[:3]  # Limit to 3 questions
 
-        # Clean up the file
-        try:
-            os.remove(filepath)
-            logger.info(f"Temporary file {filepath} removed")
-        except Exception as e:
-            logger.warning(f"Could not delete temporary file {filepath}: {str(e)}")
-
         logger.info(f"Returning {len(questions)} questions")
         return jsonify({
             "success": True, 
             "questions": questions,
-            "resume_analysis": SESSION_STORE[session_id].get("parsed_info", {}) # Add parsed info here
+            "resume_analysis": _session_get("resume", "parsed_info", {}) # Add parsed info here
             })
 
     except Exception as e:
         logger.error(f"Error in prepare_interview_questions: {str(e)}")
         return jsonify({"error": str(e)}), 500
+    finally:
+        _remove_tmp_file(filepath)
+
+RESUME_EXTRACTION_PROMPT = """Analyze this resume and extract:
+1. Current or most recent job title
+2. Key skills
+3. Years of experience
+4. Experience details (including company, title, duration, and key responsibilities)
+5. Education details (including institution, degree, field, and year)
+Return as JSON with keys: current_role, skills, years_experience, experience, education"""
+
+# Resume details and the opening questions from one completion (upload_resume)
+RESUME_WITH_QUESTIONS_PROMPT = """Analyze this resume.
+First extract:
+1. Current or most recent job title
+2. Key skills
+3. Years of experience
+4. Experience details (including company, title, duration, and key responsibilities)
+5. Education details (including institution, degree, field, and year)
+Then write up to 3 interview questions, each tied to specific experience in the resume.
+Return a JSON object with keys:
+- parsed_info: object with keys current_role, skills, years_experience, experience, education
+- questions: array of question strings"""
 
 @app.route("/api/upload_resume", methods=['POST'])
 def upload_resume():
@@ -1363,125 +3002,27 @@ def upload_resume():
             logger.warning(f"Unsupported file type: {file_extension}")
             return jsonify({"error": f"Unsupported file type. Please upload PDF, DOC, DOCX, or TXT files."}), 400
 
-        # Save the file
-        filepath = os.path.join(tmp_dir, filename)
+        # Save the file under a per-request name; the client filename is only used for its extension
+        filepath = _unique_tmp_path(file_extension)
         file.save(filepath)
         logger.info(f"File saved to {filepath}")
 
         try:
-            # Extract text from document using our common function
-            content = extract_text_from_document(filepath)
+            # Extract text from document using our common function (cached by file digest)
+            content = _extract_upload_text(filepath)
             logger.info(f"Extracted {len(content)} characters from resume document")
 
             # Store resume content in the session
             session_id = "resume"
-            if session_id not in SESSION_STORE:
-                SESSION_STORE[session_id] = {}
-            SESSION_STORE[session_id]["content"] = content
+            _session_set(session_id, content=content)
             logger.info("Resume content stored in session for future use")
 
             # Check if this is the Evernorth demo
-            is_evernorth_demo = False
-            if "job_posting" in SESSION_STORE and SESSION_STORE["job_posting"].get("is_evernorth_demo", False):
-                is_evernorth_demo = True
+            job_posting_session = _session_get("job_posting", default={})
+            is_evernorth_demo = job_posting_session.get("is_evernorth_demo", False)
+            if is_evernorth_demo:
                 logger.info("Evernorth demo detected for resume processing")
 
-            # Extract key information from resume
-            if USE_NEW_OPENAI_SDK:
-                logger.info("Extracting key resume details with new SDK")
-                extract_completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "user", "content": f"""
-                        Analyze this resume and extract:
-                        1. Current or most recent job title
-                        2. Key skills
-                        3. Years of experience
-                        4. Experience details (including company, title, duration, and key responsibilities)
-                        5. Education details (including institution, degree, field, and year)
-                        Return as JSON with keys: current_role, skills, years_experience, experience, education
-
-                        Resume:
-                        {content}
-                        """}
-                    ]
-                )
-                extract_text = extract_completion.choices[0].message.content
-
-                # Try to parse the JSON with resume info
-                try:
-                    # Try to extract JSON object
-                    match = re.search(r'\{.*\}', extract_text, re.DOTALL)
-                    if match:
-                        json_str = match.group(0)
-                        resume_info = json.loads(json_str)
-                        SESSION_STORE[session_id]["parsed_info"] = resume_info
-                        logger.info(f"Extracted structured resume info: {json.dumps(resume_info)}")
-                except Exception as parse_error:
-                    logger.error(f"Error parsing resume info: {str(parse_error)}")
-            else:
-                logger.info("Extracting key resume details with old SDK")
-                extract_completion = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "user", "content": f"""
-                        Analyze this resume and extract:
-                        1. Current or most recent job title
-                        2. Key skills
-                        3. Years of experience
-                        4. Experience details (including company, title, duration, and key responsibilities)
-                        5. Education details (including institution, degree, field, and year)
-                        Return as JSON with keys: current_role, skills, years_experience, experience, education
-
-                        Resume:
-                        {content}
-                        """}
-                    ]
-                )
-                extract_text = extract_completion.choices[0].message.content
-
-                # Try to parse the JSON with resume info
-                try:
-                    # Try to extract JSON object
-                    match = re.search(r'\{.*\}', extract_text, re.DOTALL)
-                    if match:
-                        json_str = match.group(0)
-                        resume_info = json.loads(json_str)
-                        SESSION_STORE[session_id]["parsed_info"] = resume_info
-                        logger.info(f"Extracted structured resume info: {json.dumps(resume_info)}")
-                except Exception as parse_error:
-                    logger.error(f"Error parsing resume info: {str(parse_error)}")
-
-            # Prepare prompt for OpenAI to generate initial questions
-            QUESTION_PREPARE_PROMPT = """
-            Generate recommendation for a live interview.
-
-            Here is a partial transcript from the candidate:
-            <transcript>
-            {candidate_transcript}
-            </transcript>
-
-            Generate recommendations for the next interview question based on the transcript. Follow this format:
-
-            <recommended_questions>
-            <question>...</question>
-            ...
-            </recommended_questions>
-
-            <response_summary>
-            - ...
-            - ...
-            ...
-            </response_summary>
-
-            Notes:
-            - You can recommend multiple candidate interview questions. Each question must be related to the candidate's transcript.
-            - The response summary should be in bullet points summarizing the candidate's transcript.
-            - You can include a maximum of 3 recommendations.
-            """
-
-            prompt = QUESTION_PREPARE_PROMPT.format(candidate_transcript=content)
-
             # Check if OpenAI API key is set
             if not openai_api_key:
                 logger.error("OpenAI API key is not set")
@@ -1491,34 +3032,49 @@ def upload_resume():
                 logger.error("OpenAI client is not initialized")
                 return jsonify({"error": "OpenAI client is not initialized. Please check API configuration."}), 500
 
-            if USE_NEW_OPENAI_SDK and client:
-                logger.info("Calling OpenAI API with new SDK")
+            # Extract key resume details and the initial questions in a single call
+            logger.info("Extracting key resume details and initial questions")
+            resume_info = None
+            questions = []
+            try:
+                combined = _chat_json(
+                    RESUME_WITH_QUESTIONS_PROMPT,
+                    f"Resume:\n{content}",
+                    response_format={"type": "json_object"}
+                )
+                if isinstance(combined.get("parsed_info"), dict):
+                    resume_info = combined["parsed_info"]
+                if isinstance(combined.get("questions"), list):
+                    questions = [q for q in combined["questions"] if isinstance(q, str) and q.strip()][:3]
+            except Exception as combined_error:
+                logger.error(f"Combined resume analysis failed, using separate calls: {str(combined_error)}")
+
+            # Fall back to the dedicated call for whichever half the combined reply lacked
+            if resume_info is None:
                 try:
-                    completion = client.chat.completions.create(
-                        model="gpt-3.5-turbo",
-                        messages=[
-                            {"role": "user", "content": prompt}
-                        ]
-                    )
-                    completion_text = completion.choices[0].message.content
+                    resume_info = _chat_json(RESUME_EXTRACTION_PROMPT, f"Resume:\n{content}")
+                except json.JSONDecodeError as parse_error:
+                    logger.error(f"Error parsing resume info: {str(parse_error)}")
+            if resume_info is not None:
+                _session_update(session_id, parsed_info=resume_info)
+                logger.info(f"Extracted structured resume info: {json.dumps(resume_info)}")
+
+            if not questions:
+                # Prepare prompt for OpenAI to generate initial questions
+                prompt = QUESTION_PREPARE_PROMPT.format(candidate_transcript=content)
+
+                logger.info("Calling OpenAI API")
+                try:
+                    completion_text = _cached_chat("gpt-3.5-turbo", "", prompt, temperature=0)
                 except Exception as api_error:
                     logger.error(f"OpenAI API call failed: {str(api_error)}")
                     return jsonify({"error": f"OpenAI API call failed: {str(api_error)}"}), 500
-            else:
-                logger.info("Calling OpenAI API with old SDK")
-                completion = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
 
-            logger.info("OpenAI API call successful")
+                logger.info("OpenAI API call successful")
 
-            # Extract the questions
-            questions = re.findall(r'<question>(.*?)</question>', completion_text)
-            questions = questions[:3]  # Limit to 3 questions
+                # Extract the questions
+                questions = QUESTION_TAG_RE.findall(completion_text)
+                questions = questions[:3]  # Limit to 3 questions
 
             if not questions:
                 logger.warning("No questions found in OpenAI response, using defaults")
@@ -1528,19 +3084,12 @@ def upload_resume():
                     "How do you handle challenging situations in the workplace?"
                 ]
 
-            # Clean up
-            try:
-                os.remove(filepath)
-                logger.info(f"Temporary file {filepath} removed")
-            except Exception as e:
-                logger.warning(f"Could not delete temporary file {filepath}: {str(e)}")
-
             # If this is part of the Evernorth demo, include resume-specific questions
-            if is_evernorth_demo and "job_posting" in SESSION_STORE:
+            if is_evernorth_demo:
                 # Include any resume questions from the Evernorth demo
                 evernorth_resume_questions = []
-                if "resume_questions" in SESSION_STORE["job_posting"]:
-                    evernorth_questions = SESSION_STORE["job_posting"]["resume_questions"]
+                if "resume_questions" in job_posting_session:
+                    evernorth_questions = job_posting_session["resume_questions"]
                     for q in evernorth_questions:
                         if isinstance(q, dict) and "question" in q:
                             evernorth_resume_questions.append(q["question"])
@@ -1571,7 +3120,7 @@ def upload_resume():
                 return jsonify({
                     "success": True, 
                     "questions": formatted_questions,
-                    "resume_analysis": SESSION_STORE[session_id].get("parsed_info", {})
+                    "resume_analysis": _session_get(session_id, "parsed_info", {})
                 })
             else:
                 # Format questions to match frontend expectations
@@ -1588,19 +3137,16 @@ def upload_resume():
                 return jsonify({
                     "success": True, 
                     "questions": formatted_questions,
-                    "resume_analysis": SESSION_STORE[session_id].get("parsed_info", {})
+                    "resume_analysis": _session_get(session_id, "parsed_info", {})
                 })
 
         except Exception as e:
             logger.error(f"Error processing document or calling OpenAI: {str(e)}")
-            try:
-                os.remove(filepath)
-                logger.info(f"Temporary file {filepath} removed after error")
-            except Exception as cleanup_error:
-                logger.warning(f"Could not delete temporary file {filepath}: {str(cleanup_error)}")
-
             return jsonify({"error": f"Error processing resume: {str(e)}"}), 500
 
+        finally:
+            _remove_tmp_file(filepath)
+
     except Exception as e:
         logger.error(f"Unexpected error in upload_resume: {str(e)}")
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
@@ -1617,17 +3163,16 @@ def upload_job_posting():
             return jsonify({"error": "Empty job posting filename"}), 400
         
         if job_file:
-            # Save the file temporarily
-            tmp_dir = os.path.join(os.getcwd(), 'tmp')
-            if not os.path.exists(tmp_dir):
-                os.makedirs(tmp_dir)
-            
-            filepath = os.path.join(tmp_dir, secure_filename(job_file.filename))
+            # Warm the competency/question caches while the file is extracted and parsed
+            _prefetch_question_data()
+
+            # Save the file temporarily under a per-request name
+            filepath = _unique_tmp_path(os.path.splitext(secure_filename(job_file.filename))[1].lower())
             job_file.save(filepath)
             
             try:
                 # Extract text from the job posting
-                content = extract_text_from_document(filepath)
+                content = _extract_upload_text(filepath)
                 
                 if not content or len(content.strip()) < 10:
                     return jsonify({"error": "Could not extract text from the job posting"}), 400
@@ -1635,16 +3180,11 @@ def upload_job_posting():
                 # Parse job posting
                 job_data = parse_job_posting(content)
                 
-                # Store in session
-                if "job_posting" not in SESSION_STORE:
-                    SESSION_STORE["job_posting"] = {}
-                
-                SESSION_STORE["job_posting"]["content"] = content
-                SESSION_STORE["job_posting"]["job_data"] = job_data
-                
                 # If responsibilities were extracted, generate competency-based questions
                 responsibilities = job_data.get("responsibilities", [])
-                SESSION_STORE["job_posting"]["responsibilities"] = responsibilities
+
+                # Store in session; a new posting replaces everything from the previous one
+                _session_set("job_posting", content=content, job_data=job_data, responsibilities=responsibilities)
                 
                 # Get competency analysis with tagged responsibilities
                 if responsibilities:
@@ -1652,13 +3192,16 @@ def upload_job_posting():
                     tagged_responsibilities = analysis_results.get("tagged_responsibilities", [])
                     top_competencies = analysis_results.get("top_competencies", [])
                     
-                    # Store competency analysis
-                    SESSION_STORE["job_posting"]["tagged_responsibilities"] = tagged_responsibilities
-                    SESSION_STORE["job_posting"]["top_competencies"] = top_competencies
-                    
                     # Generate recommended questions
                     recommended_questions = get_recommended_questions(top_competencies)
-                    SESSION_STORE["job_posting"]["recommended_questions"] = recommended_questions
+
+                    # Store competency analysis
+                    _session_update(
+                        "job_posting",
+                        tagged_responsibilities=tagged_responsibilities,
+                        top_competencies=top_competencies,
+                        recommended_questions=recommended_questions
+                    )
                     
                     # Return success with relevant data
                     return jsonify({
@@ -1684,13 +3227,15 @@ def upload_job_posting():
             
             finally:
                 # Clean up the temporary file
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+                _remove_tmp_file(filepath)
     
     except Exception as e:
         logger.error(f"Error in upload_job_posting: {str(e)}")
         return jsonify({"error": f"Error uploading job posting: {str(e)}"}), 500
 
+JOB_RESPONSIBILITIES_EXTRACTION_PROMPT = """Extract the key roles and responsibilities from this job posting.
+Return a JSON object of the form {"responsibilities": [...]}, where each string in the array is a specific responsibility or requirement."""
+
 @app.route("/api/process_job_posting_url", methods=['POST'])
 def process_job_posting_url():
     """Handle job posting URL and extract content from the webpage"""
@@ -1709,89 +3254,51 @@ def process_job_posting_url():
 
         logger.info(f"Processing job posting URL: {job_url}")
 
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
-        }
+        # Load the competency/question caches while the page downloads and the LLM extracts
+        _prefetch_question_data()
+
         try:
-            response = requests.get(job_url, headers=headers, timeout=10)
+            response = _outbound_session().get(job_url, timeout=OUTBOUND_HTTP_TIMEOUT)
             response.raise_for_status()
 
             content_type = response.headers.get('Content-Type', '').lower()
+            structured_responsibilities = []
             if 'text/html' in content_type:
-                from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
-                for script in soup(["script", "style", "nav", "footer", "header"]):
-                    script.extract()
-                job_content = ' '.join(soup.get_text(separator=' ').split())
+                # JSON-LD lives in <script> tags, so read it before they are stripped
+                structured_responsibilities = _job_posting_json_ld_items(response.text)
+                job_content = _html_to_text(response.text)
                 logger.info(f"Extracted {len(job_content)} characters from job posting URL")
             elif 'application/pdf' in content_type:
-                import io
-                pdf_content = io.BytesIO(response.content)
-                pdf = pypdf.PdfReader(pdf_content)
-                job_content = ""
-                number_of_pages = len(pdf.pages)
-                for idx in range(number_of_pages):
-                    page = pdf.pages[idx]
-                    job_content += page.extract_text()
+                job_content = _extract_pdf_bytes(response.content)
                 logger.info(f"Extracted {len(job_content)} characters from PDF URL")
             else:
                 job_content = response.text
                 logger.info(f"Extracted {len(job_content)} characters from text URL")
 
             session_id = "job_posting"
-            if session_id not in SESSION_STORE:
-                SESSION_STORE[session_id] = {}
-            SESSION_STORE[session_id]["content"] = job_content
 
             # Extract key roles/responsibilities
-            if USE_NEW_OPENAI_SDK:
-                logger.info("Extracting job details with new SDK")
-                completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "user", "content": f"""
-                        Extract the key roles and responsibilities from this job posting.
-                        Return them as a JSON array of strings, with each string being a specific responsibility or requirement.
-
-                        Job posting:
-                        {job_content}
-                        """}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
+            if structured_responsibilities:
+                logger.info(f"Using {len(structured_responsibilities)} responsibilities from the page's JobPosting JSON-LD")
+                responsibilities = structured_responsibilities
             else:
-                logger.info("Extracting job details with old SDK")
-                completion = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "user", "content": f"""
-                        Extract the key roles and responsibilities from this job posting.
-                        Return them as a JSON array of strings, with each string being a specific responsibility or requirement.
-
-                        Job posting:
-                        {job_content}
-                        """}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
-
-            logger.info("OpenAI API call successful")
-
-            try:
-                match = re.search(r'\[.*\]', completion_text, re.DOTALL)
-                if match:
-                    json_str = match.group(0)
-                    responsibilities = json.loads(json_str)
-                else:
-                    responsibilities = json.loads(completion_text)
-
-                if not isinstance(responsibilities, list):
-                    responsibilities = ["Could not properly extract responsibilities from the job posting"]
-            except Exception as e:
-                logger.error(f"Error parsing OpenAI JSON response: {str(e)}")
-                responsibilities = ["Error parsing responsibilities"]
-
-            SESSION_STORE[session_id]["responsibilities"] = responsibilities
+                logger.info("Extracting job details")
+                try:
+                    # JSON mode only emits objects, so the array comes wrapped in {"responsibilities": [...]}
+                    result = _chat_json(
+                        JOB_RESPONSIBILITIES_EXTRACTION_PROMPT,
+                        f"Job posting:\n{job_content}",
+                        response_format={"type": "json_object"}
+                    )
+                    responsibilities = result.get("responsibilities") if isinstance(result, dict) else result
+                    logger.info("OpenAI API call successful")
+                    if not isinstance(responsibilities, list):
+                        responsibilities = ["Could not properly extract responsibilities from the job posting"]
+                except json.JSONDecodeError as e:
+                    logger.error(f"Error parsing OpenAI JSON response: {str(e)}")
+                    responsibilities = ["Error parsing responsibilities"]
+
+            _session_set(session_id, content=job_content, responsibilities=responsibilities)
             
             # New: Analyze responsibilities using competency mapping
             if responsibilities:
@@ -1802,9 +3309,12 @@ def process_job_posting_url():
                 recommended_questions = get_recommended_questions(analysis_results["top_competencies"])
                 
                 # Store for future use
-                SESSION_STORE[session_id]["tagged_responsibilities"] = analysis_results["tagged_responsibilities"]
-                SESSION_STORE[session_id]["top_competencies"] = analysis_results["top_competencies"]
-                SESSION_STORE[session_id]["recommended_questions"] = recommended_questions
+                _session_update(
+                    session_id,
+                    tagged_responsibilities=analysis_results["tagged_responsibilities"],
+                    top_competencies=analysis_results["top_competencies"],
+                    recommended_questions=recommended_questions
+                )
                 
                 logger.info(f"Analyzed job responsibilities: found {len(analysis_results['top_competencies'])} top competencies")
                 logger.info(f"Generated {len(recommended_questions)} recommended questions")
@@ -1817,10 +3327,11 @@ def process_job_posting_url():
             }
             
             # Add competency analysis results if available
-            if "tagged_responsibilities" in SESSION_STORE[session_id]:
-                response_data["tagged_responsibilities"] = SESSION_STORE[session_id]["tagged_responsibilities"]
-                response_data["top_competencies"] = SESSION_STORE[session_id]["top_competencies"]
-                response_data["recommended_questions"] = SESSION_STORE[session_id]["recommended_questions"]
+            job_posting_session = _session_get(session_id, default={})
+            if "tagged_responsibilities" in job_posting_session:
+                response_data["tagged_responsibilities"] = job_posting_session["tagged_responsibilities"]
+                response_data["top_competencies"] = job_posting_session["top_competencies"]
+                response_data["recommended_questions"] = job_posting_session["recommended_questions"]
             
             return jsonify(response_data)
 
@@ -1871,8 +3382,8 @@ def get_introductory_questions():
         # If a resume was uploaded, we can personalize some questions
         # But make sure we only return 3 total, prioritizing personalized ones
         personalized_questions = []
-        if "resume" in SESSION_STORE and "parsed_info" in SESSION_STORE["resume"]:
-            resume_info = SESSION_STORE["resume"]["parsed_info"]
+        resume_info = _session_get("resume", "parsed_info")
+        if resume_info is not None:
 
             # If we have the current role information, personalize a question
             if "current_role" in resume_info and resume_info["current_role"]:
@@ -1887,8 +3398,8 @@ def get_introductory_questions():
                     personalized_questions.append(f"I see you have experience with {skill}. Can you tell me more about that?")
 
         # If a job posting was uploaded, add a relevant question
-        if "job_posting" in SESSION_STORE and "job_data" in SESSION_STORE["job_posting"]:
-            job_data = SESSION_STORE["job_posting"]["job_data"]
+        job_data = _session_get("job_posting", "job_data")
+        if job_data is not None:
 
             if "title" in job_data and job_data["title"]:
                 title = job_data["title"]
@@ -1925,10 +3436,9 @@ def get_recommended_questions_endpoint():
     Returns recommended questions based on the job posting stored in the session.
     """
     try:
-        if "job_posting" not in SESSION_STORE:
+        job_posting = _session_get("job_posting")
+        if job_posting is None:
             return jsonify({"error": "No job posting found"}), 404
-            
-        job_posting = SESSION_STORE["job_posting"]
         
         # If we already have recommended questions, return them
         if "recommended_questions" in job_posting:
@@ -1943,9 +3453,12 @@ def get_recommended_questions_endpoint():
             recommended_questions = get_recommended_questions(analysis_results["top_competencies"])
             
             # Store for future use
-            job_posting["tagged_responsibilities"] = analysis_results["tagged_responsibilities"]
-            job_posting["top_competencies"] = analysis_results["top_competencies"]
-            job_posting["recommended_questions"] = recommended_questions
+            _session_update(
+                "job_posting",
+                tagged_responsibilities=analysis_results["tagged_responsibilities"],
+                top_competencies=analysis_results["top_competencies"],
+                recommended_questions=recommended_questions
+            )
             
             return jsonify({"recommended_questions": recommended_questions})
         
@@ -1967,9 +3480,7 @@ def update_interviewee_transcript():
 
         logger.info(f"Received transcript of length {len(transcript)} for session {session_id}")
 
-        if session_id not in SESSION_STORE:
-            SESSION_STORE[session_id] = {}
-        SESSION_STORE[session_id]["transcript"] = transcript
+        _session_update(session_id, transcript=transcript)
 
         return jsonify({"success": True})
     except Exception as e:
@@ -2042,14 +3553,11 @@ def generate_recommendation():
             return jsonify({"error": "No transcript provided"}), 400
 
         # Save transcript in session
-        if session_id not in SESSION_STORE:
-            SESSION_STORE[session_id] = {}
-        SESSION_STORE[session_id]["transcript"] = transcript
+        _session_update(session_id, transcript=transcript)
 
         # Check for resume content
-        resume_content = ""
-        if "resume" in SESSION_STORE and "content" in SESSION_STORE["resume"]:
-            resume_content = SESSION_STORE["resume"]["content"]
+        resume_content = _session_get("resume", "content", "")
+        if resume_content:
             logger.info("Including resume content in question generation")
 
         # Check for job posting information
@@ -2057,8 +3565,8 @@ def generate_recommendation():
         job_content = ""
         job_responsibilities = []
 
-        if "job_posting" in SESSION_STORE:
-            job_posting = SESSION_STORE["job_posting"]
+        job_posting = _session_get("job_posting")
+        if job_posting is not None:
 
             # Get full job content if available
             if "content" in job_posting:
@@ -2118,93 +3626,29 @@ def generate_recommendation():
                 """
 
             # Add additional intelligent matching instructions
-            prompt += """
-            INSTRUCTIONS:
-            1. Identify the most critical skills and qualifications from the job posting
-            2. Focus on the candidate's current or most recent role and relevant experiences
-            3. Create questions that reveal whether the candidate's experience directly aligns with the job requirements
-            4. Use the candidate's own terms and experiences as a foundation for questions
-            5. Include specific skill assessment questions for key technical requirements
-
-            Format your response with:
-
-            <recommended_questions>
-            <question>...</question>
-            ...
-            </recommended_questions>
-
-            <response_summary>
-            - ...
-            - ...
-            ...
-            </response_summary>
-
-            Limit to 3 questions maximum, focusing on quality over quantity.
-            """
+            prompt += JOB_ALIGNED_QUESTION_INSTRUCTIONS
 
         else:
             # Standard prompt without job posting
-            prompt = """
-            Generate recommendation for a live interview.
-
-            Here is a partial transcript from the candidate:
-            <transcript>
-            {candidate_transcript}
-            </transcript>
-
-            Generate recommendations for the next interview question based on the transcript. Follow this format:
-
-            <recommended_questions>
-            <question>...</question>
-            ...
-            </recommended_questions>
-
-            <response_summary>
-            - ...
-            - ...
-            ...
-            </response_summary>
-
-            Notes:
-            - You can recommend multiple candidate interview questions. Each question must be related to the candidate's transcript.
-            - The response summary should be in bullet points summarizing the candidate's transcript.
-            - You can include a maximum of 3 recommendations.
-            """.format(candidate_transcript=transcript)
+            prompt = QUESTION_PREPARE_PROMPT.format(candidate_transcript=transcript)
             
             if feedback_prompt:
                 prompt = f"{feedback_prompt}\n{prompt}"
 
         # Call OpenAI API
         model_to_use = os.getenv("FINE_TUNED_MODEL_NAME", "gpt-3.5-turbo")
+        messages = [{"role": "user", "content": prompt}]
 
-        try:
-            if USE_NEW_OPENAI_SDK:
-                completion = client.chat.completions.create(
-                    model=model_to_use,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                completion_text = completion.choices[0].message.content
-            else:
-                completion = openai.ChatCompletion.create(
-                    model=model_to_use,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                completion_text = completion.choices[0].message.content
-
-            logger.info("Generated questions successfully")
-
+        def build_result(completion_text):
             # Extract questions
-            questions = re.findall(r'<question>(.*?)</question>', completion_text)
+            questions = QUESTION_TAG_RE.findall(completion_text)
             questions = questions[:3] if questions else []
 
             # Extract response summary
-            response_summary_matches = re.findall(r'<response_summary>(.*?)</response_summary>',
-                                                completion_text, re.DOTALL)
+            response_summary_matches = RESPONSE_SUMMARY_TAG_RE.findall(completion_text)
             if response_summary_matches:
                 summary_text = response_summary_matches[0].strip()
-                response_summary = [
-                    line.strip('- ').strip() for line in summary_text.split('\n') if line.strip()
-                ]
+                response_summary = _split_bullets(summary_text)
             else:
                 response_summary = ["No summary provided."]
 
@@ -2225,12 +3669,42 @@ def generate_recommendation():
                     ]
 
             logger.info(f"Returning {len(questions)} questions and {len(response_summary)} summary points")
-            return jsonify({
+            return {
                 "questions": questions,
                 "response_summary": response_summary,
                 "candidate_transcript": transcript,
                 "job_posting_used": job_posting_used
-            })
+            }
+
+        # Opt-in Server-Sent Events: each question is sent as soon as its tag closes,
+        # followed by one final event carrying the same payload as the JSON response
+        wants_stream = str(data.get("stream", "")).lower() in ("1", "true", "yes") or \
+            request.accept_mimetypes.best == "text/event-stream"
+        if wants_stream:
+            def generate_events():
+                parts = []
+                try:
+                    for question in _stream_tagged_questions(_chat_deltas(model_to_use, messages), parts):
+                        yield f"data: {json.dumps({'question': question})}\n\n"
+                    result = build_result("".join(parts))
+                    result["done"] = True
+                    yield f"data: {json.dumps(result)}\n\n"
+                except Exception as e:
+                    logger.error(f"Error streaming recommendations: {str(e)}")
+                    yield f"data: {json.dumps({'error': f'Error generating recommendations: {str(e)}', 'done': True})}\n\n"
+
+            return Response(
+                stream_with_context(generate_events()),
+                mimetype="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
+        try:
+            completion_text = _chat(model_to_use, messages)
+
+            logger.info("Generated questions successfully")
+
+            return jsonify(build_result(completion_text))
 
         except Exception as e:
             logger.error(f"Error calling OpenAI API: {str(e)}")
@@ -2265,11 +3739,8 @@ def summarize_response():
                 # Use existing code approach
                 return summarize_intro_response(transcript, question)
             else:
-                # Use STAR analysis for behavioral/situational questions
-                star_analysis = analyze_response_star(transcript, question)
-                
-                # Generate follow-up questions based on STAR
-                followups = generate_followup_questions_star(star_analysis)
+                # STAR analysis for behavioral/situational questions, with follow-ups from the same call
+                star_analysis, followups = analyze_response_star_with_followups(transcript, question)
                 
                 # Return both STAR analysis and followups
                 return jsonify({
@@ -2299,38 +3770,23 @@ def summarize_response():
             about what the candidate communicated. Focus only on what was actually said in the transcript.
             """
 
-            # Call OpenAI API using the appropriate SDK
-            if USE_NEW_OPENAI_SDK:
-                logger.info("Calling OpenAI API for summary generation")
-                completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a professional interview assistant that creates accurate summaries of candidate responses."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
-            else:
-                logger.info("Calling OpenAI API with old SDK for summary")
-                completion = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are a professional interview assistant that creates accurate summaries of candidate responses."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
+            logger.info("Calling OpenAI API for summary generation")
+            completion_text = _cached_chat(
+                "gpt-3.5-turbo",
+                "You are a professional interview assistant that creates accurate summaries of candidate responses.",
+                prompt,
+                temperature=0
+            )
 
             # Process the response (using existing code)
             try:
                 # Try to extract a JSON array from the response if it's not already in the right format
-                match = re.search(r'\[.*\]', completion_text, re.DOTALL)
-                if match:
-                    json_str = match.group(0)
-                    summary_points = json.loads(json_str)
+                json_str = _extract_first_json(completion_text, "[")
+                if json_str:
+                    summary_points = _json_loads(json_str)
                 else:
                     # Try loading the whole response as JSON
-                    summary_points = json.loads(completion_text)
+                    summary_points = _json_loads(completion_text)
 
                 # Ensure it's a list
                 if not isinstance(summary_points, list):
@@ -2338,12 +3794,8 @@ def summarize_response():
 
             except Exception as e:
                 logger.error(f"Error parsing summary response: {str(e)}")
-                # If parsing fails, extract bullet points using regex
-                summary_points = re.findall(r'[\•\-\*]\s*(.*?)(?=[\•\-\*]|$)', completion_text)
-                if not summary_points:
-                    # Last resort: split by newlines and clean up
-                    summary_points = [line.strip() for line in completion_text.split('\n')
-                                     if line.strip() and not line.strip().startswith('```')]
+                # If parsing fails, fall back to one item per bullet/line
+                summary_points = _split_bullets(completion_text)
 
             # Return the summary points
             return jsonify({
@@ -2584,11 +4036,10 @@ def summarize_response_to_question():
             return jsonify({"error": "Response too short for summary"}), 400
 
         # Create a specialized prompt for targeted summarization
-        if job_context and "job_posting" in SESSION_STORE:
+        job_posting = _session_get("job_posting")
+        if job_context and job_posting is not None:
             # If we have job context, include it in the prompt
-            job_responsibilities = []
-            if "responsibilities" in SESSION_STORE["job_posting"]:
-                job_responsibilities = SESSION_STORE["job_posting"]["responsibilities"]
+            job_responsibilities = job_posting.get("responsibilities", [])
             
             prompt = f"""
             You are an expert interviewer assistant helping to summarize a candidate's response to a specific interview question.
@@ -2631,40 +4082,25 @@ def summarize_response_to_question():
             Format as a JSON array with exactly 3 strings.
             """
 
-        # Call OpenAI API using the appropriate SDK
-        if USE_NEW_OPENAI_SDK:
-            logger.info("Calling OpenAI API for question-specific summary")
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional interview assistant that creates accurate, concise summaries."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            logger.info("Calling OpenAI API with old SDK for question-specific summary")
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a professional interview assistant that creates accurate, concise summaries."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
+        logger.info("Calling OpenAI API for question-specific summary")
+        completion_text = _cached_chat(
+            "gpt-3.5-turbo",
+            "You are a professional interview assistant that creates accurate, concise summaries.",
+            prompt,
+            temperature=0
+        )
 
         logger.info("Question-specific summary generation successful")
 
         # Try to parse the response as JSON
         try:
             # First, try to extract a JSON array from the response if it's not already in the right format
-            match = re.search(r'\[.*\]', completion_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                summary_points = json.loads(json_str)
+            json_str = _extract_first_json(completion_text, "[")
+            if json_str:
+                summary_points = _json_loads(json_str)
             else:
                 # Try loading the whole response as JSON
-                summary_points = json.loads(completion_text)
+                summary_points = _json_loads(completion_text)
 
             # Ensure we have exactly 3 points
             if not isinstance(summary_points, list):
@@ -2742,34 +4178,19 @@ def generate_followup_questions():
             ]
             """
 
-            if USE_NEW_OPENAI_SDK:
-                completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are an expert interviewer who generates insightful follow-up questions."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
-            else:
-                completion = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are an expert interviewer who generates insightful follow-up questions."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                completion_text = completion.choices[0].message.content
+            completion_text = _chat("gpt-3.5-turbo", [
+                {"role": "system", "content": "You are an expert interviewer who generates insightful follow-up questions."},
+                {"role": "user", "content": prompt}
+            ])
 
             try:
                 # Try to extract JSON array
-                match = re.search(r'\[.*\]', completion_text, re.DOTALL)
-                if match:
-                    json_str = match.group(0)
-                    followup_questions = json.loads(json_str)
+                json_str = _extract_first_json(completion_text, "[")
+                if json_str:
+                    followup_questions = _json_loads(json_str)
                 else:
                     # Try parsing the whole response as JSON
-                    followup_questions = json.loads(completion_text)
+                    followup_questions = _json_loads(completion_text)
 
                 # Ensure it's a list
                 if not isinstance(followup_questions, list):
@@ -2816,15 +4237,13 @@ def get_tailored_questions():
             return jsonify({"error": "No candidate responses provided"}), 400
 
         # Get resume content if available
-        resume_content = ""
-        if "resume" in SESSION_STORE and "content" in SESSION_STORE["resume"]:
-            resume_content = SESSION_STORE["resume"]["content"]
+        resume_content = _session_get("resume", "content", "")
+        if resume_content:
             logger.info("Found resume content to include in tailored questions")
 
         # Get job posting content if available
-        job_responsibilities = []
-        if "job_posting" in SESSION_STORE and "responsibilities" in SESSION_STORE["job_posting"]:
-            job_responsibilities = SESSION_STORE["job_posting"]["responsibilities"]
+        job_responsibilities = _session_get("job_posting", "responsibilities", [])
+        if job_responsibilities:
             logger.info(f"Found {len(job_responsibilities)} job responsibilities to include")
 
         # Create appropriate prompt based on available data
@@ -2871,40 +4290,23 @@ def get_tailored_questions():
         ["Question 1?", "Question 2?", "Question 3?"]
         """
 
-        # Call OpenAI API
-        if USE_NEW_OPENAI_SDK:
-            logger.info("Generating tailored questions with new SDK")
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer assistant generating targeted follow-up questions."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            logger.info("Generating tailored questions with old SDK")
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert interviewer assistant generating targeted follow-up questions."},
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
+        logger.info("Generating tailored questions")
+        completion_text = _chat("gpt-3.5-turbo", [
+            {"role": "system", "content": "You are an expert interviewer assistant generating targeted follow-up questions."},
+            {"role": "user", "content": prompt}
+        ])
 
         logger.info("Generated tailored questions successfully")
 
         # Parse the response (expecting JSON array)
         try:
             # Try to extract JSON array
-            match = re.search(r'\[.*\]', completion_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                questions = json.loads(json_str)
+            json_str = _extract_first_json(completion_text, "[")
+            if json_str:
+                questions = _json_loads(json_str)
             else:
                 # Try parsing the whole response
-                questions = json.loads(completion_text)
+                questions = _json_loads(completion_text)
                 
             # Ensure we have a list
             if not isinstance(questions, list):
@@ -2917,7 +4319,7 @@ def get_tailored_questions():
             logger.error(f"Error parsing tailored questions response: {str(e)}")
             
             # Fallback to regex extraction if JSON parsing fails
-            questions = re.findall(r'(?:^|\n)\d+\.\s*(.+?\?)', completion_text)
+            questions = NUMBERED_QUESTION_RE.findall(completion_text)
             questions = questions[:3]  # Limit to 3
             
             # If still empty, use content splitting method
@@ -3050,59 +4452,32 @@ def detect_interviewer_question():
             })
 
         # Use AI to detect if this is a question and what type
-        if USE_NEW_OPENAI_SDK:
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": f"""
-                    Analyze this transcript from an interviewer. Determine:
-                    1. Is this a question directed at the candidate? (yes/no)
-                    2. If yes, what is the main question being asked?
-                    3. What type of question is it? (introductory, experience, behavioral, technical, etc.)
-
-                    Transcript: "{transcript}"
-
-                    Return your analysis as a JSON object with these keys:
-                    - "is_question": boolean
-                    - "extracted_question": the main question (empty string if not a question)
-                    - "question_type": the question type (empty string if not a question)
-                    """
-                    }
-                ]
-            )
-            result_text = completion.choices[0].message.content
-        else:
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": f"""
-                    Analyze this transcript from an interviewer. Determine:
-                    1. Is this a question directed at the candidate? (yes/no)
-                    2. If yes, what is the main question being asked?
-                    3. What type of question is it? (introductory, experience, behavioral, technical, etc.)
-
-                    Transcript: "{transcript}"
-
-                    Return your analysis as a JSON object with these keys:
-                    - "is_question": boolean
-                    - "extracted_question": the main question (empty string if not a question)
-                    - "question_type": the question type (empty string if not a question)
-                    """
-                    }
-                ]
-            )
-            result_text = completion.choices[0].message.content
+        result_text = _chat("gpt-3.5-turbo", [
+            {"role": "user", "content": f"""
+            Analyze this transcript from an interviewer. Determine:
+            1. Is this a question directed at the candidate? (yes/no)
+            2. If yes, what is the main question being asked?
+            3. What type of question is it? (introductory, experience, behavioral, technical, etc.)
+
+            Transcript: "{transcript}"
+
+            Return your analysis as a JSON object with these keys:
+            - "is_question": boolean
+            - "extracted_question": the main question (empty string if not a question)
+            - "question_type": the question type (empty string if not a question)
+            """
+            }
+        ])
 
         # Extract the JSON from the result
         try:
             # Find JSON object in the response
-            match = re.search(r'\{.*\}', result_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                result = json.loads(json_str)
+            json_str = _extract_first_json(result_text)
+            if json_str:
+                result = _json_loads(json_str)
             else:
                 # Try parsing the whole text as JSON
-                result = json.loads(result_text)
+                result = _json_loads(result_text)
         except:
             # If JSON parsing fails, manually construct a result
             if "yes" in result_text.lower() and "question" in result_text.lower():
@@ -3161,7 +4536,6 @@ def test_interview_flow_endpoint():
             sample_transcript = """I have over 10 years of experience in financial management, starting as a financial analyst at PwC where I worked with Fortune 500 clients. After that, I moved to GlobalCorp where I led a team of 15 financial analysts and implemented several cost-saving initiatives. I have an MBA from Wharton with a specialization in Financial Management, and I'm passionate about using financial data to drive strategic business decisions."""
         else:
             # Randomly choose between complete and incomplete for non-intro questions
-            import random
             if random.random() > 0.5:
                 sample_transcript = """At my previous company, we were facing declining profit margins due to increased competition and rising operational costs. Our margins had dropped from 22% to just 15% over two quarters, which was concerning stakeholders. I was tasked with developing a new financial strategy to improve profitability without sacrificing quality or employee satisfaction, with a target of getting back to at least 20% margins within 6 months. I conducted a comprehensive analysis of our cost structure, identifying three key areas for improvement. First, I implemented a new budget allocation model that prioritized high-ROI initiatives. Second, I negotiated better terms with our top five suppliers, securing an average 8% reduction in costs. Third, I introduced a lean management approach to reduce waste in our operations. Within six months, we increased our profit margins to 21.3% while maintaining product quality and even improving employee satisfaction scores by 7 points in our quarterly survey. The board was extremely pleased, and we eventually expanded this approach to other business units."""
             else:
@@ -3177,8 +4551,7 @@ def test_interview_flow_endpoint():
             return result
         else:
             # Use STAR analysis for behavioral questions
-            star_analysis = analyze_response_star(sample_transcript, question)
-            followups = generate_followup_questions_star(star_analysis)
+            star_analysis, followups = analyze_response_star_with_followups(sample_transcript, question)
             
             return jsonify({
                 "success": True,
@@ -3390,22 +4763,84 @@ def generate_initial_questions():
         logger.error(f"Error generating initial questions: {str(e)}")
         return jsonify({"error": f"Error: {str(e)}"}), 500
 
-def parse_job_posting(job_content):
+# Sections that never help the LLM extract title/summary/responsibilities
+JD_BOILERPLATE_SECTIONS = frozenset({"benefits", "eeo", "about"})
+
+def _find_jd_headers(job_content):
     """
-    Parse a job posting to extract key information like title, summary, responsibilities, and skills.
-    Returns a structured job data dictionary.
+    Locate section headers as (header_start, body_start, kind) tuples in document order.
+    A header must start its line (optionally after '#') and be followed by ':' or end of line.
     """
-    try:
-        logger.info(f"Parsing job posting content of length {len(job_content)}")
-        
-        # Use OpenAI to extract structured information
-        if USE_NEW_OPENAI_SDK:
-            logger.info("Extracting job details with new SDK")
-            completion = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": f"""
-                    Extract the key information from this job posting. I need:
+    lowered = job_content.lower()
+    if len(lowered) != len(job_content):
+        matches = SECTION_RE_CASELESS.finditer(job_content)
+    elif JD_HEADER_AUTOMATON is None:
+        matches = SECTION_RE.finditer(lowered)
+    else:
+        matches = None
+    if matches is not None:
+        return [
+            (match.start(), match.end(), next(name for name, value in match.groupdict().items() if value is not None))
+            for match in matches
+        ]
+
+    headers = []
+    length = len(lowered)
+    for end, (keyword, kind) in JD_HEADER_AUTOMATON.iter(lowered):
+        start = end - len(keyword) + 1
+        line_start = lowered.rfind('\n', 0, start) + 1
+        if lowered[line_start:start].strip(' \t#'):
+            continue
+        i = end + 1
+        while i < length and lowered[i] in ' \t':
+            i += 1
+        if i < length and lowered[i] == ':':
+            i += 1
+        elif i < length and lowered[i] not in '\r\n':
+            continue
+        headers.append((line_start, i, kind))
+    return headers
+
+def _split_jd_sections(job_content):
+    """
+    Split a job description into sections with a single header scan.
+    Returns {"preamble": text, kind: text, ...}; repeated kinds are concatenated.
+    """
+    sections = {}
+    headers = _find_jd_headers(job_content)
+    sections["preamble"] = job_content[:headers[0][0]] if headers else job_content
+    for i, (_, body_start, kind) in enumerate(headers):
+        end = headers[i + 1][0] if i + 1 < len(headers) else len(job_content)
+        body = job_content[body_start:end].strip()
+        sections[kind] = f"{sections[kind]}\n{body}" if kind in sections else body
+    return sections
+
+def _split_bullets(text):
+    """
+    Split text into bullet/line items in one pass, dropping bullet markers, blank lines
+    and markdown code fences. Only str methods are used, so the scan stays in C.
+    """
+    items = []
+    for line in text.splitlines():
+        item = line.strip().lstrip(BULLET_MARKERS).strip()
+        if item and not item.startswith('```'):
+            items.append(item)
+    return items
+
+def _parse_job_posting_locally(job_content, sections=None):
+    """Best-effort structured job data from section headers alone, used when the LLM can't help."""
+    sections = sections or _split_jd_sections(job_content)
+    preamble_lines = [line.strip() for line in sections.get("preamble", "").splitlines() if line.strip()]
+    return {
+        "title": preamble_lines[0] if preamble_lines else "Unknown Position",
+        "summary": sections.get("summary") or (" ".join(preamble_lines[1:]) if len(preamble_lines) > 1 else ""),
+        "experience_required": "Not specified",
+        "responsibilities": _split_bullets(sections.get("responsibilities", "")),
+        "key_skills": _split_bullets(sections.get("requirements", ""))[:10]
+    }
+
+JOB_POSTING_EXTRACTION_PROMPT = """
+                    Extract the key information from the job posting provided by the user. I need:
                     
                     1. The exact position summary paragraph word for word (copy and paste it if present)
                     2. The key roles and responsibilities from this job posting (word for word)
@@ -3419,69 +4854,42 @@ def parse_job_posting(job_content):
                     - "key_skills": an array of the most important skills for this role
 
                     Keep all text exactly as it appears in the document. Do not rewrite, summarize, or change the wording.
+                    """
 
-                    Job posting:
-                    {job_content}
-                    """}
-                ]
-            )
-            completion_text = completion.choices[0].message.content
-        else:
-            logger.info("Extracting job details with old SDK")
-            completion = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": f"""
-                    Extract the key roles and responsibilities from this job posting.
-                    Also extract the job title and required years of experience if mentioned.
-                    Return as a JSON object with these keys:
-                    - "title": the job title
-                    - "experience_required": the required years of experience (or "Not specified")
-                    - "responsibilities": an array of strings with each specific responsibility
-                    - "key_skills": an array of the most important skills for this role
-
-                    Focus on the most important and specific responsibilities rather than generic ones.
-
-                    Job posting:
-                    {job_content}
-                    """}
-                ]
+def parse_job_posting(job_content):
+    """
+    Parse a job posting to extract key information like title, summary, responsibilities, and skills.
+    Returns a structured job data dictionary.
+    """
+    try:
+        logger.info(f"Parsing job posting content of length {len(job_content)}")
+        
+        # One pass over the text finds the section headers; boilerplate sections
+        # (benefits, EEO, about us) are dropped before the text is sent to the LLM
+        sections = _split_jd_sections(job_content)
+        kept_content = job_content
+        if JD_BOILERPLATE_SECTIONS.intersection(sections):
+            kept_content = "\n\n".join(
+                sections["preamble"] if kind == "preamble" else f"{kind.title()}:\n{text}"
+                for kind, text in sections.items() if kind not in JD_BOILERPLATE_SECTIONS
             )
-            completion_text = completion.choices[0].message.content
+            logger.info(f"Trimmed job posting from {len(job_content)} to {len(kept_content)} characters before extraction")
 
-        logger.info("OpenAI API call successful for job parsing")
-
-        # Attempt to parse the JSON response
+        # Use OpenAI to extract structured information
         try:
-            # Try to extract JSON object
-            match = re.search(r'\{.*\}', completion_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-                job_data = json.loads(json_str)
-                return job_data
-            else:
-                # Try to parse the whole response if JSON object not found
-                try:
-                    job_data = json.loads(completion_text)
-                    return job_data
-                except:
-                    logger.error("Failed to parse job data as JSON")
-                    return {
-                        "title": "Unknown Position",
-                        "summary": "Could not extract summary",
-                        "experience_required": "Not specified",
-                        "responsibilities": ["Could not properly parse job responsibilities"],
-                        "key_skills": []
-                    }
-        except Exception as e:
-            logger.error(f"Error parsing OpenAI JSON response: {str(e)}")
-            return {
-                "title": "Unknown Position",
-                "summary": "Error parsing job data",
-                "experience_required": "Not specified",
-                "responsibilities": ["Error parsing responsibilities"],
-                "key_skills": []
-            }
+            job_data = _chat_json(
+                JOB_POSTING_EXTRACTION_PROMPT,
+                f"Job posting:\n{kept_content}",
+                response_format={"type": "json_object"}
+            )
+            logger.info("OpenAI API call successful for job parsing")
+            return job_data
+        except json.JSONDecodeError:
+            logger.error("Failed to parse job data as JSON; falling back to section headers")
+            job_data = _parse_job_posting_locally(job_content, sections)
+            if not job_data["responsibilities"]:
+                job_data["responsibilities"] = ["Could not properly parse job responsibilities"]
+            return job_data
     
     except Exception as e:
         logger.error(f"Error in parse_job_posting: {str(e)}")
@@ -3493,23 +4901,7 @@ def parse_job_posting(job_content):
             "key_skills": []
         }
 
-@app.route('/api/job-analysis', methods=['POST'])
-def job_analysis():
-    try:
-        data = request.json
-        job_description = data.get('jobDescription', '')
-        
-        # Use mock response if mock services are enabled
-        if os.environ.get('MOCK_SERVICES') == 'true':
-            logger.info(f"Using mock response for job analysis")
-            return jsonify(get_mock_job_analysis())
-        
-        # Call OpenAI API with specified prompt
-        if USE_NEW_OPENAI_SDK:
-            response = client.chat.completions.create(
-                model=os.environ.get('OPENAI_MODEL', 'gpt-4'),
-                messages=[
-                    {"role": "system", "content": """
+JOB_ANALYSIS_SYSTEM_PROMPT = """
                     You are a job analysis agent. Your task is to analyze a job description and identify the top 5 most 
                     important competencies for this role. Focus on extracting competencies that are clearly important based 
                     on the job description, not general competencies that would apply to any job.
@@ -3532,55 +4924,68 @@ def job_analysis():
                     }
                     
                     Ensure you identify exactly 5 unique competencies. Your response must be valid JSON.
-                    """},
-                    {"role": "user", "content": job_description}
-                ],
-                temperature=0.7
-            )
-            response_content = response.choices[0].message.content
-        else:
-            response = openai.ChatCompletion.create(
-                model=os.environ.get('OPENAI_MODEL', 'gpt-4'),
-                messages=[
-                    {"role": "system", "content": """
-                    You are a job analysis agent. Your task is to analyze a job description and identify the top 5 most 
-                    important competencies for this role. Focus on extracting competencies that are clearly important based 
-                    on the job description, not general competencies that would apply to any job.
-                    
-                    For each competency, provide:
-                    1. The competency name (e.g., "Project Management", "Data Analysis")
-                    2. A brief explanation of why this competency is important for the role (1-2 sentences)
-                    3. A list of 5 keywords associated with this competency
-                    
-                    Format your response as valid JSON with the following structure:
-                    {
-                      "competencies": [
-                        {
-                          "name": "Competency Name",
-                          "importance": "Brief explanation of importance",
-                          "keywords": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]
+                    """
+
+# Structured-outputs schema for the job analysis reply. With strict=True the model can
+# only return JSON matching it, so no field checks or regex recovery are needed.
+JOB_ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "job_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "competencies": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {"type": "string"},
+                            "importance": {"type": "string"},
+                            "keywords": {"type": "array", "items": {"type": "string"}}
                         },
-                        ...
-                      ]
+                        "required": ["name", "importance", "keywords"],
+                        "additionalProperties": False
                     }
-                    
-                    Ensure you identify exactly 5 unique competencies. Your response must be valid JSON.
-                    """},
-                    {"role": "user", "content": job_description}
-                ],
-                temperature=0.7
-            )
-            response_content = response.choices[0].message['content']
+                }
+            },
+            "required": ["competencies"],
+            "additionalProperties": False
+        }
+    }
+}
+# Read once at import rather than on every job-analysis request
+JOB_ANALYSIS_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+MOCK_SERVICES = os.getenv('MOCK_SERVICES') == 'true'
+
+@app.route('/api/job-analysis', methods=['POST'])
+def job_analysis():
+    try:
+        data = request.json
+        job_description = data.get('jobDescription', '')
         
-        # Try to extract valid JSON from the response
+        # Use mock response if mock services are enabled
+        if MOCK_SERVICES:
+            logger.info(f"Using mock response for job analysis")
+            return jsonify(get_mock_job_analysis())
+        
+        # Overlap the DynamoDB reads needed by get_recommended_questions with the LLM call
+        _prefetch_question_data()
+
         try:
-            # Find JSON object in the response
-            json_match = re.search(r'(\{.*\})', response_content, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-                analysis_result = json.loads(json_str)
-            else:
-                analysis_result = json.loads(response_content)
+            # Call OpenAI API with specified prompt (identical descriptions are served from cache)
+            model = JOB_ANALYSIS_MODEL
+            analysis_result = _chat_json(
+                JOB_ANALYSIS_SYSTEM_PROMPT,
+                job_description,
+                model=model,
+                response_format=(
+                    JOB_ANALYSIS_RESPONSE_FORMAT if model.startswith(STRUCTURED_OUTPUT_MODEL_PREFIXES)
+                    else {"type": "json_object"}
+                ),
+                temperature=0.7
+            )
                 
             # Extract competency names for question generation
             competencies = [comp.get('name') for comp in analysis_result.get('competencies', [])]
@@ -3592,7 +4997,7 @@ def job_analysis():
             return jsonify(analysis_result)
             
         except json.JSONDecodeError:
-            logger.error(f"Failed to parse JSON from OpenAI response: {response_content}")
+            logger.error("Failed to parse JSON from OpenAI job analysis response")
             return jsonify({
                 "error": "Failed to parse analysis result",
                 "competencies": []
@@ -3623,46 +5028,19 @@ def search_interview_questions():
         # Normalize the query
         query = query.strip().lower()
         
-        # Get AWS credentials
-        aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
-        aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-        region_name = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-        
-        # Create DynamoDB client
-        dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name
-        )
-        
-        # Get questions table
-        questions_table = dynamodb.Table('questions')
-        
-        # Search for questions
+        # Search the cached question index
+        question_index = _load_question_index()
+
         # First, check if query matches competency names
         competency_name_match = False
         competency_questions = []
         
-        # Get competencies table
-        competencies_table = dynamodb.Table('competencies')
-        
-        # Scan competencies to find matches
-        competencies_response = competencies_table.scan()
-        for competency in competencies_response.get('Items', []):
-            competency_name = competency.get('name', '')
-            if not competency_name:
-                continue
-                
+        # Match against the cached competency names instead of scanning the table
+        for competency_name in _load_competencies()["names"]:
             if query in competency_name.lower():
                 competency_name_match = True
                 
-                # Scan questions table for this competency
-                questions_response = questions_table.scan(
-                    FilterExpression=Attr('competency_name').eq(competency_name)
-                )
-                
-                for question in questions_response.get('Items', []):
+                for question in question_index.get(competency_name, ()):
                     competency_questions.append({
                         'question': question.get('question_text', ''),
                         'competency': competency_name
@@ -3670,19 +5048,14 @@ def search_interview_questions():
         
         # If no competency match, search directly in questions
         if not competency_name_match:
-            all_questions_response = questions_table.scan()
-            for question in all_questions_response.get('Items', []):
-                question_text = question.get('question_text', '')
-                competency_name = question.get('competency_name', '')
-                
-                if not question_text or not competency_name:
-                    continue
-                    
-                if query in question_text.lower():
-                    competency_questions.append({
-                        'question': question_text,
-                        'competency': competency_name
-                    })
+            for competency_name, questions in question_index.items():
+                for question in questions:
+                    question_text = question.get('question_text', '')
+                    if question_text and query in question_text.lower():
+                        competency_questions.append({
+                            'question': question_text,
+                            'competency': competency_name
+                        })
         
         # If still no results, use AI to generate relevant questions
         if not competency_questions:
@@ -3721,26 +5094,28 @@ def search_interview_questions():
             "error": str(e)
         }), 500
 
-# Endpoint for Evernorth demo
-@app.route('/api/evernorth_demo', methods=['GET'])
-def evernorth_demo():
+EVERNORTH_DEMO_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Risk and Underwriting Lead Analyst Evernorth.pdf')
+# Opt-in: warming runs paid LLM calls at import time, i.e. in every worker, reload and script
+# that imports this module. Without it the first demo request computes and caches the payload.
+EVERNORTH_DEMO_WARMUP = os.getenv('EVERNORTH_DEMO_WARMUP', 'false').lower() == 'true'
+_evernorth_demo_cache = {"key": None, "value": None}
+_evernorth_demo_lock = threading.Lock()
+
+def _build_evernorth_demo():
     """
-    Load the Risk and Underwriting Lead Analyst Evernorth PDF as a job posting.
-    This is a specific demo endpoint for demonstration purposes.
+    Run the full Evernorth demo analysis.
+    Returns (response payload, job_posting session fields).
     """
-    try:
-        # Path to the Evernorth demo file
-        demo_file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Risk and Underwriting Lead Analyst Evernorth.pdf')
-        content = ""
-        
-        # Check if the file exists
-        if os.path.exists(demo_file_path):
-            # Extract text from the job posting
-            content = extract_text_from_document(demo_file_path)
-        else:
-            # Use hardcoded sample text for demo purposes if file not found
-            logger.warning(f"Evernorth demo file not found at {demo_file_path}. Using hardcoded content instead.")
-            content = """This Risk & Underwriting Lead Analyst will support financial analyses and consultation of Express Scripts clients. Provide client with plan design consultation and appropriate plan design recommendations through creative modeling and analyses. Conduct in-depth analyses to identify client specific trends, explain past program performance and recommend opportunities for improvement. Present analyses to client as part of Account Management account team. Provide analytical, quantitative, and financial cost modeling assistance in support of Account Management and client objectives. On-going management of a client's contract to ensure compliance with financial terms. Develop pricing for client renewals and prospects from P&L modeling to overseeing execution of client contract. Manage client profitability to targets and guidelines. Respond to RFP financial requests. Work with Sales and Account Management in creating pricing and product positioning strategies. Assist in the presentation and negotiation of client deals.
+    content = ""
+
+    # Check if the file exists
+    if os.path.exists(EVERNORTH_DEMO_FILE):
+        # Extract text from the job posting
+        content = _extract_text_cached(EVERNORTH_DEMO_FILE, os.path.getmtime(EVERNORTH_DEMO_FILE))
+    else:
+        # Use hardcoded sample text for demo purposes if file not found
+        logger.warning(f"Evernorth demo file not found at {EVERNORTH_DEMO_FILE}. Using hardcoded content instead.")
+        content = """This Risk & Underwriting Lead Analyst will support financial analyses and consultation of Express Scripts clients. Provide client with plan design consultation and appropriate plan design recommendations through creative modeling and analyses. Conduct in-depth analyses to identify client specific trends, explain past program performance and recommend opportunities for improvement. Present analyses to client as part of Account Management account team. Provide analytical, quantitative, and financial cost modeling assistance in support of Account Management and client objectives. On-going management of a client's contract to ensure compliance with financial terms. Develop pricing for client renewals and prospects from P&L modeling to overseeing execution of client contract. Manage client profitability to targets and guidelines. Respond to RFP financial requests. Work with Sales and Account Management in creating pricing and product positioning strategies. Assist in the presentation and negotiation of client deals.
 
 ESSENTIAL FUNCTIONS
 
@@ -3761,94 +5136,134 @@ ESSENTIAL FUNCTIONS
 ·       Participate in department and company projects.
 
 ·       Develop and improve existing best practices for client support and financial modeling."""
-        
-        if not content or len(content.strip()) < 10:
-            content = "Risk and Underwriting Lead Analyst position for Evernorth requiring analytical skills, risk assessment experience, and strong communication abilities."
-        
-        # Parse job posting
-        job_data = parse_job_posting(content)
-        
-        # Store in session - Use global SESSION_STORE instead of creating a new one
-        global SESSION_STORE
-        if "job_posting" not in SESSION_STORE:
-            SESSION_STORE["job_posting"] = {}
-        
-        SESSION_STORE["job_posting"]["content"] = content
-        SESSION_STORE["job_posting"]["job_data"] = job_data
-        
-        # Extract responsibilities
-        responsibilities = job_data.get("responsibilities", [])
-        SESSION_STORE["job_posting"]["responsibilities"] = responsibilities
-        
-        # Create sample resume-based questions that will be relevant 
-        # regardless of the specific resume uploaded later
-        resume_questions = [
-            {
-                "question": "How do your past experiences prepare you for this underwriting role?",
-                "competency": "Resume-Based",
-                "type": "primary",
-                "isOriginal": True
-            },
-            {
-                "question": "Tell me about a time when you used data analysis to improve risk assessment in your previous roles.",
-                "competency": "Resume-Based",
-                "type": "primary",
-                "isOriginal": True
-            },
-            {
-                "question": "Which skills from your background do you believe will be most valuable in this position?",
-                "competency": "Resume-Based",
-                "type": "primary",
-                "isOriginal": True
-            }
-        ]
-        
-        # If responsibilities were extracted, analyze them
-        if responsibilities:
-            # Get competency analysis
-            analysis_results = analyze_job_responsibilities(responsibilities)
-            tagged_responsibilities = analysis_results.get("tagged_responsibilities", [])
-            top_competencies = analysis_results.get("top_competencies", [])
-            
-            # Store competency analysis
-            SESSION_STORE["job_posting"]["tagged_responsibilities"] = tagged_responsibilities
-            SESSION_STORE["job_posting"]["top_competencies"] = top_competencies
-            
-            # Generate recommended questions
-            recommended_questions = get_recommended_questions(top_competencies)
-            SESSION_STORE["job_posting"]["recommended_questions"] = recommended_questions
-            
-            # Extract and analyze position summary
-            position_summary = job_data.get("summary", "")
-            summary_tags = []
-            if position_summary:
-                summary_tags = []  # Placeholder for now
-            
-            # Return success with relevant data
-            return jsonify({
-                "success": True,
-                "message": "Evernorth demo job posting loaded and analyzed successfully!",
-                "job_description": content,
-                "responsibilities": responsibilities,
-                "tagged_responsibilities": tagged_responsibilities,
-                "top_competencies": top_competencies,
-                "recommended_questions": recommended_questions,
-                "resume_questions": resume_questions,  # Add resume questions without mock resume data
-                "job_data": job_data,
-                "position_summary": position_summary,
-                "summary_tags": summary_tags,
-                "is_evernorth_demo": True  # Flag to indicate this is the Evernorth demo
-            })
-        
-        # Return success even without responsibilities
-        return jsonify({
+
+    if not content or len(content.strip()) < 10:
+        content = "Risk and Underwriting Lead Analyst position for Evernorth requiring analytical skills, risk assessment experience, and strong communication abilities."
+
+    # Warm the competency/question caches while the posting is parsed by the LLM
+    _prefetch_question_data()
+
+    # Parse job posting
+    job_data = parse_job_posting(content)
+
+    # Extract responsibilities
+    responsibilities = job_data.get("responsibilities", [])
+
+    # Create sample resume-based questions that will be relevant 
+    # regardless of the specific resume uploaded later
+    resume_questions = [
+        {
+            "question": "How do your past experiences prepare you for this underwriting role?",
+            "competency": "Resume-Based",
+            "type": "primary",
+            "isOriginal": True
+        },
+        {
+            "question": "Tell me about a time when you used data analysis to improve risk assessment in your previous roles.",
+            "competency": "Resume-Based",
+            "type": "primary",
+            "isOriginal": True
+        },
+        {
+            "question": "Which skills from your background do you believe will be most valuable in this position?",
+            "competency": "Resume-Based",
+            "type": "primary",
+            "isOriginal": True
+        }
+    ]
+
+    session_fields = {
+        "content": content,
+        "job_data": job_data,
+        "responsibilities": responsibilities,
+        "resume_questions": resume_questions,
+        "is_evernorth_demo": True
+    }
+
+    # If responsibilities were extracted, analyze them
+    if responsibilities:
+        # Get competency analysis
+        analysis_results = analyze_job_responsibilities(responsibilities)
+        tagged_responsibilities = analysis_results.get("tagged_responsibilities", [])
+        top_competencies = analysis_results.get("top_competencies", [])
+
+        # Generate recommended questions
+        recommended_questions = get_recommended_questions(top_competencies)
+
+        session_fields.update(
+            tagged_responsibilities=tagged_responsibilities,
+            top_competencies=top_competencies,
+            recommended_questions=recommended_questions
+        )
+
+        # Extract and analyze position summary
+        position_summary = job_data.get("summary", "")
+        summary_tags = []
+        if position_summary:
+            summary_tags = []  # Placeholder for now
+
+        return {
             "success": True,
-            "message": "Evernorth demo job posting loaded successfully!",
+            "message": "Evernorth demo job posting loaded and analyzed successfully!",
             "job_description": content,
-            "job_data": job_data,
+            "responsibilities": responsibilities,
+            "tagged_responsibilities": tagged_responsibilities,
+            "top_competencies": top_competencies,
+            "recommended_questions": recommended_questions,
             "resume_questions": resume_questions,  # Add resume questions without mock resume data
+            "job_data": job_data,
+            "position_summary": position_summary,
+            "summary_tags": summary_tags,
             "is_evernorth_demo": True  # Flag to indicate this is the Evernorth demo
-        })
+        }, session_fields
+
+    # Return success even without responsibilities
+    return {
+        "success": True,
+        "message": "Evernorth demo job posting loaded successfully!",
+        "job_description": content,
+        "job_data": job_data,
+        "resume_questions": resume_questions,  # Add resume questions without mock resume data
+        "is_evernorth_demo": True  # Flag to indicate this is the Evernorth demo
+    }, session_fields
+
+def _get_evernorth_demo():
+    """
+    Return the demo (payload, session fields), built once per version of the demo file.
+    Only a complete analysis is kept, so a run without the LLM is retried on the next hit.
+    """
+    cache_key = os.path.getmtime(EVERNORTH_DEMO_FILE) if os.path.exists(EVERNORTH_DEMO_FILE) else None
+    with _evernorth_demo_lock:
+        if _evernorth_demo_cache["value"] is not None and _evernorth_demo_cache["key"] == cache_key:
+            return _evernorth_demo_cache["value"]
+        result = _build_evernorth_demo()
+        if result[0].get("top_competencies"):
+            _evernorth_demo_cache["key"] = cache_key
+            _evernorth_demo_cache["value"] = result
+        return result
+
+def _warm_evernorth_demo():
+    try:
+        _get_evernorth_demo()
+        logger.info("Evernorth demo payload precomputed")
+    except Exception as e:
+        logger.warning(f"Could not precompute Evernorth demo payload: {str(e)}")
+
+# Endpoint for Evernorth demo
+@app.route('/api/evernorth_demo', methods=['GET'])
+def evernorth_demo():
+    """
+    Load the Risk and Underwriting Lead Analyst Evernorth PDF as a job posting.
+    This is a specific demo endpoint for demonstration purposes.
+    """
+    try:
+        # The analysis is computed once (on first use, or at startup with EVERNORTH_DEMO_WARMUP)
+        # and cached; each hit only loads it into the session.
+        # Sent as no-cache so a repeat click always reaches this handler and resets the
+        # session's job posting; an unchanged payload still comes back as a bodiless 304.
+        payload, session_fields = _get_evernorth_demo()
+        _session_set("job_posting", **session_fields)
+        return _conditional_json(payload)
         
     except Exception as e:
         logger.error(f"Error loading Evernorth demo: {str(e)}")
@@ -3960,60 +5375,23 @@ def get_mock_job_analysis():
 def get_competencies():
     """Return all competencies and their descriptions"""
     try:
-        # Create a default set of competencies
-        default_competencies = {
-            "Customer Focus": "Building strong customer relationships and delivering customer-centric solutions",
-            "Financial Acumen": "Understanding financial concepts and making sound financial decisions",
-            "Decision Quality": "Making good decisions based on analysis, experience, and judgment",
-            "Strategic Mindset": "Seeing ahead to future possibilities and translating them into breakthrough strategies",
-            "Business Insight": "Applying knowledge of business and the marketplace to advance the organization's goals",
-            "Drives Results": "Consistently achieving results, even under tough circumstances",
-            "Manages Complexity": "Making sense of complex, high-quantity, and sometimes contradictory information",
-            "Tech Savvy": "Anticipating and adopting innovations in technology-based solutions",
-            "Collaborates": "Building partnerships and working collaboratively with others",
-            "Communicates Effectively": "Developing and delivering multi-mode communications that convey a clear understanding"
-        }
-        
         try:
-            # Get AWS credentials
-            aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
-            aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-            region_name = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-            
-            # Create DynamoDB client
-            dynamodb = boto3.resource(
-                'dynamodb',
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=region_name
-            )
-            
-            # Get competencies table
-            competencies_table = dynamodb.Table('competencies')
-            
-            # Scan all competencies
-            response = competencies_table.scan()
-            competencies = response.get('Items', [])
-            
-            # Create a dictionary with competency name as key and description as value
-            competencies_dict = {}
-            for comp in competencies:
-                name = comp.get('name', '')
-                description = comp.get('description', '')
-                if name:
-                    competencies_dict[name] = description
+            # Served from the in-process competency cache (scanned once per TTL)
+            competency_data = _load_competencies()
+            competencies_dict = competency_data["details"] if competency_data["from_db"] else {}
             
             # If no competencies found, use default ones
             if competencies_dict:
-                return jsonify({"competencies": competencies_dict})
+                # The list only changes when the taxonomy cache refreshes; let clients reuse it too
+                return _conditional_json({"competencies": competencies_dict}, COMPETENCY_CACHE_TTL)
             else:
                 logger.warning("No competencies found in database, using default set")
-                return jsonify({"competencies": default_competencies})
+                return jsonify({"competencies": DEFAULT_DISPLAY_COMPETENCIES})
                 
         except Exception as e:
             logger.error(f"Error fetching competencies from DynamoDB: {str(e)}")
             # Return default competencies if there's an error
-            return jsonify({"competencies": default_competencies})
+            return jsonify({"competencies": DEFAULT_DISPLAY_COMPETENCIES})
         
     except Exception as e:
         logger.error(f"Error in get_competencies: {str(e)}")
@@ -4030,46 +5408,15 @@ def get_preset_questions():
         if competencies:
             competency_list = competencies.split(',')
         else:
-            competency_list = [
-                "Introduction", 
-                "Financial Acumen", 
-                "Resourcefulness", 
-                "Plans And Aligns", 
-                "Communicates Effectively", 
-                "Nimble Learning"
-            ]
-        
-        # Get AWS credentials
-        aws_access_key_id = os.environ.get('AWS_ACCESS_KEY_ID')
-        aws_secret_access_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
-        region_name = os.environ.get('AWS_DEFAULT_REGION', 'us-east-1')
-        
-        # Create DynamoDB client
-        dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-            region_name=region_name
-        )
+            competency_list = list(DEFAULT_PRESET_COMPETENCIES)
         
-        # Get questions table
-        questions_table = dynamodb.Table(QUESTIONS_TABLE_NAME)
-        
-        # Dictionary to store questions by competency
-        questions_by_competency = {}
-        
-        # Scan for preset questions related to the competencies
-        for competency in competency_list:
+        def fetch_competency_questions(competency):
             logger.info(f"Fetching preset questions for competency: {competency}")
             
             try:
-                # Scan questions table for this competency
-                response = questions_table.scan(
-                    FilterExpression=Attr('competency_name').eq(competency)
-                )
-                
+                # Query questions for this competency via the GSI
                 questions = []
-                for question in response.get('Items', []):
+                for question in _query_questions_by_competency(competency, 'question_text, preset_order'):
                     question_text = question.get('question_text', '')
                     preset_order = question.get('preset_order', 0)
                     
@@ -4080,12 +5427,31 @@ def get_preset_questions():
                             'type': 'primary' if preset_order == 1 else 'backup'
                         })
                 
-                questions_by_competency[competency] = questions
                 logger.info(f"Found {len(questions)} questions for {competency}")
+                return questions
                 
             except Exception as e:
                 logger.error(f"Error fetching questions for competency {competency}: {str(e)}")
-                questions_by_competency[competency] = []
+                return []
+        
+        try:
+            question_index = _load_question_index()
+            questions_by_competency = {
+                competency: [
+                    {
+                        'competency': competency,
+                        'question': question['question_text'],
+                        'type': 'primary' if question.get('preset_order', 0) == 1 else 'backup'
+                    }
+                    for question in question_index.get(competency, ()) if question.get('question_text')
+                ]
+                for competency in competency_list
+            }
+        except Exception as e:
+            logger.error(f"Question index unavailable ({str(e)}); querying competencies individually")
+            # Query each competency's questions concurrently; the queries are independent
+            with ThreadPoolExecutor(max_workers=max(1, min(len(competency_list), 8))) as pool:
+                questions_by_competency = dict(zip(competency_list, pool.map(fetch_competency_questions, competency_list)))
         
         # Return the questions grouped by competency
         return jsonify({
@@ -4100,36 +5466,22 @@ def get_preset_questions():
             "error": str(e)
         }), 500
 
-def generate_mock_star_analysis(transcript):
-    """Generate mock STAR analysis based on transcript length"""
-    # Simple mock that returns different levels of completeness based on transcript length
-    analysis = {
-        "situation": "Not clearly described in the response.",
-        "task": "Not clearly described in the response.",
-        "action": "Not clearly described in the response.",
-        "result": "Not clearly described in the response.",
-        "competencies": ["Communication"]
-    }
-    
-    # Add more components based on transcript length
-    if len(transcript) > 100:
-        analysis["situation"] = "At their previous company, they were facing declining profit margins due to increased competition."
-        analysis["competencies"].append("Analytical Thinking")
-    
-    if len(transcript) > 200:
-        analysis["task"] = "They were tasked with developing a new financial strategy to improve profitability."
-        analysis["competencies"].append("Financial Acumen")
-    
-    if len(transcript) > 300:
-        analysis["action"] = "They conducted a comprehensive analysis of the cost structure and implemented a new budget allocation model."
-        analysis["competencies"].append("Strategic Mindset")
-    
-    if len(transcript) > 400:
-        analysis["result"] = "Within six months, they increased profit margins by 12% while maintaining product quality."
-    
-    return analysis
-
 # --- ENDPOINT FOR SUMMARY ANALYSIS (Uncommented) ---
+_summary_tag_cache = TTLCache(maxsize=1024, ttl=COMPETENCY_CACHE_TTL)
+_summary_tag_cache_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=4)
+def _summary_system_prompt(standard_list_for_prompt):
+    """Static part of the summary prompt; kept identical across calls so it can be prompt-cached."""
+    return f"""{_competency_catalog_prefix(standard_list_for_prompt)}
+        You will receive a job summary text. Identify the top 1-3 competencies for it.
+        Instructions:
+        - Identify the competencies from the standard list (between 1 and 3) that are **most strongly represented** in the overall job summary.
+        - Return ONLY a JSON object of the form {{"tags": [...]}} containing the name(s) of the most relevant competency/competencies.
+        - Return at least one competency if possible.
+        Example Output (1-3 items): {{"tags": ["Competency A", "Competency B"]}}
+        """
+
 @app.route('/api/analyze_summary', methods=['POST'])
 def analyze_summary_endpoint():
     """
@@ -4147,64 +5499,54 @@ def analyze_summary_endpoint():
         logger.error("No summary text provided in request")
         return jsonify({"success": False, "error": "Summary text is required"}), 400
 
-    standard_competency_names = set()
-    standard_competencies_details = {}
+    if _is_trivial_text(summary_text):
+        logger.info("Summary text is too short or boilerplate; skipping analysis.")
+        return jsonify({"success": True, "tags": []})
+
+    standard_competency_names = frozenset()
     tags = []
 
     try:
-        # --- Get Standard Competencies (similar to analyze_job_responsibilities) ---
-        logger.info("Connecting to DynamoDB to get standard competencies for summary analysis")
-        dynamodb = boto3.resource('dynamodb', region_name=region_name) 
-        competencies_table = dynamodb.Table(COMPETENCIES_TABLE_NAME)
-        comp_scan_paginator = competencies_table.meta.client.get_paginator('scan')
-        for page in comp_scan_paginator.paginate(TableName=COMPETENCIES_TABLE_NAME, ProjectionExpression="#nm, description", ExpressionAttributeNames={"#nm": "name"}):
-            for item in page.get('Items', []):
-                comp_name = item.get('name')
-                if comp_name:
-                    standard_competency_names.add(comp_name)
-                    standard_competencies_details[comp_name] = item.get('description', '')
+        # --- Get Standard Competencies (shared cache with analyze_job_responsibilities) ---
+        competency_data = _load_competencies()
+        standard_competency_names = competency_data["names_set"]
         logger.info(f"Loaded {len(standard_competency_names)} standard competencies for summary analysis.")
 
         if not standard_competency_names:
             logger.error("No standard competencies found in DB for summary analysis.")
             return jsonify({"success": True, "tags": []})
 
-        # --- Call LLM for Summary Analysis ---
-        standard_list_for_prompt = "\n".join([f"- {name}: {standard_competencies_details.get(name, '')}" for name in sorted(standard_competency_names)])
-        
-        llm_prompt_summary = f"""
-        Analyze the following job summary text:
-        `{summary_text}`
+        # Identical summaries (e.g. the same posting re-opened) are answered from the cache.
+        # The key carries the competency prompt hash, so tags computed against an older
+        # catalog miss once the competency table changes.
+        normalized_summary = NON_WORD_RE.sub(' ', summary_text).strip().lower()
+        summary_cache_key = hashlib.sha256(
+            f"{RESPONSIBILITY_TAGGING_MODEL}\n{competency_data['prompt_hash']}\n{normalized_summary}".encode("utf-8")
+        ).hexdigest()
+        with _summary_tag_cache_lock:
+            cached_tags = _summary_tag_cache.get(summary_cache_key)
+        if cached_tags is not None:
+            logger.info(f"Summary analysis served from cache: {cached_tags}")
+            return jsonify({"success": True, "tags": cached_tags})
 
-        Consider this list of standard competencies and their descriptions:
-        {standard_list_for_prompt}
-
-        Instructions:
-        - Identify the competencies from the standard list (between 1 and 3) that are **most strongly represented** in the overall job summary.
-        - Return ONLY a valid JSON list containing the name(s) of the most relevant competency/competencies.
-        - Return at least one competency if possible.
-        Example Output (1-3 items): ["Competency A", "Competency B"]
-        """
+        # --- Call LLM for Summary Analysis ---
+        standard_list_for_prompt = competency_data["prompt_block"]
         
-        logger.debug(f"Sending prompt to LLM for summary analysis:\n{llm_prompt_summary[:300]}...")
+        logger.debug(f"Sending summary to LLM for analysis:\n{summary_text[:300]}...")
 
         llm_response_content = ""
-        if USE_NEW_OPENAI_SDK:
-            if client:
-                completion = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=[
-                        {"role": "system", "content": "You are an HR analyst identifying the top 1-3 competencies for a job summary."},
-                        {"role": "user", "content": llm_prompt_summary}
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.1
-                )
-                llm_response_content = completion.choices[0].message.content
-            else:
-                logger.error("OpenAI client (v1+) is None for summary analysis.")
+        if client:
+            llm_response_content = _chat(
+                RESPONSIBILITY_TAGGING_MODEL,
+                [
+                    {"role": "system", "content": _summary_system_prompt(standard_list_for_prompt)},
+                    {"role": "user", "content": summary_text}
+                ],
+                response_format=_tag_response_format(standard_list_for_prompt),
+                temperature=0.1
+            )
         else:
-             logger.error("Legacy OpenAI SDK not supported in this configuration for summary analysis.")
+            logger.error("OpenAI client is None for summary analysis.")
         
         logger.debug(f"LLM Raw Response for Summary Tagging: {llm_response_content}")
 
@@ -4212,35 +5554,13 @@ def analyze_summary_endpoint():
         parsed_llm_tags = None
         if llm_response_content:
             try:
-                parsed_data = json.loads(llm_response_content)
-                if isinstance(parsed_data, list):
-                    parsed_llm_tags = parsed_data
-                elif isinstance(parsed_data, dict):
-                    for key in ['tags', 'competencies', 'relevant_competencies', 'summary_tags']:
-                         if key in parsed_data and isinstance(parsed_data[key], list):
-                            parsed_llm_tags = parsed_data[key]
-                            break 
-                    if parsed_llm_tags is None: 
-                        if len(parsed_data.keys()) == 1: 
-                            potential_list = list(parsed_data.values())[0]
-                            if isinstance(potential_list, list):
-                                parsed_llm_tags = potential_list
-                
+                parsed_data = _json_loads(llm_response_content)
+                if isinstance(parsed_data, dict):
+                    parsed_llm_tags = parsed_data.get("tags")
                 if parsed_llm_tags is None:
                     logger.warning(f"LLM returned unexpected JSON structure for summary: {parsed_data}")
-                    
             except json.JSONDecodeError:
-                logger.debug("Direct JSON parse failed for summary, trying regex extraction...")
-                match = re.search(r'\[\s*(?:\"[^\"]*\"\s*,?\s*)*\]', llm_response_content)
-                if match:
-                    json_str = match.group(0)
-                    try:
-                        parsed_llm_tags = json.loads(json_str)
-                        logger.debug(f"Regex extracted JSON list for summary: {parsed_llm_tags}")
-                    except json.JSONDecodeError:
-                        logger.error(f"Could not parse extracted JSON via regex for summary: {json_str}")
-                else:
-                    logger.warning(f"Could not find JSON list via regex in LLM summary resp: {llm_response_content}")
+                logger.error(f"LLM summary reply was not valid JSON: {llm_response_content}")
 
         # Validate tags against the standard list
         if isinstance(parsed_llm_tags, list):
@@ -4249,11 +5569,16 @@ def analyze_summary_endpoint():
                     tags.append(tag)
                 else:
                     logger.warning(f"LLM summary analysis returned invalid/non-standard tag ignored: {tag}")
-            tags = tags[:3] 
+            tags = list(dict.fromkeys(tags))[:3]
         else:
              logger.warning(f"LLM summary analysis did not return a valid list: {parsed_llm_tags}")
 
         logger.info(f"Summary analysis identified tags: {tags}")
+        # Tags against the hardcoded fallback list aren't kept, so a DynamoDB outage
+        # doesn't outlive COMPETENCY_FALLBACK_TTL in this cache
+        if llm_response_content and competency_data["from_db"]:
+            with _summary_tag_cache_lock:
+                _summary_tag_cache[summary_cache_key] = tags
         return jsonify({"success": True, "tags": tags})
 
     except Exception as e:
@@ -4325,6 +5650,11 @@ def transcribe_audio():
         return jsonify({"success": False, "error": f"Transcription failed: {str(e)}"}), 500
 # --- END NEW Transcription Endpoint ---
 
+# With EVERNORTH_DEMO_WARMUP=true, precompute the Evernorth demo in the background so the
+# first click is served from cache (enable it on one process only)
+if EVERNORTH_DEMO_WARMUP and client:
+    _prefetch_executor.submit(_warm_evernorth_demo)
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 8080))
     # Use a server that supports WebSockets, like gevent or use Flask's dev server with Sock
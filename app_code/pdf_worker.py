@@ -0,0 +1,20 @@
+"""
+Worker for extracting PDF page ranges in a separate process.
+
+Kept apart from app.py on purpose: the pool that runs it uses the spawn start method,
+which imports the worker's module in every child, so this module must stay light
+(no Flask app, clients or background threads) and must not import app.py.
+"""
+
+
+def extract_page_range(args):
+    """Return the marked-up text for pages [start, stop) of the PDF at filepath."""
+    import fitz  # PyMuPDF; only imported in the child that uses it
+
+    filepath, start, stop = args
+    parts = []
+    with fitz.open(filepath) as doc:
+        for idx in range(start, stop):
+            parts.append(f"### Page {idx+1} ###\n")
+            parts.append(doc[idx].get_text("text"))
+    return "".join(parts)
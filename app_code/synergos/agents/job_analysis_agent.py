@@ -20,6 +20,20 @@ from synergos.dynamo_db import (
 
 logger = logging.getLogger(__name__)
 
+# Patterns used while parsing job descriptions, compiled once at import
+WORD_RE = re.compile(r'\b\w+\b')
+RESPONSIBILITY_HEADER_RE = re.compile(
+    r'\b(responsibilities|duties|what you\'ll do|job duties|key responsibilities|essential functions)\b[:]*',
+    re.IGNORECASE
+)
+REQUIREMENTS_HEADER_RE = re.compile(
+    r'\b(requirements|qualifications|what you\'ll need|skills|about you|who you are)\b[:]*',
+    re.IGNORECASE
+)
+BULLET_SPLIT_RE = re.compile(r'[\n\r]\s*[•*\-]\s*')
+SENTENCE_SPLIT_RE = re.compile(r'[\.\n\r]+')
+ACTION_VERB_LINE_RE = re.compile(r'^[A-Z][a-z]+(?:ing|e)\b')
+
 # Initialize DynamoDB connection
 dynamodb = boto3.resource('dynamodb',
     region_name=os.environ.get('AWS_REGION', 'us-east-1'),
@@ -129,7 +143,7 @@ class JobAnalysisAgent(AgentBase):
                         desc = self.competency_descriptions[name].lower()
                         # Remove common words
                         stop_words = ['the', 'and', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'are']
-                        words = re.findall(r'\b\w+\b', desc)
+                        words = WORD_RE.findall(desc)
                         keywords = [w for w in words if len(w) > 3 and w not in stop_words]
                         self.competency_keywords[name] = list(set(keywords))
             
@@ -155,7 +169,7 @@ class JobAnalysisAgent(AgentBase):
                             desc = self.competency_descriptions[name].lower()
                             # Remove common words
                             stop_words = ['the', 'and', 'a', 'an', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'are']
-                            words = re.findall(r'\b\w+\b', desc)
+                            words = WORD_RE.findall(desc)
                             keywords = [w for w in words if len(w) > 3 and w not in stop_words]
                             self.competency_keywords[name] = list(set(keywords))
                 
@@ -229,22 +243,14 @@ class JobAnalysisAgent(AgentBase):
         responsibilities = []
         
         # Look for section headers like "Responsibilities:" or "Duties:"
-        responsibility_sections = re.split(
-            r'\b(responsibilities|duties|what you\'ll do|job duties|key responsibilities|essential functions)\b[:]*',
-            job_description, 
-            flags=re.IGNORECASE
-        )
+        responsibility_sections = RESPONSIBILITY_HEADER_RE.split(job_description)
         
         if len(responsibility_sections) > 1:
             # Get the text after the header
             resp_text = responsibility_sections[2].strip()
             
             # Find the next section header
-            next_section = re.search(
-                r'\b(requirements|qualifications|what you\'ll need|skills|about you|who you are)\b[:]*',
-                resp_text,
-                flags=re.IGNORECASE
-            )
+            next_section = REQUIREMENTS_HEADER_RE.search(resp_text)
             
             if next_section:
                 resp_text = resp_text[:next_section.start()].strip()
@@ -252,13 +258,13 @@ class JobAnalysisAgent(AgentBase):
             # Split into bullet points if they exist
             if '•' in resp_text or '*' in resp_text or '-' in resp_text:
                 # Handle bullet points
-                bullet_items = re.split(r'[\n\r]\s*[•*\-]\s*', resp_text)
+                bullet_items = BULLET_SPLIT_RE.split(resp_text)
                 for item in bullet_items:
                     if item.strip():
                         responsibilities.append(item.strip())
             else:
                 # Split by sentences or newlines
-                sentences = re.split(r'[\.\n\r]+', resp_text)
+                sentences = SENTENCE_SPLIT_RE.split(resp_text)
                 for sentence in sentences:
                     if len(sentence.strip()) > 20:  # Ignore short fragments
                         responsibilities.append(sentence.strip())
@@ -272,7 +278,7 @@ class JobAnalysisAgent(AgentBase):
                 if clean_line and len(clean_line) > 20 and not clean_line.endswith(':'):
                     # Lines starting with bullets or having action verbs
                     if (clean_line.startswith('•') or clean_line.startswith('-') or clean_line.startswith('*') or 
-                        re.match(r'^[A-Z][a-z]+ing\b', clean_line) or re.match(r'^[A-Z][a-z]+e\b', clean_line)):
+                        ACTION_VERB_LINE_RE.match(clean_line)):
                         responsibilities.append(clean_line.lstrip('•*- '))
         
         return responsibilities
@@ -13,6 +13,9 @@ logger = logging.getLogger(__name__)
 openai_version = openai.__version__
 logger.info(f"OpenAI version detected: {openai_version}")
 
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 def get_patched_client(api_key=None):
     """
     Creates an OpenAI client with the provided API key,
@@ -72,6 +75,45 @@ def get_patched_client(api_key=None):
             logger.error(f"Failed to initialize legacy OpenAI v0.x client: {str(e)}")
             return None
 
+def get_patched_async_client(api_key=None):
+    """
+    Creates an AsyncOpenAI client with the same proxy workaround as
+    get_patched_client, for callers that fan requests out with asyncio.
+
+    Args:
+        api_key: OpenAI API key (will fall back to env variable if None)
+
+    Returns:
+        Initialized AsyncOpenAI client or None if unavailable.
+    """
+    if api_key is None:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            logger.warning("No OpenAI API key provided or found in environment")
+            return None
+
+    if not openai_version.startswith('1.'):
+        logger.info("Async client requires OpenAI SDK v1.x; skipping")
+        return None
+
+    try:
+        from openai import AsyncOpenAI
+
+        # One pooled client is shared by every fan-out, so size the pool for it.
+        # HTTP/2 lets concurrent requests multiplex over fewer connections when h2 is installed.
+        httpx_client = httpx.AsyncClient(
+            proxies=None,
+            verify=False,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+        client = AsyncOpenAI(api_key=api_key, http_client=httpx_client)
+        logger.info(f"Successfully initialized AsyncOpenAI client with custom httpx client (no proxies, http2={HTTP2_AVAILABLE})")
+        return client
+    except Exception as e:
+        logger.error(f"Failed to initialize AsyncOpenAI client: {str(e)}")
+        return None
+
 # To use this in app.py:
 # from openai_client_fix import get_patched_client
 # client = get_patched_client(openai_api_key)